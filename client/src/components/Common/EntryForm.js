@@ -13,7 +13,6 @@ const EntryForm = () => {
   const { user } = useAuth();
   const [title, setTitle] = useState("");
   const [content, setContent] = useState("");
-  const [mood, setMood] = useState("neutral");
   const [isSubmitting, setIsSubmitting] = useState(false);
   const [message, setMessage] = useState("");
 
@@ -28,30 +27,12 @@ const EntryForm = () => {
 
     setIsSubmitting(true);
 
-    let finalMood = mood; // Start with current mood
-
-    // Always analyze mood for new entries
-    if (content.trim()) {
-      try {
-        const response = await axios.post(
-          "http://localhost:5555/analyze-mood",
-          {
-            content: content.trim(),
-          }
-        );
-        finalMood = response.data.mood; // Use the analyzed mood
-        setMood(response.data.mood); // Update the state as well
-      } catch (error) {
-        // Continue with current mood if analysis fails
-        // Don't show error to user since this is background analysis
-      }
-    }
-
     try {
+      // Mood is analyzed in the background by the server (the entry starts as "pending"),
+      // so saving doesn't wait on the AI call
       await axios.post("http://localhost:5555/entries", {
         title: title.trim(),
         content: content.trim(),
-        mood: finalMood, // Use the analyzed mood
         user_id: user.id, // Use the logged-in user's ID
       });
 
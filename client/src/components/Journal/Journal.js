@@ -12,26 +12,60 @@ const Journal = () => {
   // State for storing journal entries and tracking hover state
   const [entries, setEntries] = useState([]);
   const [hoveredEntry, setHoveredEntry] = useState(null);
+  // Opaque cursor for the next page of entries (null when everything is loaded)
+  const [nextCursor, setNextCursor] = useState(null);
   const { user } = useAuth();
 
+  // Fetch one page of entries, newest first, continuing from the given cursor
+  const fetchEntries = async (cursor = null) => {
+    try {
+      const cursorParam = cursor ? `&cursor=${encodeURIComponent(cursor)}` : "";
+      const response = await axios.get(
+        `http://localhost:5555/entries?user_id=${user.id}${cursorParam}`
+      );
+      setEntries((previous) =>
+        cursor ? [...previous, ...response.data.entries] : response.data.entries
+      );
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      // Handle error silently for now - could add error state if needed
+      handleApiError(error, ERROR_CONTEXTS.FETCH_ENTRIES);
+    }
+  };
+
   // Fetch user's journal entries on component mount
   useEffect(() => {
-    const fetchEntries = async () => {
+    if (user) {
+      fetchEntries();
+    }
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [user]);
+
+  // Entries saved with mood "pending" are analyzed in the background - poll until they resolve
+  useEffect(() => {
+    const pendingIds = entries
+      .filter((entry) => entry.mood === "pending")
+      .map((entry) => entry.id);
+    if (pendingIds.length === 0) return undefined;
+
+    const timer = setTimeout(async () => {
       try {
-        const response = await axios.get(
-          `http://localhost:5555/entries?user_id=${user.id}`
+        const responses = await Promise.all(
+          pendingIds.map((id) => axios.get(`http://localhost:5555/entries/${id}`))
+        );
+        const updated = Object.fromEntries(
+          responses.map((response) => [response.data.id, response.data])
+        );
+        setEntries((previous) =>
+          previous.map((entry) => updated[entry.id] || entry)
         );
-        setEntries(response.data);
       } catch (error) {
-        // Handle error silently for now - could add error state if needed
         handleApiError(error, ERROR_CONTEXTS.FETCH_ENTRIES);
       }
-    };
+    }, 2000);
 
-    if (user) {
-      fetchEntries();
-    }
-  }, [user]);
+    return () => clearTimeout(timer);
+  }, [entries]);
 
   // Create enhanced gradient for hover effects based on entry's mood colors
   const createHoverGradient = (entry) => {
@@ -78,6 +112,11 @@ const Journal = () => {
           />
         ))}
       </div>
+      {nextCursor && (
+        <div className="journal-load-more">
+          <button onClick={() => fetchEntries(nextCursor)}>Load more</button>
+        </div>
+      )}
     </div>
   );
 };
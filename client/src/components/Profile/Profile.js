@@ -15,9 +15,10 @@ const Profile = () => {
   const [error, setError] = useState(null);
 
   useEffect(() => {
-    const fetchProfile = async () => {
-      if (!user) return;
+    if (!user) return;
 
+    // Plain request, used when streaming isn't available or the stream fails
+    const fetchProfile = async () => {
       try {
         setLoading(true);
         const response = await axios.get(
@@ -32,7 +33,49 @@ const Profile = () => {
       }
     };
 
-    fetchProfile();
+    if (typeof EventSource === "undefined") {
+      fetchProfile();
+      return;
+    }
+
+    // Stream the profile: moods arrive right away, the description as it is written
+    const source = new EventSource(
+      `http://localhost:5555/user-profile/${user.id}/stream`
+    );
+    let finished = false;
+
+    source.addEventListener("moods", (event) => {
+      setProfile({ ...JSON.parse(event.data), description: "" });
+      setLoading(false);
+    });
+
+    source.addEventListener("description", (event) => {
+      const { text } = JSON.parse(event.data);
+      setProfile((current) =>
+        current ? { ...current, description: current.description + text } : current
+      );
+    });
+
+    source.addEventListener("profile", (event) => {
+      finished = true;
+      setProfile(JSON.parse(event.data));
+      source.close();
+    });
+
+    // Fired for server-sent errors (with data) and for connection failures (without)
+    source.addEventListener("error", (event) => {
+      source.close();
+      if (finished) return;
+      finished = true;
+      if (event.data) {
+        setError(JSON.parse(event.data).error);
+        setLoading(false);
+      } else {
+        fetchProfile();
+      }
+    });
+
+    return () => source.close();
   }, [user]);
 
   if (!user) {
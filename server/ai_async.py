@@ -0,0 +1,198 @@
+# asyncio versions of the AI-backed flows, served by ai_server.py
+#
+# Model calls are awaited on the event loop (ai_client.async_chat_completion),
+# so a single process can keep hundreds of them in flight without a thread
+# each. Coroutines run inside the Flask application's app context (pushed per
+# request by ai_server.py). Database work (mood cache, aggregates, entry
+# summaries, profile cache) is still plain SQLAlchemy: run_blocking() hands it
+# to a worker thread with its own app context, and those steps are short next
+# to a model call.
+# Prompts, parsing, reduce planning and fallbacks are shared with the synchronous
+# versions in mood_engine.py and profile_generation.py.
+import asyncio
+
+from flask import current_app
+
+from config import db, with_app_context
+from ai_client import async_chat_completion
+from mood_analysis import MOOD_MODEL, get_api_key, request_mood_analysis_async, parse_numbered_lines
+from mood_cache import mood_result_cache
+from mood_engine import resolve_engine, local_result
+from mood_stats import get_mood_stats
+from profile_cache import get_cached_profile
+from profile_generation import (
+    PROFILE_SYSTEM_PROMPT, MAX_REDUCE_ROUNDS, WINDOW_SUMMARY_TOKENS,
+    build_window_prompt, build_profile_prompt, parse_profile_response,
+    prompt_budget, summary_chunks, summary_request, collect_summaries, pending_entry_notes, store_entry_summaries,
+    condense_fallback, reduce_windows, finish_reduce,
+    load_journal_windows, stale_window_texts, store_window_entry_summaries, pending_windows, verbatim_paragraph,
+    store_window_summaries, year_windows
+)
+
+async def run_blocking(function, *args):
+    """
+    Run blocking (database) work in a worker thread inside an app context.
+
+    Returns:
+        Whatever function returns
+    """
+    return await asyncio.to_thread(with_app_context(function), *args)
+
+async def analyze_mood_async(content, engine=None):
+    """
+    mood_engine.analyze_mood() for coroutines.
+
+    Args:
+        content (str): Journal entry text
+        engine (str): auto, local or remote (None = MOOD_ENGINE setting)
+
+    Returns:
+        dict: Same result as analyze_mood()
+    """
+    engine = resolve_engine(engine)
+
+    if engine != 'remote':
+        result = local_result(content)
+        if engine == 'local' or result['confidence'] >= current_app.config['MOOD_LOCAL_CONFIDENCE']:
+            return result
+
+    cached_mood = await run_blocking(mood_result_cache.get, content)
+    if cached_mood:
+        return {"mood": cached_mood, "engine": "remote", "cached": True}
+
+    try:
+        api_key = get_api_key()
+        if not api_key:
+            raise RuntimeError("OpenAI API key not configured")
+        mood = await request_mood_analysis_async(content, api_key, timeout=current_app.config['MOOD_REQUEST_TIMEOUT_SECONDS'])
+    except Exception as e:
+        print(f"Remote mood analysis failed, using local classifier: {str(e)}")
+        return local_result(content, fallback=True)
+
+    await run_blocking(mood_result_cache.put, content, mood)
+    return {"mood": mood, "engine": "remote", "cached": False}
+
+def load_profile_state(user_id):
+    """
+    Mood aggregates and stored profile of a user (run through run_blocking).
+
+    Returns:
+        tuple: (UserMoodStats or None, UserProfileCache or None), detached but fully loaded
+    """
+    stats = get_mood_stats(db.session, user_id)
+    if not stats or stats.entry_count == 0:
+        return stats, None
+    return stats, get_cached_profile(db.session, stats)
+
+async def complete_async(prompt, api_key, max_tokens, system_prompt=PROFILE_SYSTEM_PROMPT):
+    """profile_generation.complete() for coroutines"""
+    answer = await async_chat_completion(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        api_key,
+        max_tokens=max_tokens,
+        model=MOOD_MODEL
+    )
+    return answer.strip()
+
+async def run_concurrently(function, items):
+    """Await function over items with at most PROFILE_PARALLELISM calls in flight, results in order"""
+    semaphore = asyncio.Semaphore(max(1, current_app.config['PROFILE_PARALLELISM']))
+
+    async def limited(item):
+        async with semaphore:
+            return await function(item)
+
+    return await asyncio.gather(*(limited(item) for item in items))
+
+async def summarize_texts_async(texts, api_key):
+    """profile_generation.summarize_texts() for coroutines"""
+    texts, chunks = summary_chunks(texts)
+
+    async def summarize_chunk(chunk):
+        prompt, max_tokens = summary_request(texts, chunk)
+        try:
+            return parse_numbered_lines(await complete_async(prompt, api_key, max_tokens=max_tokens), len(chunk))
+        except Exception as e:
+            print(f"Error summarizing entries for profile: {str(e)}")
+            return [None] * len(chunk)
+
+    return collect_summaries(texts, chunks, await run_concurrently(summarize_chunk, chunks))
+
+async def load_entry_notes_async(user_id, api_key):
+    """profile_generation.load_entry_notes() for coroutines"""
+    notes, stale = await run_blocking(pending_entry_notes, db.session, user_id)
+    if stale:
+        results = await summarize_texts_async([text for _, _, text in stale], api_key)
+        await run_blocking(store_entry_summaries, db.session, notes, stale, results)
+    return notes
+
+async def condense_async(window_notes, api_key):
+    """profile_generation.condense() for coroutines"""
+    try:
+        return await complete_async(build_window_prompt(window_notes), api_key, max_tokens=WINDOW_SUMMARY_TOKENS)
+    except Exception as e:
+        print(f"Error condensing journal window for profile: {str(e)}")
+        return None
+
+async def reduce_notes_async(notes, api_key):
+    """profile_generation.reduce_notes() for coroutines"""
+    budget = prompt_budget()
+
+    async def condense(window_notes):
+        return await condense_async(window_notes, api_key) or condense_fallback(window_notes)
+
+    for _ in range(MAX_REDUCE_ROUNDS):
+        windows = reduce_windows(notes, budget)
+        if windows is None:
+            break
+        notes = await run_concurrently(condense, windows)
+
+    return finish_reduce(notes, budget)
+
+async def window_paragraph_async(notes, api_key):
+    """profile_generation.window_paragraph() for coroutines"""
+    paragraph = verbatim_paragraph(notes)
+    if paragraph is not None:
+        return paragraph
+    return await condense_async(await reduce_notes_async(notes, api_key), api_key)
+
+async def complete_windows_async(user_id, windows, api_key):
+    """profile_generation.complete_windows() for coroutines"""
+    pending = pending_windows(windows)
+    if pending:
+        paragraphs = await run_concurrently(lambda window: window_paragraph_async(window.notes, api_key), pending)
+        await run_blocking(store_window_summaries, db.session, user_id, pending, paragraphs)
+
+async def load_profile_notes_async(user_id, api_key):
+    """profile_generation.load_profile_notes() for coroutines"""
+    months, stored = await run_blocking(load_journal_windows, db.session, user_id)
+    if months is None:
+        return await reduce_notes_async(await load_entry_notes_async(user_id, api_key), api_key)
+
+    texts = stale_window_texts(months)
+    if texts:
+        results = await summarize_texts_async(texts, api_key)
+        await run_blocking(store_window_entry_summaries, db.session, months, results)
+    await complete_windows_async(user_id, months, api_key)
+
+    years = year_windows(months, stored)
+    if years:
+        await complete_windows_async(user_id, years, api_key)
+    return finish_reduce([window.summary for window in years or months], prompt_budget())
+
+async def generate_profile_async(user_id, api_key):
+    """
+    profile_generation.generate_profile() for coroutines.
+
+    Returns:
+        tuple: (dominant_mood, secondary_mood, description) as answered by the model
+
+    Raises:
+        AIUnavailable: If the final profile call cannot reach the model
+    """
+    notes = await load_profile_notes_async(user_id, api_key)
+    answer = await complete_async(build_profile_prompt(notes), api_key, max_tokens=200)
+    return parse_profile_response(answer)
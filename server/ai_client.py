@@ -0,0 +1,380 @@
+# Shared OpenAI client: connection pool, deadlines, retries and a circuit breaker
+#
+# Every model call in the app goes through chat_completion() or its streaming
+# twin stream_chat_completion(). They reuse keep-alive connections from one
+# pooled HTTP session, bound each attempt and the call as a whole by a
+# deadline, retry transient failures with jittered exponential backoff, and
+# stop calling an upstream that keeps failing (AIUnavailable is raised
+# immediately while the breaker is open) so callers can fall back to a
+# degraded response instead of tying up workers. async_chat_completion()
+# applies the same policy on an event loop for the asyncio server (ai_server.py).
+#
+# The OpenAI SDK (with aiohttp and numpy behind it) is imported on the first
+# model call rather than at startup; see openai_sdk().
+import asyncio
+import random
+import threading
+import time
+
+from flask import current_app
+import requests
+from requests.adapters import HTTPAdapter
+from werkzeug.local import LocalProxy
+
+from metrics import observe_ai_call
+
+class AIUnavailable(Exception):
+    """The model could not be reached: breaker open, deadline exceeded or retries exhausted"""
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed: calls go through. After failure_threshold consecutive failures it
+    opens and rejects calls for reset_timeout seconds, then lets a single
+    trial call through (half-open): success closes it, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        """closed, open or half-open"""
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        """
+        Decide whether a call may be attempted now.
+
+        Returns:
+            bool: False while open (or while the half-open trial call is running)
+        """
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def stats(self):
+        """Breaker state for monitoring"""
+        with self._lock:
+            return {"state": self._state(), "consecutive_failures": self.failures}
+
+def init_ai_client(app):
+    """
+    Give the application its circuit breaker, sized from its config.
+
+    Args:
+        app (Flask): Application being created
+    """
+    app.extensions['ai_breaker'] = CircuitBreaker(app.config['AI_BREAKER_FAILURES'], app.config['AI_BREAKER_RESET_SECONDS'])
+
+# Breaker of the current application (see init_ai_client)
+breaker = LocalProxy(lambda: current_app.extensions['ai_breaker'])
+
+class SharedSession(requests.Session):
+    """
+    requests session that ignores close().
+
+    openai 0.28 keeps one session per thread and, once it is older than
+    api_requestor.MAX_SESSION_LIFETIME_SECS (180 s), closes it and asks for a
+    new one. Every thread gets this same session, so a real close() would drop
+    the keep-alive connections of all of them every few minutes.
+    """
+
+    def close(self):
+        pass
+
+def build_session(pool_size):
+    """requests session with a keep-alive pool shared by all worker threads"""
+    session = SharedSession()
+    # Retries are handled by chat_completion, not by urllib3
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+_openai = None
+_openai_lock = threading.Lock()
+
+def openai_sdk():
+    """The openai module, imported and pointed at the shared session on first use"""
+    global _openai
+    if _openai is None:
+        with _openai_lock:
+            if _openai is None:
+                import openai
+                # The openai library uses this session for every request instead of one per thread
+                openai.requestssession = build_session(current_app.config['AI_POOL_SIZE'])
+                _openai = openai
+    return _openai
+
+def is_retryable(error):
+    """Transient upstream failures worth another attempt"""
+    openai = openai_sdk()
+    if isinstance(error, (openai.error.Timeout, openai.error.APIConnectionError, openai.error.RateLimitError,
+                          openai.error.ServiceUnavailableError, openai.error.TryAgain)):
+        return True
+    if isinstance(error, openai.error.APIError):
+        return error.http_status is None or error.http_status >= 500
+    return False
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: uniform in [0, base * 2^attempt]"""
+    return random.uniform(0, current_app.config['AI_BACKOFF_SECONDS'] * (2 ** attempt))
+
+def attempt_timeout(timeout, deadline):
+    """
+    Timeout for the next attempt: the per-attempt timeout, cut short by the call's deadline.
+
+    Raises:
+        AIUnavailable: If the deadline has passed
+    """
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        breaker.record_failure()
+        raise AIUnavailable("AI request deadline exceeded")
+    return min(timeout, remaining)
+
+def retry_delay(error, attempt, deadline):
+    """
+    Decide whether a failed attempt is retried.
+
+    Args:
+        error (Exception): What the attempt raised
+        attempt (int): Zero-based number of the failed attempt
+        deadline (float): time.monotonic() value by which the call must finish
+
+    Returns:
+        float: Seconds to wait before the next attempt
+
+    Raises:
+        The error itself if it is not transient, AIUnavailable if retries or time ran out
+    """
+    if not is_retryable(error):
+        # The upstream answered; this is our request's fault, not an outage
+        breaker.record_success()
+        raise error
+    if attempt >= current_app.config['AI_MAX_RETRIES']:
+        breaker.record_failure()
+        raise AIUnavailable(f"AI request failed after {attempt + 1} attempts: {str(error)}") from error
+    delay = backoff_delay(attempt)
+    if time.monotonic() + delay >= deadline:
+        breaker.record_failure()
+        raise AIUnavailable(f"AI request deadline exceeded: {str(error)}") from error
+    return delay
+
+def create_with_retries(timeout, **params):
+    """
+    Call openai.ChatCompletion.create under the breaker, deadline and retry policy.
+
+    Args:
+        timeout (float): Per-attempt timeout in seconds (None = AI_REQUEST_TIMEOUT_SECONDS)
+        params: Arguments for openai.ChatCompletion.create
+
+    Returns:
+        The completion (or chunk iterator when streaming)
+
+    Raises:
+        AIUnavailable: Breaker open, deadline exceeded or retries exhausted
+        openai.error.OpenAIError: Non-transient errors (bad request, authentication)
+    """
+    if not breaker.allow():
+        raise AIUnavailable("AI service unavailable (circuit open)")
+
+    timeout = timeout or current_app.config['AI_REQUEST_TIMEOUT_SECONDS']
+    deadline = time.monotonic() + current_app.config['AI_DEADLINE_SECONDS']
+    attempt = 0
+    while True:
+        request_timeout = attempt_timeout(timeout, deadline)
+        try:
+            return openai_sdk().ChatCompletion.create(request_timeout=request_timeout, **params)
+        except Exception as e:
+            time.sleep(retry_delay(e, attempt, deadline))
+            attempt += 1
+
+def call_outcome(error):
+    """Metrics outcome label for a failed call"""
+    return 'unavailable' if isinstance(error, AIUnavailable) else 'error'
+
+def chat_completion(messages, api_key, max_tokens, model="gpt-3.5-turbo", temperature=0.3, timeout=None):
+    """
+    Run a chat completion with pooling, deadlines, retries and the circuit breaker.
+
+    Args:
+        messages (list): Chat messages
+        api_key (str): OpenAI API key (passed per call, the global key is not touched)
+        max_tokens (int): Completion length cap
+        model (str): Model name
+        temperature (float): Sampling temperature
+        timeout (float): Per-attempt timeout in seconds (None = AI_REQUEST_TIMEOUT_SECONDS)
+
+    Returns:
+        str: The answer text
+
+    Raises:
+        AIUnavailable: Breaker open, deadline exceeded or retries exhausted
+        openai.error.OpenAIError: Non-transient errors (bad request, authentication)
+    """
+    started = time.monotonic()
+    try:
+        response = create_with_retries(
+            timeout, model=model, messages=messages, max_tokens=max_tokens, temperature=temperature, api_key=api_key
+        )
+    except Exception as e:
+        observe_ai_call(model, 'completion', call_outcome(e), time.monotonic() - started)
+        raise
+    return completion_text(response, model, started)
+
+def completion_text(response, model, started):
+    """Record a successful completion and return its answer text"""
+    breaker.record_success()
+    usage = response.get('usage') or {}
+    observe_ai_call(model, 'completion', 'ok', time.monotonic() - started,
+                    usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0))
+    return response.choices[0].message.content
+
+def stream_chat_completion(messages, api_key, max_tokens, model="gpt-3.5-turbo", temperature=0.3, timeout=None):
+    """
+    Stream a chat completion, yielding text fragments as the model produces them.
+
+    Only establishing the stream is retried; once text has been yielded a
+    broken stream raises AIUnavailable. The timeout also bounds the gap
+    between consecutive chunks.
+
+    Args:
+        Same as chat_completion()
+
+    Yields:
+        str: Answer text fragments
+
+    Raises:
+        AIUnavailable: Breaker open, deadline exceeded, retries exhausted or stream broken
+        openai.error.OpenAIError: Non-transient errors (bad request, authentication)
+    """
+    started = time.monotonic()
+    try:
+        chunks = create_with_retries(
+            timeout, model=model, messages=messages, max_tokens=max_tokens, temperature=temperature,
+            api_key=api_key, stream=True
+        )
+    except Exception as e:
+        observe_ai_call(model, 'stream', call_outcome(e), time.monotonic() - started)
+        raise
+    # Streamed responses carry no usage block; each content chunk is one token
+    chunk_count = 0
+    try:
+        for chunk in chunks:
+            text = chunk.choices[0].delta.get('content') if chunk.choices else None
+            if text:
+                chunk_count += 1
+                yield text
+    except GeneratorExit:
+        # Consumer went away (e.g. client disconnected) while the stream was healthy
+        breaker.record_success()
+        observe_ai_call(model, 'stream', 'ok', time.monotonic() - started, completion_tokens=chunk_count)
+        raise
+    except Exception as e:
+        breaker.record_failure()
+        observe_ai_call(model, 'stream', 'unavailable', time.monotonic() - started, completion_tokens=chunk_count)
+        raise AIUnavailable(f"AI stream interrupted: {str(e)}") from e
+    breaker.record_success()
+    observe_ai_call(model, 'stream', 'ok', time.monotonic() - started, completion_tokens=chunk_count)
+
+# Async twin for the asyncio server: same breaker, deadlines, retries and
+# metrics, but a call in flight waits on the event loop instead of holding a thread
+
+_async_session = None
+
+def use_async_session(session):
+    """
+    Share one aiohttp session (and its connection pool) between all async calls.
+
+    Args:
+        session (aiohttp.ClientSession): Session owned by the server's event loop (None to stop sharing)
+    """
+    global _async_session
+    _async_session = session
+
+async def acreate_with_retries(timeout, **params):
+    """
+    Await openai.ChatCompletion.acreate under the breaker, deadline and retry policy.
+
+    Args:
+        Same as create_with_retries()
+
+    Returns:
+        The completion
+
+    Raises:
+        Same as create_with_retries()
+    """
+    if not breaker.allow():
+        raise AIUnavailable("AI service unavailable (circuit open)")
+
+    timeout = timeout or current_app.config['AI_REQUEST_TIMEOUT_SECONDS']
+    deadline = time.monotonic() + current_app.config['AI_DEADLINE_SECONDS']
+    openai = openai_sdk()
+    # Without a session set for the current task the SDK opens (and closes) one per request
+    openai.aiosession.set(_async_session)
+    attempt = 0
+    while True:
+        request_timeout = attempt_timeout(timeout, deadline)
+        try:
+            return await openai.ChatCompletion.acreate(request_timeout=request_timeout, **params)
+        except Exception as e:
+            await asyncio.sleep(retry_delay(e, attempt, deadline))
+            attempt += 1
+
+async def async_chat_completion(messages, api_key, max_tokens, model="gpt-3.5-turbo", temperature=0.3, timeout=None):
+    """
+    chat_completion() for coroutines.
+
+    Args:
+        Same as chat_completion()
+
+    Returns:
+        str: The answer text
+
+    Raises:
+        Same as chat_completion()
+    """
+    started = time.monotonic()
+    try:
+        response = await acreate_with_retries(
+            timeout, model=model, messages=messages, max_tokens=max_tokens, temperature=temperature, api_key=api_key
+        )
+    except Exception as e:
+        observe_ai_call(model, 'completion', call_outcome(e), time.monotonic() - started)
+        raise
+    return completion_text(response, model, started)
@@ -0,0 +1,173 @@
+# Asyncio server for the AI-backed endpoints
+#
+#   cd server && python ai_server.py --port 5556
+#
+# A Flask worker serving POST /analyze-mood or GET /user-profile/<user_id> is
+# held for the whole model call, so throughput tops out at workers / model
+# latency. This aiohttp server answers the same two endpoints (same requests
+# and responses as app.py) with the model calls awaited on one event loop, so
+# a single process can keep hundreds in flight (up to AI_ASYNC_MAX_CONNECTIONS).
+# Run it next to the Flask app and route those paths to it from the reverse
+# proxy; every other endpoint stays on the Flask workers, which then never
+# wait on the model. The breaker, retries, caches and /metrics behave as in
+# the Flask app, per process.
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import traceback
+
+import aiohttp
+from aiohttp import web
+from flask import current_app
+
+from app import create_app
+from ai_async import run_blocking, analyze_mood_async, load_profile_state, generate_profile_async
+from ai_client import AIUnavailable, breaker, use_async_session
+from config import db
+from metrics import render_metrics
+from mood_analysis import get_api_key
+from mood_classifier import get_classifier
+from mood_engine import resolve_engine
+from profile_cache import store_profile, profile_response_body
+from profile_generation import resolve_profile_moods, DEFAULT_DESCRIPTION
+
+# The Flask application whose config, database and caches the handlers use
+FLASK_APP = web.AppKey('flask_app')
+
+async def home(request):
+    """Health check with the breaker state of this process"""
+    return web.json_response({"message": "MoodRing AI server is running!", "ai_circuit": breaker.stats()})
+
+async def metrics(request):
+    """Model call metrics of this process in the Prometheus text format"""
+    if not current_app.config['METRICS_ENABLED']:
+        return web.json_response({"error": "Metrics are disabled"}, status=404)
+    return web.Response(text=render_metrics(), headers={'Content-Type': 'text/plain; version=0.0.4'})
+
+async def analyze_mood(request):
+    """POST /analyze-mood, as AnalyzeMood.post in app.py"""
+    try:
+        data = await request.json()
+        content = data.get('content', '')
+
+        if not content:
+            return web.json_response({"error": "Content is required"}, status=400)
+
+        # auto (default), local or remote - see mood_engine.py
+        try:
+            engine = resolve_engine(data.get('engine') or request.query.get('engine'))
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+
+        # Falls back to the local classifier if the model is unreachable or not configured
+        return web.json_response(await analyze_mood_async(content, engine))
+
+    except Exception as e:
+        print(f"Error in mood analysis: {str(e)}")
+        traceback.print_exc()
+        return web.json_response({"error": f"Failed to analyze mood: {str(e)}", "mood": "neutral"}, status=500)
+
+async def user_profile(request):
+    """GET /user-profile/<user_id>, as UserProfile.get in app.py"""
+    user_id = int(request.match_info['user_id'])
+    try:
+        stats, cached = await run_blocking(load_profile_state, user_id)
+
+        if not stats or stats.entry_count == 0:
+            return web.json_response({"error": "No entries found for this user"}, status=404)
+
+        # Serve the stored profile while the journal hasn't changed since it was generated
+        if cached:
+            return web.json_response(profile_response_body(
+                cached.dominant_mood, cached.secondary_mood, cached.description, stats.entry_count, cached=True
+            ))
+
+        api_key = get_api_key()
+        if not api_key:
+            return web.json_response({"error": "OpenAI API key not configured. Please set OPENAI_API_KEY in your .env file."}, status=500)
+
+        # If the model is unreachable, answer from the mood counts alone instead of waiting on it
+        try:
+            dominant_mood, secondary_mood, description = await generate_profile_async(user_id, api_key)
+            degraded = False
+        except AIUnavailable as e:
+            print(f"Serving degraded profile: {str(e)}")
+            dominant_mood, secondary_mood, description = None, None, DEFAULT_DESCRIPTION
+            degraded = True
+
+        # Entry mood counts take precedence over the model's choice
+        dominant_mood, secondary_mood = resolve_profile_moods(stats.mood_counts(), dominant_mood, secondary_mood)
+
+        # Remember the result until the journal changes (degraded ones are retried next time)
+        if not degraded:
+            await run_blocking(store_profile, db.session, stats, dominant_mood, secondary_mood, description)
+
+        response_body = profile_response_body(dominant_mood, secondary_mood, description, stats.entry_count, cached=False)
+        if degraded:
+            response_body["degraded"] = True
+        return web.json_response(response_body)
+
+    except Exception as e:
+        print(f"Error in profile analysis: {str(e)}")
+        traceback.print_exc()
+        return web.json_response({"error": f"Failed to analyze profile: {str(e)}"}, status=500)
+
+@web.middleware
+async def flask_context(request, handler):
+    """Handle every request inside an app context of the Flask application, as a Flask view would be"""
+    with request.app[FLASK_APP].app_context():
+        return await handler(request)
+
+@web.middleware
+async def cors(request, handler):
+    """Let any origin call, like CORS(app) in the Flask app"""
+    if request.method == 'OPTIONS':
+        response = web.Response()
+        response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+        response.headers['Access-Control-Allow-Headers'] = request.headers.get('Access-Control-Request-Headers', '*')
+    else:
+        response = await handler(request)
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+async def ai_resources(application):
+    """Open the shared API session and database threads for the server's lifetime"""
+    config = application[FLASK_APP].config
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=config['AI_ASYNC_DB_THREADS'], thread_name_prefix='ai-db'))
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=config['AI_ASYNC_MAX_CONNECTIONS']))
+    use_async_session(session)
+    # Train the local classifier now rather than inside the first request
+    await asyncio.to_thread(get_classifier)
+    yield
+    use_async_session(None)
+    await session.close()
+
+def build_app(flask_app=None):
+    """
+    Create the aiohttp application serving the AI endpoints.
+
+    Args:
+        flask_app (Flask): Application to serve (None = a new one from create_app())
+
+    Returns:
+        web.Application: Application ready for web.run_app() or a test client
+    """
+    application = web.Application(middlewares=[cors, flask_context])
+    application[FLASK_APP] = flask_app or create_app()
+    application.cleanup_ctx.append(ai_resources)
+    application.router.add_get('/', home)
+    application.router.add_get('/metrics', metrics)
+    application.router.add_post('/analyze-mood', analyze_mood)
+    application.router.add_get(r'/user-profile/{user_id:\d+}', user_profile)
+    return application
+
+def main():
+    parser = argparse.ArgumentParser(description="Asyncio server for the AI-backed endpoints")
+    parser.add_argument('--host', default='127.0.0.1', help="interface to listen on")
+    parser.add_argument('--port', type=int, default=5556, help="port to listen on")
+    args = parser.parse_args()
+    web.run_app(build_app(), host=args.host, port=args.port)
+
+if __name__ == '__main__':
+    main()
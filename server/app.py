@@ -1,43 +1,103 @@
 # Standard library imports
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 import os
-import uuid
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
 
 # Remote library imports
-from flask import request, make_response, current_app, send_from_directory, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
-from flask_restful import Resource
-from flask_jwt_extended.exceptions import JWTExtendedException
-from werkzeug.utils import secure_filename
-import openai
-
-# Local imports
-from config import app, db, api
-from sqlalchemy import select
-from models import Entry, User
+from flask import Blueprint, Flask, request, make_response, current_app, jsonify, Response, stream_with_context
+from flask_cors import CORS
+from flask_restful import Api, Resource
+
+# Local imports (config.py loads .env)
+from config import db, load_config
+from db_engine import init_engine_events
+from sqlalchemy import select, func, or_, and_
+from sqlalchemy.orm import selectinload
+from models import Entry, User, UserMoodStats, MoodJob
+from moods import VALID_MOODS, PENDING_MOOD
+from pagination import parse_limit, parse_offset, encode_cursor, decode_cursor, encode_id_cursor, decode_id_cursor, is_truthy
+from search import search_entries
+from entry_transfer import export_entries, import_entries
+from mood_stats import get_mood_stats
+from mood_timeline import mood_timeline, parse_day
+from mood_analysis import get_api_key, analyze_batch
+from mood_engine import analyze_mood, resolve_engine
+from mood_classifier import classify_mood
+from mood_cache import mood_result_cache, cache_key, init_mood_cache
+from mood_jobs import enqueue_mood_job
+from profile_cache import get_cached_profile, store_profile, profile_response_body
+from profile_generation import generate_profile, stream_profile, resolve_profile_moods, DEFAULT_DESCRIPTION
+from sse import sse_event, sse_response
+from ai_client import AIUnavailable, breaker, init_ai_client
+from metrics import init_metrics, metrics_response
+from serializers import serialize_entry, serialize_user, serialize_user_summary, json_response
+from passwords import PasswordHashingBusy, init_password_hashing
+from etags import make_etag, tag_response, not_modified, journal_version, entry_version
+from replica import read_session, user_read_session, entry_read_session, init_replica
+from commands import init_commands
+
+# Routes and Flask-RESTful resources, registered on each app by create_app()
+bp = Blueprint('moodring', __name__)
+api = Api(bp)
 
 # Basic route for testing API connectivity
-@app.route('/')
+@bp.route('/')
 def home():
     """Health check endpoint to verify API is running and OpenAI key is configured"""
     api_key = os.getenv('OPENAI_API_KEY')
     return jsonify({
         "message": "MoodRing API is running!",
-        "openai_key_configured": bool(api_key and api_key != 'your_openai_api_key_here')
+        "openai_key_configured": bool(api_key and api_key != 'your_openai_api_key_here'),
+        "ai_circuit": breaker.stats()
     })
 
+@bp.route('/metrics')
+def metrics():
+    """Request latency, SQL and AI call metrics in the Prometheus text format"""
+    if not current_app.config['METRICS_ENABLED']:
+        return make_response({"error": "Metrics are disabled"}, 404)
+    return metrics_response()
+
 class AllUsers(Resource):
     """Resource for handling all user operations (GET all users, POST new user)"""
     
     def get(self):
-        """Retrieve all users from the database"""
-        users = User.query.all()
-        response_body = [user.to_dict() for user in users]
-        return make_response(response_body, 200)
+        """Retrieve a page of users with their entry counts (entries only with ?include=entries)"""
+        include = {value for value in request.args.get('include', '').split(',') if value}
+        if include - {'entries'}:
+            return make_response({"error": "include only supports: entries"}, 400)
+        
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            after_id = decode_id_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return make_response({"error": str(e)}, 400)
+        
+        # entry_count comes from the maintained per-user aggregate, joined in the same query
+        entry_count = func.coalesce(UserMoodStats.entry_count, 0).label('entry_count')
+        if 'entries' in include:
+            # Whole user objects, with every page's entries fetched by one extra IN query
+            query = select(User, entry_count).options(selectinload(User.entries))
+        else:
+            query = select(User.id, User.username, entry_count)
+        query = query.outerjoin(UserMoodStats, UserMoodStats.user_id == User.id).order_by(User.id)
+        if after_id is not None:
+            query = query.where(User.id > after_id)
+        
+        # Fetch one extra row to find out whether another page exists
+        rows = read_session().execute(query.limit(limit + 1)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        if 'entries' in include:
+            users = [{**serialize_user(user), "entry_count": count} for user, count in rows]
+        else:
+            users = [serialize_user_summary(row) for row in rows]
+        
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_id_cursor(users[-1]['id'])
+        
+        return json_response({"users": users, "next_cursor": next_cursor}, 200)
     
     def post(self):
         """Create a new user with username and password"""
@@ -49,9 +109,11 @@ class AllUsers(Resource):
             new_user.set_password(data['password'])
             db.session.add(new_user)
             db.session.commit()
-            return make_response(new_user.to_dict(), 201)
+            return json_response(serialize_user(new_user), 201)
         except KeyError as e:
             return make_response({"error": f"Missing required field: {str(e)}"}, 400)
+        except PasswordHashingBusy:
+            return make_response({"error": "Server is busy, please try again"}, 503, {"Retry-After": "1"})
         except Exception as e:
             db.session.rollback()
             return make_response({"error": "Failed to create user"}, 500)
@@ -62,12 +124,19 @@ class UserById(Resource):
     """Resource for handling individual user operations (GET, PATCH, DELETE by ID)"""
     
     def get(self, id):
-        """Retrieve a specific user by ID"""
-        user = db.session.get(User, id)
-        if user:
-            return make_response(user.to_dict(), 200)
-        else:
+        """Retrieve a specific user by ID (supports If-None-Match)"""
+        username, entries_version = journal_version(db.session, id)
+        if username is None:
             return make_response({"error": "User not found"}, 404)
+        
+        # The user embeds all entries, so the journal version identifies the representation
+        etag = make_etag('user', id, username, entries_version)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        user = user_read_session(id, (username, entries_version)).get(User, id)
+        return tag_response(json_response(serialize_user(user), 200), etag)
     
     def patch(self, id):
         """Update a specific user's information"""
@@ -77,7 +146,7 @@ class UserById(Resource):
             for key, value in data.items():
                 setattr(user, key, value)
             db.session.commit()
-            return make_response(user.to_dict(), 200)
+            return json_response(serialize_user(user), 200)
         else:
             return make_response({"error": "User not found"}, 404)  
     
@@ -93,6 +162,68 @@ class UserById(Resource):
 
 api.add_resource(UserById, '/users/<int:id>')
 
+class UserMoodTimeline(Resource):
+    """Resource for charting a user's moods over time"""
+    
+    def get(self, id):
+        """Mood counts per day, week or month from the daily rollups (supports If-None-Match)"""
+        username, entries_version = journal_version(db.session, id)
+        if username is None:
+            return make_response({"error": "User not found"}, 404)
+        
+        bucket = request.args.get('bucket', 'day')
+        try:
+            start = parse_day(request.args.get('start'), 'start')
+            end = parse_day(request.args.get('end'), 'end')
+        except ValueError as e:
+            return make_response({"error": str(e)}, 400)
+        
+        etag = make_etag('mood-timeline', id, username, entries_version, bucket, start, end)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        try:
+            timeline = mood_timeline(user_read_session(id, (username, entries_version)), id, bucket, start, end)
+        except ValueError as e:
+            return make_response({"error": str(e)}, 400)
+        
+        return tag_response(json_response({"user_id": id, "bucket": bucket, "timeline": timeline}, 200), etag)
+
+api.add_resource(UserMoodTimeline, '/users/<int:id>/mood-timeline')
+
+class UserEntriesExport(Resource):
+    """Resource for downloading a user's whole journal"""
+    
+    def get(self, id):
+        """Stream every entry of a user as NDJSON, oldest first"""
+        version = journal_version(db.session, id)
+        if version[0] is None:
+            return make_response({"error": "User not found"}, 404)
+        
+        session = user_read_session(id, version)
+        return Response(
+            stream_with_context(export_entries(session, id)),
+            mimetype='application/x-ndjson',
+            headers={'Content-Disposition': f'attachment; filename=user-{id}-entries.ndjson'}
+        )
+
+api.add_resource(UserEntriesExport, '/users/<int:id>/entries/export')
+
+class UserEntriesImport(Resource):
+    """Resource for bulk-loading entries into a user's journal"""
+    
+    def post(self, id):
+        """Import an NDJSON body (one entry per line, as produced by the export)"""
+        if db.session.get(User, id) is None:
+            return make_response({"error": "User not found"}, 404)
+        
+        # Lines are read from the request stream as they arrive, never buffered whole
+        result = import_entries(db.session, id, request.stream)
+        return make_response(result, 400 if result['error'] else 200)
+
+api.add_resource(UserEntriesImport, '/users/<int:id>/entries/import')
+
 class Login(Resource):
     """Resource for user authentication"""
     
@@ -103,9 +234,18 @@ class Login(Resource):
             user = User.query.filter_by(username=data['username']).first()
             
             if user and user.authenticate(data['password']):
-                return make_response(user.to_dict(), 200)
+                # Upgrade hashes made with an older cost factor while we have the plain password
+                if user.password_needs_rehash():
+                    try:
+                        user.set_password(data['password'])
+                        db.session.commit()
+                    except Exception:
+                        db.session.rollback()
+                return json_response(serialize_user(user), 200)
             else:
                 return make_response({"error": "Invalid username or password"}, 401)
+        except PasswordHashingBusy:
+            return make_response({"error": "Server is busy, please try again"}, 503, {"Retry-After": "1"})
         except Exception as e:
             return make_response({"error": "Login failed"}, 500)
 
@@ -115,13 +255,55 @@ class AllEntries(Resource):
     """Resource for handling all journal entry operations"""
     
     def get(self):
-        """Retrieve all entries for a specific user"""
+        """Retrieve a page of entries for a specific user, newest first (supports If-None-Match)"""
         # For now, we'll get user_id from query params
         # In a real app, this would come from JWT token
         user_id = request.args.get('user_id', 1)  # Default to user 1 for now
-        entries = Entry.query.filter_by(user_id=user_id).all()
-        response_body = [entry.to_dict() for entry in entries]
-        return make_response(response_body, 200)
+        
+        # Any entry write bumps the journal version, so it plus the page parameters identify the page
+        version = journal_version(db.session, user_id)
+        etag = make_etag('entries', user_id, *version, sorted(request.args.items(multi=True)))
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        session = user_read_session(user_id, version)
+        
+        # Stable newest-first order; id breaks ties between identical timestamps
+        query = select(Entry).filter_by(user_id=user_id).order_by(Entry.created_at.desc(), Entry.id.desc())
+        
+        # Legacy unpaginated response, only when explicitly requested with ?all=true
+        if is_truthy(request.args.get('all')):
+            response_body = [serialize_entry(entry) for entry in session.scalars(query)]
+            return tag_response(json_response(response_body, 200), etag)
+        
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            cursor = decode_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return make_response({"error": str(e)}, 400)
+        
+        # Keyset condition: everything strictly older than the last entry of the previous page
+        if cursor:
+            cursor_created_at, cursor_id = cursor
+            query = query.where(or_(
+                Entry.created_at < cursor_created_at,
+                and_(Entry.created_at == cursor_created_at, Entry.id < cursor_id)
+            ))
+        
+        # Fetch one extra row to find out whether another page exists
+        entries = session.scalars(query.limit(limit + 1)).all()
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor(entries[-1].created_at, entries[-1].id)
+        
+        return tag_response(json_response({
+            "entries": [serialize_entry(entry) for entry in entries],
+            "next_cursor": next_cursor
+        }, 200), etag)
     
     def post(self):
         """Create a new journal entry"""
@@ -130,12 +312,25 @@ class AllEntries(Resource):
             new_entry = Entry(
                 title = data['title'],
                 content = data['content'],
-                mood = data.get('mood', 'neutral'),  # Default to neutral if not provided
+                # Without a mood the entry is saved as "pending" and analyzed in the background
+                mood = data.get('mood') or PENDING_MOOD,
                 user_id = data.get('user_id', 1)  # Default to user 1 if not provided
             )
             db.session.add(new_entry)
+            
+            # The job row is written in the same transaction as the entry it analyzes
+            job = None
+            if new_entry.mood == PENDING_MOOD:
+                job = MoodJob(entry=new_entry)
+                db.session.add(job)
+            
             db.session.commit()
-            return make_response(new_entry.to_dict(), 201)
+            
+            response_body = serialize_entry(new_entry)
+            if job:
+                enqueue_mood_job(job.id)
+                response_body['mood_job_id'] = job.id
+            return json_response(response_body, 201)
         except KeyError as e:
             return make_response({"error": f"Missing required field: {str(e)}"}, 400)
         except Exception as e:
@@ -144,16 +339,52 @@ class AllEntries(Resource):
 
 api.add_resource(AllEntries, '/entries')
 
+class EntrySearch(Resource):
+    """Resource for full-text search within a user's journal"""
+    
+    def get(self):
+        """Search a user's entry titles and content, best matches first"""
+        user_id = request.args.get('user_id', 1)  # Same default as AllEntries
+        query = request.args.get('q', '').strip()
+        
+        if not query:
+            return make_response({"error": "q is required"}, 400)
+        
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            offset = parse_offset(request.args.get('offset'))
+            session = user_read_session(user_id, journal_version(db.session, user_id))
+            results, has_more = search_entries(session, user_id, query, limit, offset)
+        except ValueError as e:
+            return make_response({"error": str(e)}, 400)
+        
+        return json_response({
+            "results": [
+                {**serialize_entry(entry), "rank": rank, "snippet": snippet}
+                for entry, rank, snippet in results
+            ],
+            "next_offset": offset + limit if has_more else None
+        }, 200)
+
+api.add_resource(EntrySearch, '/entries/search')
+
 class EntryById(Resource):
     """Resource for handling individual journal entry operations"""
     
     def get(self, id):
-        """Retrieve a specific journal entry by ID"""
-        entry = db.session.get(Entry, id)
-        if entry:
-            return make_response(entry.to_dict(), 200)
-        else:
+        """Retrieve a specific journal entry by ID (supports If-None-Match)"""
+        version = entry_version(db.session, id)
+        if version is None:
             return make_response({"error": "Entry not found"}, 404)
+        
+        # updated_at changes on every write to the entry (see Entry.updated_at)
+        etag = make_etag('entry', id, *version)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        entry = entry_read_session(id, version).get(Entry, id)
+        return tag_response(json_response(serialize_entry(entry), 200), etag)
     
     def patch(self, id):
         """Update a specific journal entry"""
@@ -173,8 +404,12 @@ class EntryById(Resource):
                     if key in allowed_fields and hasattr(entry, key):
                         setattr(entry, key, value)
                 
+                # Stamp real edits so the entry's ETag changes (onupdate covers other writers)
+                if db.session.is_modified(entry):
+                    entry.updated_at = datetime.now()
+                
                 db.session.commit()
-                return make_response(entry.to_dict(), 200)
+                return json_response(serialize_entry(entry), 200)
             except Exception as e:
                 db.session.rollback()
                 return make_response({"error": "Failed to update entry"}, 500)
@@ -204,11 +439,24 @@ class EntryById(Resource):
 
 api.add_resource(EntryById, '/entries/<int:id>')
 
+class MoodJobById(Resource):
+    """Resource for polling background mood analysis jobs"""
+    
+    def get(self, id):
+        """Retrieve the status (and result, once done) of a mood analysis job"""
+        job = db.session.get(MoodJob, id)
+        if job:
+            return make_response(job.to_dict(), 200)
+        else:
+            return make_response({"error": "Mood job not found"}, 404)
+
+api.add_resource(MoodJobById, '/mood-jobs/<int:id>')
+
 class AnalyzeMood(Resource):
     """Resource for AI-powered mood analysis of journal entries"""
     
     def post(self):
-        """Analyze the emotional tone of journal content using OpenAI GPT-3.5-turbo"""
+        """Analyze the emotional tone of journal content with the local classifier and/or OpenAI GPT-3.5-turbo"""
         try:
             data = request.get_json()
             content = data.get('content', '')
@@ -216,80 +464,14 @@ class AnalyzeMood(Resource):
             if not content:
                 return make_response({"error": "Content is required"}, 400)
             
-            # Set up OpenAI client
-            api_key = os.getenv('OPENAI_API_KEY')
-            
-            if not api_key or api_key == 'your_openai_api_key_here':
-                return make_response({"error": "OpenAI API key not configured. Please set OPENAI_API_KEY in your .env file."}, 500)
-            
-            # Create the prompt for mood analysis
-            prompt = f"""
-            Analyze the emotional tone of this journal entry and identify the PRIMARY emotions present.
-            
-            IMPORTANT RULES:
-            - Only identify emotions that are CLEARLY expressed in the content
-            - Do NOT infer emotions from punctuation alone (like "...")
-            - Do NOT add emotions unless they are explicitly stated or strongly implied
-            - If the content is minimal or unclear, default to "neutral"
-            - Be conservative - it's better to miss an emotion than to add one that isn't there
-            
-            Choose from these categories:
-            - happy: explicitly positive, joyful, content feelings
-            - excited: enthusiastic, energetic, thrilled feelings  
-            - calm: peaceful, relaxed, serene feelings
-            - neutral: balanced, factual, or unclear emotional content
-            - sad: explicitly unhappy, down, disappointed feelings
-            - angry: frustrated, irritated, mad feelings
-            - anxious: worried, nervous, stressed feelings
-            - grateful: thankful, appreciative feelings
-            - hopeful: optimistic, looking forward feelings
-            - confused: uncertain, unclear feelings
-            - in love: romantic, passionate, loving feelings
-            
-            Journal entry: "{content}"
-            
-            Respond with ONLY the mood categories separated by commas (e.g., "happy" or "sad,anxious" or "neutral").
-            If no clear emotions are present, respond with "neutral".
-            """
-            
-            # Call OpenAI API
-            openai.api_key = api_key
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an emotion analysis expert. Be CONSERVATIVE and ACCURATE. Only identify emotions that are clearly expressed in the text. Do not infer emotions from minimal content or punctuation. When in doubt, choose 'neutral'."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=50,
-                temperature=0.3
-            )
-            
-            # Extract the moods from the response
-            mood_response = response.choices[0].message.content.strip().lower()
-            
-            # Parse and validate the moods
-            valid_moods = ['happy', 'excited', 'calm', 'neutral', 'sad', 'angry', 'anxious', 'grateful', 'hopeful', 'confused', 'in love']
-            
-            # Split by comma and clean up each mood
-            detected_moods = [mood.strip() for mood in mood_response.split(',')]
-            
-            # Filter to only include valid moods
-            validated_moods = [mood for mood in detected_moods if mood in valid_moods]
-            
-            # If no valid moods found, default to neutral (more conservative approach)
-            if not validated_moods:
-                validated_moods = ['neutral']
-            elif len(validated_moods) == 1 and validated_moods[0] == 'neutral':
-                # Keep neutral if that's what the AI determined
-                pass
-            else:
-                # Limit to maximum 2 emotions to avoid over-analysis
-                validated_moods = validated_moods[:2]
-            
-            # Join back into comma-separated string
-            mood = ','.join(validated_moods)
+            # auto (default), local or remote - see mood_engine.py
+            try:
+                engine = resolve_engine(data.get('engine') or request.args.get('engine'))
+            except ValueError as e:
+                return make_response({"error": str(e)}, 400)
             
-            return make_response({"mood": mood}, 200)
+            # Falls back to the local classifier if the model is unreachable or not configured
+            return make_response(analyze_mood(content, engine), 200)
             
         except Exception as e:
             print(f"Error in mood analysis: {str(e)}")
@@ -299,151 +481,140 @@ class AnalyzeMood(Resource):
 
 api.add_resource(AnalyzeMood, '/analyze-mood')
 
+class AnalyzeMoodBatch(Resource):
+    """Resource for analyzing many journal entries at once (backfills and importers)"""
+    
+    def post(self):
+        """Analyze a list of entries, packing them into as few concurrent model calls as possible"""
+        try:
+            data = request.get_json()
+            items = data.get('entries') if isinstance(data, dict) else None
+            
+            if not isinstance(items, list) or not items:
+                return make_response({"error": "entries must be a non-empty list"}, 400)
+            if len(items) > current_app.config['MOOD_BATCH_MAX_ENTRIES']:
+                return make_response({"error": f"At most {current_app.config['MOOD_BATCH_MAX_ENTRIES']} entries per batch"}, 400)
+            
+            # Accept either plain strings or {"id": ..., "content": ...} objects
+            normalized = []
+            for position, item in enumerate(items):
+                if isinstance(item, str):
+                    item = {"content": item}
+                content = item.get('content') if isinstance(item, dict) else None
+                if not isinstance(content, str) or not content.strip():
+                    return make_response({"error": f"Entry {position} has no content"}, 400)
+                normalized.append({"id": item.get('id', position), "content": content})
+            
+            # Serve what we can from the result cache first
+            results = [{"id": item['id'], "mood": mood_result_cache.get(item['content'])} for item in normalized]
+            for result in results:
+                result['cached'] = result['mood'] is not None
+            
+            # Analyze each distinct uncached content once
+            pending = {}
+            for item, result in zip(normalized, results):
+                if result['mood'] is None:
+                    pending.setdefault(cache_key(item['content']), item['content'])
+            
+            if pending:
+                keys, contents = list(pending.keys()), list(pending.values())
+                
+                # Without an API key every entry goes straight to the local classifier
+                api_key = get_api_key()
+                if api_key:
+                    moods = analyze_batch(
+                        contents,
+                        api_key,
+                        token_budget=current_app.config['MOOD_BATCH_TOKEN_BUDGET'],
+                        max_items=current_app.config['MOOD_BATCH_MAX_ITEMS_PER_CALL'],
+                        parallelism=current_app.config['MOOD_BATCH_PARALLELISM'],
+                        timeout=current_app.config['MOOD_REQUEST_TIMEOUT_SECONDS']
+                    )
+                else:
+                    moods = [None] * len(contents)
+                analyzed = dict(zip(keys, moods))
+                for content, mood in zip(contents, moods):
+                    if mood is not None:
+                        mood_result_cache.put(content, mood)
+                
+                for item, result in zip(normalized, results):
+                    if result['mood'] is None:
+                        result['mood'] = analyzed[cache_key(item['content'])]
+                        if result['mood'] is None:
+                            # Model call failed for this entry: use the offline classifier
+                            result['mood'] = classify_mood(item['content'])[0]
+                            result['fallback'] = True
+            
+            return make_response({"results": results}, 200)
+            
+        except Exception as e:
+            print(f"Error in batch mood analysis: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return make_response({"error": f"Failed to analyze moods: {str(e)}"}, 500)
+
+api.add_resource(AnalyzeMoodBatch, '/analyze-mood/batch')
+
+class MoodCacheStats(Resource):
+    """Resource exposing mood analysis cache counters for capacity sizing"""
+    
+    def get(self):
+        """Return hit/miss counters and occupancy of the mood result cache"""
+        return make_response(mood_result_cache.stats(), 200)
+
+api.add_resource(MoodCacheStats, '/analyze-mood/cache-stats')
+
 class UserProfile(Resource):
     """Resource for AI-generated personality profiles based on journal entries"""
     
     def get(self, user_id):
         """Generate a comprehensive personality profile by analyzing all user's journal entries"""
         try:
-            # Get all entries for the user
-            entries = Entry.query.filter_by(user_id=user_id).all()
+            # Mood frequencies and entry count come from the incrementally maintained aggregate row
+            # Read from the primary: the stored profile is keyed on its entries_version
+            stats = get_mood_stats(db.session, user_id)
             
-            if not entries:
+            if not stats or stats.entry_count == 0:
                 return make_response({"error": "No entries found for this user"}, 404)
             
-            # Combine all entry content for analysis
-            all_content = " ".join([entry.content for entry in entries])
-            all_titles = " ".join([entry.title for entry in entries])
+            # Serve the stored profile while the journal hasn't changed since it was generated
+            cached = get_cached_profile(db.session, stats)
+            if cached:
+                return make_response(profile_response_body(
+                    cached.dominant_mood, cached.secondary_mood, cached.description, stats.entry_count, cached=True
+                ), 200)
             
             # Set up OpenAI client
-            api_key = os.getenv('OPENAI_API_KEY')
+            api_key = get_api_key()
             
-            if not api_key or api_key == 'your_openai_api_key_here':
+            if not api_key:
                 return make_response({"error": "OpenAI API key not configured. Please set OPENAI_API_KEY in your .env file."}, 500)
             
-            # Create the prompt for personality/mood profile analysis
-            prompt = f"""
-            Analyze this person's journal entries to understand their overall emotional personality and mood patterns.
-            
-            Journal titles: {all_titles}
-            Journal content: {all_content}
-            
-            CRITICAL MOOD DETECTION RULES:
-            - Look for ANY emotional content in the writing (happy, sad, anxious, excited, etc.)
-            - If you find ANY emotions, DO NOT choose "neutral" as the dominant mood
-            - Only use "neutral" if the entries are completely devoid of emotional content
-            - Be aggressive about detecting emotions - even subtle ones should be identified
-            
-            Based on these entries, provide:
-            1. A dominant overall mood/personality trait (choose from: happy, excited, calm, neutral, sad, angry, anxious, grateful, hopeful, confused)
-            2. A secondary mood trait that also appears frequently
-            3. A brief personality description (2-3 sentences) written directly to the user using "you" - make it personal and engaging
-            
-            MOOD DETECTION PRIORITY:
-            - First, scan for obvious emotions (happy, sad, angry, anxious)
-            - Then look for subtle emotions (grateful, hopeful, confused, excited)
-            - Only default to "neutral" if absolutely no emotional patterns are found
-            - If you see ANY emotional content, use that instead of neutral
-            
-            For the description, write as if you're speaking directly to the user about their personality and emotional patterns.
-            Use "you" and "your" to make it personal and engaging.
-            
-            Respond in this exact format:
-            DOMINANT_MOOD: [mood]
-            SECONDARY_MOOD: [mood]
-            DESCRIPTION: [description]
-            """
-            
-            # Call OpenAI API
-            openai.api_key = api_key
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a personality and mood analysis expert. Analyze journal entries to understand emotional patterns. Avoid defaulting to 'neutral' unless the content truly shows no emotional patterns."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.3
+            # Summarize entries and condense months and years (all stored) into a profile
+            # without any model call exceeding PROFILE_TOKEN_BUDGET
+            # If the model is unreachable, answer from the mood counts alone instead of waiting on it
+            try:
+                dominant_mood, secondary_mood, description = generate_profile(db.session, user_id, api_key)
+                degraded = False
+            except AIUnavailable as e:
+                print(f"Serving degraded profile: {str(e)}")
+                dominant_mood, secondary_mood, description = None, None, DEFAULT_DESCRIPTION
+                degraded = True
+            
+            # Entry mood counts take precedence over the model's choice
+            dominant_mood, secondary_mood = resolve_profile_moods(stats.mood_counts(), dominant_mood, secondary_mood)
+            
+            # Remember the result until the journal changes (degraded ones are retried next time)
+            if not degraded:
+                store_profile(db.session, stats, dominant_mood, secondary_mood, description)
+            
+            # Combined mood for the gradient is built into the response body
+            response_body = profile_response_body(
+                dominant_mood, secondary_mood, description, stats.entry_count, cached=False
             )
-            
-            # Parse the response
-            analysis_response = response.choices[0].message.content.strip()
-            
-            # Extract the components
-            lines = analysis_response.split('\n')
-            dominant_mood = None
-            secondary_mood = None
-            description = "A thoughtful journal keeper."
-            
-            for line in lines:
-                if line.startswith('DOMINANT_MOOD:'):
-                    dominant_mood = line.replace('DOMINANT_MOOD:', '').strip().lower()
-                elif line.startswith('SECONDARY_MOOD:'):
-                    secondary_mood = line.replace('SECONDARY_MOOD:', '').strip().lower()
-                elif line.startswith('DESCRIPTION:'):
-                    description = line.replace('DESCRIPTION:', '').strip()
-            
-            # Validate moods with better logic
-            valid_moods = ['happy', 'excited', 'calm', 'neutral', 'sad', 'angry', 'anxious', 'grateful', 'hopeful', 'confused', 'in love']
-            
-            # Only default to neutral if no valid mood was found or if both moods are neutral
-            if dominant_mood not in valid_moods:
-                dominant_mood = "neutral"
-            if secondary_mood not in valid_moods:
-                secondary_mood = "neutral"
-            
-            # Always use entry mood data as the primary source of truth for consistency
-            all_entry_moods = []
-            for entry in entries:
-                if entry.mood and entry.mood != "neutral":
-                    all_entry_moods.extend([mood.strip() for mood in entry.mood.split(',') if mood.strip() != "neutral"])
-            
-            # If we have entry mood data, use it to validate/override AI response
-            if all_entry_moods:
-                # Count mood frequencies from actual entries
-                mood_counts = {}
-                for mood in all_entry_moods:
-                    if mood in valid_moods:
-                        mood_counts[mood] = mood_counts.get(mood, 0) + 1
-                
-                if mood_counts:
-                    # Use the most frequent mood from entries as dominant (more reliable than AI)
-                    dominant_mood = max(mood_counts, key=mood_counts.get)
-                    # Remove the dominant mood from counts and get the second most frequent
-                    mood_counts.pop(dominant_mood, None)
-                    if mood_counts:
-                        secondary_mood = max(mood_counts, key=mood_counts.get)
-                    else:
-                        # If only one mood found, use a complementary mood as secondary
-                        if dominant_mood in ["happy", "excited"]:
-                            secondary_mood = "grateful"
-                        elif dominant_mood in ["sad", "angry"]:
-                            secondary_mood = "hopeful"
-                        elif dominant_mood in ["anxious", "confused"]:
-                            secondary_mood = "calm"
-                        else:
-                            secondary_mood = "calm"
-                else:
-                    # Fallback if no valid moods found in entries
-                    dominant_mood = "calm"
-                    secondary_mood = "hopeful"
-            else:
-                # If no entry mood data, use AI response but avoid neutral
-                if dominant_mood == "neutral":
-                    dominant_mood = "calm"
-                if secondary_mood == "neutral":
-                    secondary_mood = "hopeful"
-            
-            # Create combined mood for gradient
-            combined_mood = f"{dominant_mood},{secondary_mood}"
-            
-            return make_response({
-                "dominant_mood": dominant_mood,
-                "secondary_mood": secondary_mood,
-                "combined_mood": combined_mood,
-                "description": description,
-                "entry_count": len(entries)
-            }, 200)
+            if degraded:
+                response_body["degraded"] = True
+            return make_response(response_body, 200)
             
         except Exception as e:
             print(f"Error in profile analysis: {str(e)}")
@@ -453,6 +624,118 @@ class UserProfile(Resource):
 
 api.add_resource(UserProfile, '/user-profile/<int:user_id>')
 
+class UserProfileStream(Resource):
+    """Resource streaming the personality profile as Server-Sent Events"""
+    
+    def get(self, user_id):
+        """Send the mood aggregates immediately, then the description as the model writes it"""
+        # From the primary, like UserProfile.get: the stored profile is keyed on its entries_version
+        stats = get_mood_stats(db.session, user_id)
+        
+        if not stats or stats.entry_count == 0:
+            return make_response({"error": "No entries found for this user"}, 404)
+        
+        entry_count = stats.entry_count
+        cached = get_cached_profile(db.session, stats)
+        api_key = get_api_key()
+        
+        if not cached and not api_key:
+            return make_response({"error": "OpenAI API key not configured. Please set OPENAI_API_KEY in your .env file."}, 500)
+        
+        def moods_event(dominant_mood, secondary_mood):
+            return sse_event("moods", {
+                "dominant_mood": dominant_mood,
+                "secondary_mood": secondary_mood,
+                "combined_mood": f"{dominant_mood},{secondary_mood}",
+                "entry_count": entry_count
+            })
+        
+        def events():
+            # Stored profile: everything is known up front
+            if cached:
+                yield moods_event(cached.dominant_mood, cached.secondary_mood)
+                yield sse_event("description", {"text": cached.description})
+                yield sse_event("profile", profile_response_body(
+                    cached.dominant_mood, cached.secondary_mood, cached.description, entry_count, cached=True
+                ))
+                return
+            
+            # Moods come from the aggregate row, so the page can render before the model starts
+            yield moods_event(*resolve_profile_moods(stats.mood_counts()))
+            
+            fragments = []
+            degraded = False
+            dominant_mood = secondary_mood = None
+            try:
+                for kind, value in stream_profile(db.session, user_id, api_key):
+                    if kind == "description":
+                        fragments.append(value)
+                        yield sse_event("description", {"text": value})
+                    else:
+                        dominant_mood, secondary_mood, description = value
+            except AIUnavailable as e:
+                print(f"Serving degraded profile: {str(e)}")
+                degraded = True
+                description = "".join(fragments) or DEFAULT_DESCRIPTION
+                if not fragments:
+                    yield sse_event("description", {"text": description})
+            except Exception as e:
+                print(f"Error in streamed profile analysis: {str(e)}")
+                import traceback
+                traceback.print_exc()
+                yield sse_event("error", {"error": f"Failed to analyze profile: {str(e)}"})
+                return
+            
+            # Entry mood counts take precedence over the model's choice
+            dominant_mood, secondary_mood = resolve_profile_moods(stats.mood_counts(), dominant_mood, secondary_mood)
+            response_body = profile_response_body(dominant_mood, secondary_mood, description, entry_count, cached=False)
+            if degraded:
+                response_body["degraded"] = True
+            else:
+                store_profile(db.session, stats, dominant_mood, secondary_mood, description)
+            yield sse_event("profile", response_body)
+        
+        return sse_response(events())
+
+api.add_resource(UserProfileStream, '/user-profile/<int:user_id>/stream')
+
+def create_app(test_config=None):
+    """
+    Build a new application: configuration, extensions, hooks, routes and CLI commands.
+
+    Args:
+        test_config (dict): Settings that replace the environment values (tests, benchmarks)
+
+    Returns:
+        Flask: The configured application
+    """
+    app = Flask(__name__)
+    load_config(app, test_config)
+    
+    db.init_app(app)
+    with app.app_context():
+        init_engine_events(db.engines.values(), app.config)
+    
+    # Every route and resource above lives on the blueprint
+    app.register_blueprint(bp)
+    
+    # Enable Cross-Origin Resource Sharing (CORS)
+    # Allows frontend to make requests to backend from different origins
+    CORS(app)
+    
+    # Per-application state: breaker, caches, worker pools, replica sessions
+    init_ai_client(app)
+    init_mood_cache(app)
+    init_password_hashing(app)
+    init_replica(app)
+    init_commands(app)
+    
+    # Time every request and count the SQL it runs
+    if app.config['METRICS_ENABLED']:
+        init_metrics(app)
+    
+    return app
+
 # Run the Flask application
 if __name__ == '__main__':
-    app.run(debug=True, port=5555)
\ No newline at end of file
+    create_app().run(debug=True, port=5555)
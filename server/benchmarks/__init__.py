@@ -0,0 +1,2 @@
+# Micro and endpoint benchmarks, run from the server directory:
+#   python -m benchmarks.<name> --help
@@ -0,0 +1,155 @@
+# Model calls in flight: Flask workers vs the asyncio AI server
+#
+#   cd server && python -m benchmarks.bench_ai_concurrency --requests 200 --flask-workers 8 --ai-latency 0.5
+#
+# Fires the same burst of AI requests (remote mood analysis of unique content,
+# cold profiles of fresh users) at the Flask app from --flask-workers threads,
+# as a pool of synchronous workers would serve them, and all at once at
+# ai_server.py. The fake OpenAI server (fake_openai.py) answers after
+# --ai-latency seconds, so the Flask burst takes about
+# requests / workers * latency while the async server overlaps every call.
+# A probe keeps calling GET /entries on the Flask app during each burst to
+# show CRUD latency is unaffected.
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+
+from benchmarks.common import use_temporary_database, percentile
+from fake_openai import start_fake_openai
+
+database_path = use_temporary_database()
+os.environ.setdefault('MOOD_JOB_WORKERS', '0')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+os.environ['OPENAI_API_KEY'] = 'bench'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Model calls in flight: Flask workers vs the asyncio AI server")
+    parser.add_argument('--requests', type=int, default=200, help="requests per scenario")
+    parser.add_argument('--flask-workers', type=int, default=8, help="concurrent Flask requests (worker pool size)")
+    parser.add_argument('--ai-latency', type=float, default=0.5, help="seconds the fake OpenAI server takes per call")
+    parser.add_argument('--entries-per-user', type=float, default=10, help="mean entries per profiled user")
+    return parser.parse_args()
+
+args = parse_args()
+fake_server = start_fake_openai(latency=args.ai_latency)
+os.environ['OPENAI_API_BASE'] = fake_server.api_base
+
+from aiohttp import ClientSession, web
+from flask_migrate import upgrade
+
+from ai_server import build_app
+from app import create_app
+from config import db, init_migrations
+from datagen import generate_dataset
+
+app = create_app()
+
+def analyze_payload(number, server):
+    return {"content": f"Request {number} to the {server} server: I felt uneasy all afternoon.", "engine": "remote"}
+
+def flask_burst(requests):
+    """Run (method, path, json) requests from a pool of --flask-workers threads"""
+    client = app.test_client()
+
+    def call(request):
+        method, path, payload = request
+        started = time.perf_counter()
+        response = client.open(path, method=method, json=payload)
+        return time.perf_counter() - started, response.status_code
+
+    with ThreadPoolExecutor(max_workers=args.flask_workers) as executor:
+        return list(executor.map(call, requests))
+
+async def async_burst(base_url, requests):
+    """Run (method, path, json) requests against the AI server, all at once"""
+    async with ClientSession() as session:
+        async def call(request):
+            method, path, payload = request
+            started = time.perf_counter()
+            async with session.request(method, base_url + path, json=payload) as response:
+                await response.read()
+                return time.perf_counter() - started, response.status
+
+        return await asyncio.gather(*(call(request) for request in requests))
+
+async def serve_ai(requests):
+    """Start ai_server.py on a free port, run the burst and stop it"""
+    runner = web.AppRunner(build_app(app))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        return await async_burst(f'http://127.0.0.1:{port}', requests)
+    finally:
+        await runner.cleanup()
+
+def with_crud_probe(run, user_id):
+    """
+    Run a burst while a thread keeps calling GET /entries on the Flask app.
+
+    Returns:
+        tuple: (burst results, burst seconds, probe latencies)
+    """
+    client = app.test_client()
+    stop = threading.Event()
+    probes = []
+
+    def probe():
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get(f'/entries?user_id={user_id}')
+            probes.append(time.perf_counter() - started)
+            time.sleep(0.01)
+
+    thread = threading.Thread(target=probe)
+    thread.start()
+    started = time.perf_counter()
+    try:
+        results = run()
+    finally:
+        elapsed = time.perf_counter() - started
+        stop.set()
+        thread.join()
+    return results, elapsed, probes
+
+def report(name, results, elapsed, probes):
+    latencies = [latency for latency, _ in results]
+    errors = sum(1 for _, status in results if status >= 400)
+    print(f"{name:<34}{len(results):>6}{errors:>8}{elapsed:>9.2f}{len(results) / elapsed:>9.1f}"
+          f"{percentile(latencies, 50) * 1000:>9.0f}{percentile(latencies, 95) * 1000:>9.0f}"
+          f"{percentile(probes, 50) * 1000:>11.1f}{percentile(probes, 95) * 1000:>11.1f}")
+
+def main():
+    init_migrations(app)
+    with app.app_context():
+        upgrade()
+        first_id, user_count, _ = generate_dataset(db.session, 2 * args.requests + 1, args.entries_per_user, seed=1)
+    user_ids = list(range(first_id, first_id + user_count))
+    probe_user, flask_users, async_users = user_ids[0], user_ids[1:args.requests + 1], user_ids[args.requests + 1:]
+
+    print(f"{args.requests} requests per scenario; Flask: {args.flask_workers} workers; "
+          f"fake OpenAI latency {args.ai_latency}s")
+    print(f"{'scenario':<34}{'reqs':>6}{'errors':>8}{'total s':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+          f"{'crud p50':>11}{'crud p95':>11}")
+    try:
+        scenarios = [
+            ("POST /analyze-mood", 'POST', lambda number, server: '/analyze-mood', analyze_payload),
+            ("GET /user-profile/<id> (cold)", 'GET',
+             lambda number, server: f"/user-profile/{(flask_users if server == 'flask' else async_users)[number]}",
+             lambda number, server: None),
+        ]
+        for name, method, path, payload in scenarios:
+            flask_requests = [(method, path(number, 'flask'), payload(number, 'flask')) for number in range(args.requests)]
+            async_requests = [(method, path(number, 'async'), payload(number, 'async')) for number in range(args.requests)]
+            report(f"{name} flask", *with_crud_probe(lambda: flask_burst(flask_requests), probe_user))
+            report(f"{name} async", *with_crud_probe(lambda: asyncio.run(serve_ai(async_requests)), probe_user))
+    finally:
+        fake_server.shutdown()
+        os.remove(database_path)
+
+if __name__ == '__main__':
+    main()
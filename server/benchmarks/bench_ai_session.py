@@ -0,0 +1,76 @@
+# Keep-alive reuse of the shared OpenAI session past the SDK's session lifetime
+#
+#   cd server && python -m benchmarks.bench_ai_session --threads 4 --calls 50
+#
+# openai 0.28 closes a thread's requests session once it is older than
+# api_requestor.MAX_SESSION_LIFETIME_SECS (180 s) and makes a new one. Runs
+# --calls model calls on each of --threads threads against the fake OpenAI
+# server (fake_openai.py), first within the lifetime and then with the
+# lifetime at zero so every call is past it, and counts the TCP connections
+# the server accepts. The pooled session (see ai_client.py) should keep
+# reusing the connections it already has; exits with status 1 if calls past
+# the lifetime open new ones.
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import time
+
+os.environ.setdefault('MOOD_JOB_WORKERS', '0')
+
+from fake_openai import start_fake_openai
+
+fake_server = start_fake_openai()
+os.environ['OPENAI_API_BASE'] = fake_server.api_base
+
+from ai_client import chat_completion, openai_sdk
+from app import create_app
+from config import with_app_context
+
+app = create_app()
+
+def burst(threads, calls):
+    """
+    Returns:
+        tuple: (TCP connections opened, seconds) for calls model calls on each of threads threads
+    """
+    @with_app_context
+    def run(number):
+        for call in range(calls):
+            chat_completion([{"role": "user", "content": f'Journal entry: "Call {number}-{call}"'}], 'bench', 5)
+
+    connections = fake_server.connections
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(run, range(threads)))
+    return fake_server.connections - connections, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep-alive reuse of the shared OpenAI session past the SDK's session lifetime")
+    parser.add_argument('--threads', type=int, default=4, help="threads making model calls")
+    parser.add_argument('--calls', type=int, default=50, help="model calls per thread and phase")
+    args = parser.parse_args()
+
+    with app.app_context():
+        api_requestor = openai_sdk().api_requestor
+        lifetime = api_requestor.MAX_SESSION_LIFETIME_SECS
+        try:
+            fresh_connections, fresh_seconds = burst(args.threads, args.calls)
+            api_requestor.MAX_SESSION_LIFETIME_SECS = 0
+            expired_connections, expired_seconds = burst(args.threads, args.calls)
+        finally:
+            api_requestor.MAX_SESSION_LIFETIME_SECS = lifetime
+            fake_server.shutdown()
+
+    print(f"{'phase':>16}{'calls':>8}{'connections':>13}{'seconds':>9}")
+    print(f"{'within lifetime':>16}{args.threads * args.calls:>8}{fresh_connections:>13}{fresh_seconds:>9.2f}")
+    print(f"{'past lifetime':>16}{args.threads * args.calls:>8}{expired_connections:>13}{expired_seconds:>9.2f}")
+
+    if expired_connections:
+        print(f"FAIL: calls past MAX_SESSION_LIFETIME_SECS opened {expired_connections} new connections "
+              f"(the shared session was closed)")
+        sys.exit(1)
+    print("ok: the shared session keeps its connections past the SDK's session lifetime")
+
+if __name__ == '__main__':
+    main()
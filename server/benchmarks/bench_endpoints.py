@@ -0,0 +1,205 @@
+# Latency and throughput of every API endpoint on a synthetic dataset
+#
+#   cd server && python -m benchmarks.bench_endpoints --users 500 --requests 300 --concurrency 8
+#
+# Builds a temporary database with the migrations (so full-text search uses
+# its FTS index), fills it with datagen.py, and points the AI endpoints at a
+# local fake OpenAI server (fake_openai.py) with --ai-latency seconds of
+# latency per call. Each scenario fires its requests from --concurrency
+# threads and reports throughput and p50/p95/p99 latency. AI scenarios send
+# unique content or use a fresh user per request, so they measure model
+# calls rather than cache hits (except "profile (cached)").
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import random
+import time
+
+from benchmarks.common import use_temporary_database, percentile
+from fake_openai import start_fake_openai
+
+database_path = use_temporary_database()
+os.environ.setdefault('MOOD_JOB_WORKERS', '0')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+os.environ['OPENAI_API_KEY'] = 'bench'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Latency and throughput of every API endpoint")
+    parser.add_argument('--users', type=int, default=200, help="synthetic users to generate")
+    parser.add_argument('--entries-per-user', type=float, default=30, help="mean entries per user")
+    parser.add_argument('--requests', type=int, default=200, help="requests per scenario")
+    parser.add_argument('--ai-requests', type=int, default=40, help="requests per AI scenario")
+    parser.add_argument('--concurrency', type=int, default=8, help="concurrent requests")
+    parser.add_argument('--ai-latency', type=float, default=0.3, help="seconds the fake OpenAI server takes per call")
+    parser.add_argument('--ai-error-rate', type=float, default=0.0, help="fraction of fake OpenAI calls that fail")
+    parser.add_argument('--token-delay', type=float, default=0.005, help="seconds between streamed words")
+    parser.add_argument('--only', default=None, help="run only scenarios whose name contains this text")
+    parser.add_argument('--seed', type=int, default=1, help="random seed for the dataset and request mix")
+    return parser.parse_args()
+
+args = parse_args()
+fake_server = start_fake_openai(latency=args.ai_latency, error_rate=args.ai_error_rate, token_delay=args.token_delay)
+os.environ['OPENAI_API_BASE'] = fake_server.api_base
+
+from flask_migrate import upgrade
+
+from app import create_app
+from config import db, init_migrations
+from datagen import generate_dataset, entry_templates
+from seed_data import SEED_PASSWORD
+
+app = create_app()
+
+class Scenario:
+    """One endpoint exercised with a request built from the request index"""
+
+    def __init__(self, name, call, ai=False):
+        self.name = name
+        self.call = call
+        self.ai = ai
+
+def build_scenarios(user_ids, prefix):
+    """
+    Build the scenario list against the generated users.
+
+    Args:
+        user_ids (list): IDs of the synthetic users
+        prefix (str): Username prefix used by the generator
+
+    Returns:
+        list: Scenario objects, in run order (creates before deletes)
+    """
+    rng = random.Random(args.seed)
+    texts = [" ".join(sentences) for _, sentences, _ in entry_templates()]
+    search_terms = ['night', 'morning light', 'hope', 'writing', 'friend']
+    created_entry_ids = []
+    importer = user_ids[-1]
+    import_body = "".join(
+        json.dumps({"title": "Imported", "content": text, "mood": "calm"}) + "\n" for text in texts[:10]
+    )
+
+    def any_user():
+        return rng.choice(user_ids)
+
+    def unique_text(index):
+        return f"{rng.choice(texts)} (#{index})"
+
+    def patch_user(client, index):
+        user_id = any_user()
+        return client.patch(f'/users/{user_id}', json={"username": f"{prefix}{user_id}"})
+
+    def create_entry(client, index):
+        response = client.post('/entries', json={
+            "title": f"Bench {index}", "content": unique_text(index), "mood": "hopeful", "user_id": any_user()
+        })
+        if response.status_code == 201:
+            created_entry_ids.append((response.json['id'], response.json['user_id']))
+        return response
+
+    def entry_ref(index):
+        return created_entry_ids[index % len(created_entry_ids)]
+
+    def patch_entry(client, index):
+        entry_id, user_id = entry_ref(index)
+        return client.patch(f'/entries/{entry_id}', json={"user_id": user_id, "content": unique_text(index)})
+
+    def delete_entry(client, index):
+        entry_id, user_id = created_entry_ids.pop()
+        return client.delete(f'/entries/{entry_id}?user_id={user_id}')
+
+    with app.test_client() as client:
+        job_id = client.post('/entries', json={
+            "title": "Pending", "content": texts[0], "user_id": user_ids[0]
+        }).json['mood_job_id']
+
+    def batch_body(index):
+        return {"entries": [{"id": item, "content": unique_text(index * 100 + item)} for item in range(20)]}
+
+    return [
+        Scenario("GET /", lambda c, i: c.get('/')),
+        Scenario("POST /users", lambda c, i: c.post('/users', json={"username": f"bench-new-{i}", "password": "pw"})),
+        Scenario("POST /login", lambda c, i: c.post('/login', json={"username": f"{prefix}{any_user()}", "password": SEED_PASSWORD})),
+        Scenario("GET /users", lambda c, i: c.get('/users')),
+        Scenario("GET /users/<id>", lambda c, i: c.get(f'/users/{any_user()}')),
+        Scenario("PATCH /users/<id>", patch_user),
+        Scenario("GET /users/<id>/mood-timeline", lambda c, i: c.get(f'/users/{any_user()}/mood-timeline?bucket=week')),
+        Scenario("GET /users/<id>/entries/export", lambda c, i: c.get(f'/users/{any_user()}/entries/export')),
+        Scenario("POST /users/<id>/entries/import", lambda c, i: c.post(
+            f'/users/{importer}/entries/import', data=import_body, content_type='application/x-ndjson')),
+        Scenario("GET /entries", lambda c, i: c.get(f'/entries?user_id={any_user()}')),
+        Scenario("GET /entries/search", lambda c, i: c.get(
+            f'/entries/search?user_id={any_user()}&q={rng.choice(search_terms)}')),
+        Scenario("POST /entries", create_entry),
+        Scenario("GET /entries/<id>", lambda c, i: c.get(f'/entries/{entry_ref(i)[0]}')),
+        Scenario("PATCH /entries/<id>", patch_entry),
+        Scenario("DELETE /entries/<id>", delete_entry),
+        Scenario("GET /mood-jobs/<id>", lambda c, i: c.get(f'/mood-jobs/{job_id}')),
+        Scenario("GET /analyze-mood/cache-stats", lambda c, i: c.get('/analyze-mood/cache-stats')),
+        Scenario("POST /analyze-mood (local)", lambda c, i: c.post(
+            '/analyze-mood', json={"content": unique_text(i), "engine": "local"})),
+        Scenario("POST /analyze-mood (remote)", lambda c, i: c.post(
+            '/analyze-mood', json={"content": unique_text(i), "engine": "remote"}), ai=True),
+        Scenario("POST /analyze-mood/batch", lambda c, i: c.post('/analyze-mood/batch', json=batch_body(i)), ai=True),
+        Scenario("GET /user-profile/<id> (cold)", lambda c, i: c.get(
+            f'/user-profile/{user_ids[i % len(user_ids)]}'), ai=True),
+        Scenario("GET /user-profile/<id> (cached)", lambda c, i: c.get(f'/user-profile/{user_ids[0]}'), ai=True),
+        Scenario("GET /user-profile/<id>/stream", lambda c, i: c.get(
+            f'/user-profile/{user_ids[-1 - i % len(user_ids)]}/stream'), ai=True),
+    ]
+
+def timed_request(client, scenario, index):
+    start = time.perf_counter()
+    response = scenario.call(client, index)
+    response.get_data()  # drain streamed bodies
+    response.close()
+    return time.perf_counter() - start, response.status_code
+
+def run_scenario(scenario, requests, concurrency):
+    """
+    Fire a scenario's requests from concurrent threads and print one result row.
+
+    Args:
+        scenario (Scenario): Scenario to run
+        requests (int): Number of requests
+        concurrency (int): Number of threads
+    """
+    clients = [app.test_client() for _ in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(
+            lambda index: timed_request(clients[index % concurrency], scenario, index), range(requests)
+        ))
+    elapsed = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in results]
+    errors = sum(1 for _, status in results if status >= 400)
+    print(f"{scenario.name:<36}{requests:>7}{errors:>8}{requests / elapsed:>10.1f}"
+          f"{percentile(latencies, 50) * 1000:>10.1f}{percentile(latencies, 95) * 1000:>10.1f}"
+          f"{percentile(latencies, 99) * 1000:>10.1f}")
+
+def main():
+    prefix = 'bench-'
+    init_migrations(app)
+    with app.app_context():
+        upgrade()
+        print(f"Generating {args.users} users with ~{args.entries_per_user:g} entries each...")
+        first_id, user_count, entry_count = generate_dataset(
+            db.session, args.users, args.entries_per_user, seed=args.seed, prefix=prefix
+        )
+    user_ids = list(range(first_id, first_id + user_count))
+    scenarios = [scenario for scenario in build_scenarios(user_ids, prefix)
+                 if not args.only or args.only in scenario.name]
+
+    print(f"{user_count} users, {entry_count} entries; {args.concurrency} concurrent; "
+          f"fake OpenAI latency {args.ai_latency}s, error rate {args.ai_error_rate}")
+    print(f"{'scenario':<36}{'reqs':>7}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    try:
+        for scenario in scenarios:
+            run_scenario(scenario, args.ai_requests if scenario.ai else args.requests, args.concurrency)
+    finally:
+        fake_server.shutdown()
+        os.remove(database_path)
+
+if __name__ == '__main__':
+    main()
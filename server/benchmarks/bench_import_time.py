@@ -0,0 +1,161 @@
+# Cold import time of the application, checked against a budget
+#
+#   cd server && python -m benchmarks.bench_import_time --runs 7 --budget 1.0
+#
+# Imports app.py in fresh interpreters (as a worker or test run does at boot)
+# and reports the median time. Exits with status 1 if the median exceeds the
+# budget, or if a module that must only load on first use (the OpenAI SDK,
+# Flask-Migrate/Alembic) was imported; the slowest top-level imports are
+# listed to show where the time went.
+# Also builds two applications with create_app() and different settings, and
+# exits with status 1 if importing app.py created one or if the two share
+# config, database engines or per-application state.
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.common import percentile
+
+# Modules that must stay out of a cold import (see config.py and ai_client.py)
+DEFERRED_MODULES = ('openai', 'aiohttp', 'flask_migrate', 'alembic')
+
+SERVER_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = f"""
+import json, sys, time
+started = time.perf_counter()
+import app
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [name for name in {DEFERRED_MODULES!r} if name in sys.modules]}}))
+"""
+
+# Per-application state that create_app() must not share between apps
+EXTENSIONS = ('ai_breaker', 'mood_result_cache', 'password_hashing')
+
+FACTORY_SCRIPT = f"""
+import json, os, tempfile
+from flask import Flask
+import app as module
+from config import db
+
+problems = []
+if any(isinstance(value, Flask) for value in vars(module).values()):
+    problems.append("importing app.py created an application")
+
+first = module.create_app({{"SQLALCHEMY_DATABASE_URI": "sqlite://", "METRICS_ENABLED": True, "MOOD_CACHE_SIZE": 16}})
+second = module.create_app({{"SQLALCHEMY_DATABASE_URI": "sqlite:///" + os.path.join(tempfile.gettempdir(), "factory-check.db"), "METRICS_ENABLED": False, "MOOD_CACHE_SIZE": 32}})
+
+if first is second or first.config is second.config:
+    problems.append("both calls returned the same application or config")
+if first.config['MOOD_CACHE_SIZE'] == second.config['MOOD_CACHE_SIZE']:
+    problems.append("test_config was not applied")
+for name in {EXTENSIONS!r}:
+    if first.extensions.get(name) is None or first.extensions.get(name) is second.extensions.get(name):
+        problems.append(f"{{name}} is missing or shared between apps")
+with first.app_context():
+    first_url = str(db.engine.url)
+with second.app_context():
+    second_url = str(db.engine.url)
+if first_url == second_url:
+    problems.append(f"both apps use the engine for {{first_url}}")
+for application, metrics_status in ((first, 200), (second, 404)):
+    client = application.test_client()
+    if client.get('/').status_code != 200:
+        problems.append("GET / is not served")
+    if client.get('/metrics').status_code != metrics_status:
+        problems.append(f"GET /metrics did not answer {{metrics_status}} for METRICS_ENABLED={{application.config['METRICS_ENABLED']}}")
+    if 'import-entries' not in application.cli.list_commands(None):
+        problems.append("CLI commands are not registered")
+print(json.dumps(problems))
+"""
+
+def child_environment():
+    # The database is never opened by an import, but keep a stray file from being created
+    return dict(os.environ, DATABASE_URL='sqlite://', MOOD_JOB_WORKERS='0')
+
+def cold_import():
+    """
+    Import app in a fresh interpreter.
+
+    Returns:
+        dict: {"seconds": import time, "loaded": deferred modules that were imported}
+    """
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT], cwd=SERVER_DIRECTORY, env=child_environment(),
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def factory_problems():
+    """
+    Build two applications with create_app() in a fresh interpreter.
+
+    Returns:
+        list: Descriptions of state the applications share or setup they miss (empty if none)
+    """
+    output = subprocess.run(
+        [sys.executable, '-c', FACTORY_SCRIPT], cwd=SERVER_DIRECTORY, env=child_environment(),
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def slowest_imports(count):
+    """
+    Top-level imports of app.py ranked by cumulative time, from python -X importtime.
+
+    Returns:
+        list: (microseconds, module name) pairs, slowest first
+    """
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=SERVER_DIRECTORY, env=child_environment(),
+        capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # Two spaces of indentation: imported directly by app.py
+        if cumulative.strip().isdigit() and name.startswith('   ') and not name.startswith('    '):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold import time of the application, checked against a budget")
+    parser.add_argument('--runs', type=int, default=7, help="fresh interpreters to time")
+    parser.add_argument('--budget', type=float, default=1.0, help="maximum median import time in seconds")
+    parser.add_argument('--top', type=int, default=10, help="slowest top-level imports to list")
+    args = parser.parse_args()
+
+    results = [cold_import() for _ in range(args.runs)]
+    timings = [result['seconds'] for result in results]
+    loaded = sorted({name for result in results for name in result['loaded']})
+    median = percentile(timings, 50)
+
+    print(f"import app: median {median * 1000:.0f} ms, min {min(timings) * 1000:.0f} ms, "
+          f"max {max(timings) * 1000:.0f} ms over {args.runs} runs (budget {args.budget * 1000:.0f} ms)")
+    print("slowest top-level imports:")
+    for microseconds, name in slowest_imports(args.top):
+        print(f"  {microseconds / 1000:>8.1f} ms  {name}")
+
+    problems = factory_problems()
+    print(f"create_app(): {'two independent apps' if not problems else ', '.join(problems)}")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: imported at startup instead of on first use: {', '.join(loaded)}")
+        failed = True
+    if problems:
+        print("FAIL: create_app() does not build independent applications")
+        failed = True
+    if median > args.budget:
+        print(f"FAIL: cold import exceeds the {args.budget:g}s budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("ok: cold import is within budget and create_app() builds independent applications")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# Login throughput and latency at different bcrypt costs
+#
+#   cd server && python -m benchmarks.bench_login --costs 4,8,10,12 --logins 64 --concurrency 8
+#
+# For each cost a user is created with that cost, then a burst of concurrent
+# POST /login requests runs while a probe thread keeps calling GET / to show
+# how much the burst slows down unrelated requests. Then a burst hits an app
+# with a single hashing thread and a short BCRYPT_WAIT_SECONDS to check that
+# logins stuck behind a backed-up pool get a 503 once the wait runs out instead
+# of hanging; exits with status 1 if they don't.
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import threading
+import time
+
+from benchmarks.common import use_temporary_database, percentile
+
+database_path = use_temporary_database()
+os.environ.setdefault('MOOD_JOB_WORKERS', '0')
+
+from app import create_app
+from config import db
+from models import User
+
+app = create_app()
+
+PASSWORD = 'correct horse battery staple'
+
+def timed_login(client, username):
+    start = time.perf_counter()
+    response = client.post('/login', json={"username": username, "password": PASSWORD})
+    return time.perf_counter() - start, response.status_code
+
+def probe(client, stop, latencies):
+    """Measure an unrelated cheap endpoint while logins are running"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        client.get('/')
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.005)
+
+def run_cost(cost, logins, concurrency):
+    app.config['BCRYPT_ROUNDS'] = cost
+    username = f'bench-{cost}'
+    with app.app_context():
+        user = User(username=username)
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+
+    stop = threading.Event()
+    probe_latencies = []
+    probe_thread = threading.Thread(target=probe, args=(app.test_client(), stop, probe_latencies))
+    probe_thread.start()
+
+    clients = [app.test_client() for _ in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda index: timed_login(clients[index % concurrency], username), range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    probe_thread.join()
+
+    latencies = [latency for latency, status in results if status == 200]
+    refused = sum(1 for _, status in results if status == 503)
+    print(f"{cost:>5}{len(latencies) / elapsed:>12.1f}{percentile(latencies, 50) * 1000:>10.1f}"
+          f"{percentile(latencies, 95) * 1000:>10.1f}{refused:>9}"
+          f"{percentile(probe_latencies, 95) * 1000:>14.1f}")
+
+def check_wait_limit(cost, logins, wait):
+    """
+    Burst logins at a one-thread hashing pool that cannot keep up.
+
+    Returns:
+        tuple: (logins refused with a 503, slowest refusal in seconds)
+    """
+    backed_up = create_app({'BCRYPT_ROUNDS': cost, 'BCRYPT_WORKERS': 1, 'BCRYPT_WAIT_SECONDS': wait})
+    clients = [backed_up.test_client() for _ in range(logins)]
+    with ThreadPoolExecutor(max_workers=logins) as executor:
+        results = list(executor.map(lambda client: timed_login(client, f'bench-{cost}'), clients))
+    refused = [latency for latency, status in results if status == 503]
+    return len(refused), max(refused, default=0.0)
+
+def main():
+    parser = argparse.ArgumentParser(description="Login throughput at different bcrypt costs")
+    parser.add_argument('--costs', default='4,8,10,12', help="comma-separated bcrypt cost factors")
+    parser.add_argument('--logins', type=int, default=64, help="logins per cost")
+    parser.add_argument('--concurrency', type=int, default=8, help="concurrent login requests")
+    parser.add_argument('--wait', type=float, default=0.2, help="BCRYPT_WAIT_SECONDS for the backed-up pool check")
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+
+    print(f"{args.logins} logins per cost, {args.concurrency} concurrent, "
+          f"BCRYPT_WORKERS={app.config['BCRYPT_WORKERS']} BCRYPT_MAX_PENDING={app.config['BCRYPT_MAX_PENDING']}")
+    print(f"{'cost':>5}{'logins/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'refused':>9}{'GET / p95 ms':>14}")
+    costs = [int(value) for value in args.costs.split(',')]
+    try:
+        for cost in costs:
+            run_cost(cost, args.logins, args.concurrency)
+        refused, slowest = check_wait_limit(max(costs), args.concurrency, args.wait)
+    finally:
+        os.remove(database_path)
+
+    print(f"backed-up pool (1 thread, cost {max(costs)}, BCRYPT_WAIT_SECONDS={args.wait:g}): "
+          f"{refused}/{args.concurrency} logins refused, slowest refusal {slowest * 1000:.0f} ms")
+    # A refusal may also wait for the user lookup and the test client, not only the hash
+    if not refused or slowest > args.wait + 1:
+        print("FAIL: logins behind a backed-up hashing pool were not refused within BCRYPT_WAIT_SECONDS")
+        sys.exit(1)
+    print("ok: a backed-up hashing pool answers 503 within BCRYPT_WAIT_SECONDS")
+
+if __name__ == '__main__':
+    main()
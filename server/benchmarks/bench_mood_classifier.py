@@ -0,0 +1,136 @@
+# Local mood classifier accuracy against labelled entries, by confidence level
+#
+#   cd server && python -m benchmarks.bench_mood_classifier --min-precision 0.9
+#
+# With MOOD_ENGINE=auto a local result at or above MOOD_LOCAL_CONFIDENCE is
+# returned without asking the model, so the precision of those results is the
+# precision of the default path. Scores the hand-labelled entries below and the
+# sample journal (leave-one-out: each seed entry is classified by a model
+# trained on the others) and prints, per threshold, the share answered locally
+# and how many of those got the first mood right. Exits with status 1 if the
+# precision at MOOD_LOCAL_CONFIDENCE is below --min-precision, or if a negated
+# or generic-word entry is answered locally with a wrong mood.
+import argparse
+import os
+import sys
+
+os.environ.setdefault('MOOD_JOB_WORKERS', '0')
+
+from app import create_app
+from mood_classifier import MoodClassifier, get_classifier
+from moods import parse_moods
+from seed_data import SEED_ENTRIES
+
+# (text, acceptable moods) written the way people write short entries
+LABELLED_ENTRIES = [
+    ("So happy today, we laughed the whole evening", 'happy'),
+    ("Joyful morning, smiling at everyone on the street", 'happy'),
+    ("I cried all night, I feel so lonely and sad", 'sad'),
+    ("Grief comes in waves, tears again at dinner", 'sad'),
+    ("Furious at my manager, the review was unfair", 'angry'),
+    ("So frustrated and annoyed with the landlord", 'angry'),
+    ("Anxious and worried about the exam tomorrow, could not sleep", 'anxious'),
+    ("Panic before the presentation, so nervous and scared", 'anxious'),
+    ("Grateful for my friends, thankful for every one of them", 'grateful'),
+    ("Feeling blessed and lucky to have this family", 'grateful'),
+    ("Hopeful about the interview, hoping it works out", 'hopeful'),
+    ("Peaceful walk by the lake, calm and relaxed", 'calm'),
+    ("Thrilled and excited, the trip starts tomorrow", 'excited'),
+    ("Confused and unsure what she meant, so puzzled", 'confused'),
+    ("I love him, our romantic dinner was perfect, darling evening", 'in love'),
+    ("Had lunch", 'neutral'),
+    ("Went to the store", 'neutral'),
+    ("Meeting moved to Thursday", 'neutral'),
+    # Negations: a bag of words reads these as the negated mood
+    ("I am not angry, just tired", 'neutral'),
+    ("Not happy with how the day went", 'sad,angry,neutral'),
+    ("I was never really excited about the move", 'neutral,sad'),
+    ("Honestly not sad anymore, just busy", 'neutral,calm'),
+    ("Didn't feel calm at all during the meeting", 'anxious'),
+    ("I don't hate it here, it's fine", 'neutral,calm'),
+    ("No worries, everything went smoothly", 'calm,happy,neutral'),
+    ("Not bad for a Monday", 'neutral,happy'),
+    # Words that are usually not emotional
+    ("Why does this keep happening", 'angry,confused,sad'),
+    ("Stayed still in bed", 'neutral,sad,calm'),
+    ("Good meeting, we know the plan for next week", 'neutral,happy'),
+    ("The printer is down again", 'neutral,angry'),
+    ("Lost my keys, found them in the car", 'neutral'),
+    ("Planning the future budget for the team", 'neutral'),
+    ("The weather is getting better", 'neutral,hopeful'),
+    ("Still don't know what to cook tonight", 'neutral'),
+    ("Great, another rainy day", 'neutral,sad'),
+]
+
+# Entries the classifier must not answer locally with a mood outside the label
+MUST_NOT_GUESS = LABELLED_ENTRIES[18:]
+
+THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.9, 0.95)
+
+def predictions():
+    """
+    Classify every labelled and seed entry.
+
+    Returns:
+        list: (predicted first mood, confidence, acceptable moods) per entry
+    """
+    classifier = get_classifier()
+    results = []
+    for text, labels in LABELLED_ENTRIES:
+        mood, confidence = classifier.classify(text)
+        results.append((mood.split(',')[0], confidence, set(parse_moods(labels))))
+
+    documents = [(f"{entry['title']}. {entry['content']}", entry['mood']) for entry in SEED_ENTRIES]
+    for index, (text, labels) in enumerate(documents):
+        held_out = MoodClassifier().train(documents[:index] + documents[index + 1:])
+        mood, confidence = held_out.classify(text)
+        results.append((mood.split(',')[0], confidence, set(parse_moods(labels))))
+    return results
+
+def precision_at(results, threshold):
+    """
+    Returns:
+        tuple: (share of entries answered locally, share of those whose first mood is acceptable)
+    """
+    accepted = [mood in labels for mood, confidence, labels in results if confidence >= threshold]
+    coverage = len(accepted) / len(results)
+    return coverage, (sum(accepted) / len(accepted) if accepted else 1.0)
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mood classifier accuracy against labelled entries")
+    parser.add_argument('--min-precision', type=float, default=0.9,
+                        help="lowest acceptable share of correct local answers at MOOD_LOCAL_CONFIDENCE")
+    args = parser.parse_args()
+
+    threshold = create_app().config['MOOD_LOCAL_CONFIDENCE']
+    results = predictions()
+    print(f"{len(LABELLED_ENTRIES)} labelled entries, {len(SEED_ENTRIES)} seed entries (leave-one-out)")
+    print(f"{'threshold':>10}{'local':>9}{'precision':>11}")
+    for candidate in sorted(set(THRESHOLDS) | {threshold}):
+        coverage, precision = precision_at(results, candidate)
+        marker = '  <- MOOD_LOCAL_CONFIDENCE' if candidate == threshold else ''
+        print(f"{candidate:>10.2f}{coverage:>8.0%}{precision:>11.0%}{marker}")
+
+    classifier = get_classifier()
+    wrong = []
+    for text, labels in MUST_NOT_GUESS:
+        mood, confidence = classifier.classify(text)
+        if confidence >= threshold and mood.split(',')[0] not in parse_moods(labels):
+            wrong.append(f"{text!r} -> {mood} ({confidence:.2f})")
+
+    failed = False
+    _, precision = precision_at(results, threshold)
+    if precision < args.min_precision:
+        print(f"FAIL: {precision:.0%} of local answers at {threshold:g} are right (minimum {args.min_precision:.0%})")
+        failed = True
+    if wrong:
+        print("FAIL: negated or generic-word entries answered locally with a wrong mood:")
+        for line in wrong:
+            print(f"  {line}")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("ok: local answers at MOOD_LOCAL_CONFIDENCE meet the precision target")
+
+if __name__ == '__main__':
+    main()
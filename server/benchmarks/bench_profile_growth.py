@@ -0,0 +1,95 @@
+# Model calls per profile as a journal grows
+#
+#   cd server && python -m benchmarks.bench_profile_growth --sizes 50,400,1600
+#
+# For each journal size (entries spread over --days), builds the profile from
+# scratch, rebuilds it unchanged, and rebuilds it after adding one long entry
+# and after editing an old one, counting the calls the fake OpenAI server
+# (fake_openai.py) receives. Stored entry summaries and month/year paragraphs
+# (see profile_generation.py) should make the incremental rebuilds cost the
+# same handful of calls at every size; exits with status 1 if one of them
+# needs more than --max-calls.
+import argparse
+from datetime import datetime, timedelta
+import os
+import sys
+import time
+
+from benchmarks.common import use_temporary_database
+from fake_openai import start_fake_openai
+
+database_path = use_temporary_database()
+os.environ.setdefault('MOOD_JOB_WORKERS', '0')
+os.environ['OPENAI_API_KEY'] = 'bench'
+fake_server = start_fake_openai()
+os.environ['OPENAI_API_BASE'] = fake_server.api_base
+
+from flask_migrate import upgrade
+
+from app import create_app
+from config import db, init_migrations
+from datagen import generate_dataset
+from models import Entry
+from profile_generation import generate_profile
+
+app = create_app()
+
+LONG_CONTENT = ("Woke up early and walked to the river before work, thinking about the move and whether "
+                "I am ready to leave the city that raised me. ") * 4
+
+def timed_profile(user_id):
+    """
+    Returns:
+        tuple: (model calls, seconds) for one profile build
+    """
+    calls = fake_server.requests
+    started = time.perf_counter()
+    generate_profile(db.session, user_id, 'bench')
+    return fake_server.requests - calls, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description="Model calls per profile as a journal grows")
+    parser.add_argument('--sizes', default='50,400,1600', help="comma-separated mean entries per journal")
+    parser.add_argument('--days', type=int, default=3 * 365, help="how far back the entries go")
+    parser.add_argument('--max-calls', type=int, default=4,
+                        help="most model calls an incremental rebuild may take (summary, month, year, profile)")
+    args = parser.parse_args()
+
+    init_migrations(app)
+    print(f"{'entries':>8}{'cold calls':>12}{'cold s':>9}{'same calls':>12}{'new entry':>11}{'edit':>7}{'new s':>8}")
+    failed = []
+    try:
+        with app.app_context():
+            upgrade()
+            for size in (int(value) for value in args.sizes.split(',')):
+                first_id, _, entry_count = generate_dataset(db.session, 1, size, days=args.days, seed=size, prefix=f'growth-{size}-')
+                cold_calls, cold_seconds = timed_profile(first_id)
+                same_calls, _ = timed_profile(first_id)
+
+                db.session.add(Entry(title="Leaving", content=LONG_CONTENT, mood='anxious,hopeful', user_id=first_id))
+                db.session.commit()
+                new_calls, new_seconds = timed_profile(first_id)
+
+                oldest = db.session.scalars(
+                    db.select(Entry).where(Entry.user_id == first_id).order_by(Entry.created_at).limit(1)
+                ).one()
+                oldest.content = LONG_CONTENT + " Edited."
+                db.session.commit()
+                edit_calls, _ = timed_profile(first_id)
+
+                print(f"{entry_count:>8}{cold_calls:>12}{cold_seconds:>9.2f}{same_calls:>12}{new_calls:>11}{edit_calls:>7}"
+                      f"{new_seconds:>8.2f}")
+                if max(new_calls, edit_calls) > args.max_calls:
+                    failed.append(entry_count)
+    finally:
+        fake_server.shutdown()
+        os.remove(database_path)
+
+    if failed:
+        print(f"FAIL: a one-entry change cost more than {args.max_calls} model calls for journals of "
+              f"{', '.join(str(count) for count in failed)} entries")
+        sys.exit(1)
+    print("ok: a one-entry change costs a fixed number of model calls")
+
+if __name__ == '__main__':
+    main()
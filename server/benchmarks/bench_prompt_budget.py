@@ -0,0 +1,95 @@
+# Rendered prompt sizes of batched model calls against their token budgets
+#
+#   cd server && python -m benchmarks.bench_prompt_budget --entries 500
+#
+# Packs --entries synthetic entries (a few words up to a couple of thousand)
+# the way POST /analyze-mood/batch and profile generation do, renders every
+# prompt that would be sent, system prompt included, and measures it with the
+# same estimate_tokens() the packing uses. Prints the calls made and the
+# largest prompt next to its budget, and what packing by entry text alone
+# (ignoring the instructions and numbering) would have sent. Exits with status
+# 1 if any multi-entry prompt is over its budget.
+import argparse
+import os
+import random
+import sys
+
+os.environ.setdefault('MOOD_JOB_WORKERS', '0')
+
+from app import create_app
+from datagen import entry_templates
+from mood_analysis import (
+    MOOD_SYSTEM_PROMPT, BATCH_TOKENS_PER_ANSWER, estimate_tokens, prompt_overhead, chunk_by_token_budget,
+    build_batch_mood_prompt, batch_mood_messages
+)
+from profile_generation import (
+    PROFILE_SYSTEM_PROMPT, SUMMARY_MAX_ITEMS_PER_CALL, build_summary_prompt, build_window_prompt, summary_chunks,
+    profile_chunks
+)
+
+app = create_app()
+
+def synthetic_texts(count, seed):
+    """Entry texts from the seed sentences, mostly short with a long tail"""
+    rng = random.Random(seed)
+    sentences = [sentence for _, parts, _ in entry_templates() for sentence in parts]
+    return [" ".join(rng.choice(sentences) for _ in range(max(1, int(rng.paretovariate(1.2)) * 2)))
+            for _ in range(count)]
+
+def largest_prompt(chunks, texts, render):
+    """Estimated tokens of the biggest multi-entry prompt render(chunk texts) produces"""
+    return max((render([texts[index] for index in chunk]) for chunk in chunks if len(chunk) > 1), default=0)
+
+def mood_batch_tokens(contents):
+    """What a batched mood call costs against MOOD_BATCH_TOKEN_BUDGET: the prompt plus the answer reserve"""
+    prompt = "".join(message['content'] for message in batch_mood_messages(contents))
+    return estimate_tokens(prompt) + BATCH_TOKENS_PER_ANSWER * len(contents)
+
+def profile_prompt_tokens(build_prompt):
+    """Estimated tokens of a profile prompt made by build_prompt, system prompt included"""
+    return lambda texts: estimate_tokens(PROFILE_SYSTEM_PROMPT + build_prompt(texts))
+
+def main():
+    parser = argparse.ArgumentParser(description="Rendered prompt sizes of batched model calls against their token budgets")
+    parser.add_argument('--entries', type=int, default=500, help="synthetic entries to pack")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    texts = synthetic_texts(args.entries, args.seed)
+    rows = []
+    with app.app_context():
+        config = app.config
+        mood_budget, max_items = config['MOOD_BATCH_TOKEN_BUDGET'], config['MOOD_BATCH_MAX_ITEMS_PER_CALL']
+        overhead = prompt_overhead(build_batch_mood_prompt, max_items, MOOD_SYSTEM_PROMPT)
+        packed = chunk_by_token_budget(texts, mood_budget, max_items, overhead, BATCH_TOKENS_PER_ANSWER)
+        text_only = chunk_by_token_budget(texts, mood_budget, max_items, tokens_per_item=BATCH_TOKENS_PER_ANSWER)
+        rows.append(("mood batch", mood_budget, packed, text_only, texts, mood_batch_tokens))
+
+        truncated, packed = summary_chunks(texts)
+        text_only = chunk_by_token_budget(truncated, config['PROFILE_TOKEN_BUDGET'], SUMMARY_MAX_ITEMS_PER_CALL)
+        rows.append(("entry summaries", config['PROFILE_TOKEN_BUDGET'], packed, text_only, truncated,
+                     profile_prompt_tokens(build_summary_prompt)))
+
+        notes = [" ".join(text.split()[:25]) for text in truncated]
+        packed = profile_chunks(notes, build_window_prompt, len(notes))
+        text_only = chunk_by_token_budget(notes, config['PROFILE_TOKEN_BUDGET'], len(notes))
+        rows.append(("window reduce", config['PROFILE_TOKEN_BUDGET'], packed, text_only, notes,
+                     profile_prompt_tokens(build_window_prompt)))
+
+    print(f"{args.entries} entries, {sum(len(text) for text in texts) // len(texts)} characters on average")
+    print(f"{'prompt':>16}{'budget':>8}{'calls':>7}{'largest':>9}{'text-only calls':>17}{'text-only largest':>19}")
+    over = []
+    for name, budget, packed, text_only, items, render in rows:
+        largest = largest_prompt(packed, items, render)
+        print(f"{name:>16}{budget:>8}{len(packed):>7}{largest:>9}{len(text_only):>17}"
+              f"{largest_prompt(text_only, items, render):>19}")
+        if largest > budget:
+            over.append(name)
+
+    if over:
+        print(f"FAIL: rendered prompts over their token budget: {', '.join(over)}")
+        sys.exit(1)
+    print("ok: every multi-entry prompt fits its budget once rendered")
+
+if __name__ == '__main__':
+    main()
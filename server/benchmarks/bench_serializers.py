@@ -0,0 +1,87 @@
+# Per-row cost of SerializerMixin.to_dict() versus the precompiled serializers
+#
+#   cd server && python -m benchmarks.bench_serializers --rows 2000
+#
+# Runs against a throwaway in-memory SQLite database.
+import argparse
+import gc
+import json
+import os
+import time
+
+# Must be set before the app is created
+os.environ['DATABASE_URL'] = 'sqlite://'
+
+from app import create_app
+from config import db
+from models import User, Entry
+from moods import VALID_MOODS
+from serializers import serialize_entry, serialize_user, json_response
+
+app = create_app()
+
+def best_of(repeat, function):
+    """Fastest of several timed runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def seed(rows):
+    """One user with the given number of entries"""
+    user = User(username='bench')
+    user.set_password('bench')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add_all(
+        Entry(
+            title=f"Entry {index}",
+            content="Some thoughts about the day. " * 10,
+            mood=','.join(VALID_MOODS[index % len(VALID_MOODS):index % len(VALID_MOODS) + 2]),
+            user_id=user.id
+        )
+        for index in range(rows)
+    )
+    db.session.commit()
+    return user.id
+
+def report(label, rows, legacy, compiled):
+    print(f"{label:<28}{legacy / rows * 1e6:>12.2f}{compiled / rows * 1e6:>12.2f}{legacy / compiled:>9.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=2000, help="entries to serialize")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        user_id = seed(args.rows)
+        entries = Entry.query.filter_by(user_id=user_id).all()
+        user = db.session.get(User, user_id)
+
+        # The compiled serializers must produce exactly what to_dict() does
+        assert [serialize_entry(entry) for entry in entries] == [entry.to_dict() for entry in entries]
+        assert serialize_user(user) == user.to_dict()
+
+        print(f"{args.rows} rows, best of {args.repeat} runs (microseconds per row)")
+        print(f"{'':<28}{'to_dict':>12}{'compiled':>12}{'speedup':>10}")
+
+        report("Entry -> dict", args.rows,
+               best_of(args.repeat, lambda: [entry.to_dict() for entry in entries]),
+               best_of(args.repeat, lambda: [serialize_entry(entry) for entry in entries]))
+        report("User with entries -> dict", args.rows,
+               best_of(args.repeat, lambda: user.to_dict()),
+               best_of(args.repeat, lambda: serialize_user(user)))
+
+        # Full response: dict building plus JSON encoding
+        with app.test_request_context():
+            report("Entry list -> response", args.rows,
+                   best_of(args.repeat, lambda: app.json.response([entry.to_dict() for entry in entries])),
+                   best_of(args.repeat, lambda: json_response([serialize_entry(entry) for entry in entries])))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# Concurrent read/write stress test of the SQLite engine profiles
+#
+#   cd server && python -m benchmarks.bench_sqlite_concurrency --writers 8 --readers 8 --seconds 10
+#
+# Runs the same mixed workload once per DB_ENGINE_PROFILE (each in its own
+# process, since the engine is configured at import): writer threads create
+# and edit entries while reader threads list entries and mood timelines.
+# Reports completed requests, failures (mostly "database is locked") and
+# latency percentiles for reads and writes under each profile.
+# Half the writes go to users who start without entries, so first writes race
+# each other; afterwards the incrementally maintained mood aggregates are
+# compared with a rebuild from the entries table, and the run exits with
+# status 1 if they drifted.
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.common import use_temporary_database, percentile
+
+RESULT_PREFIX = 'RESULT '
+
+def aggregate_drift(session):
+    """
+    Compare the maintained mood aggregates with a rebuild from entries (rolled back).
+
+    Returns:
+        list: Names of the aggregate tables that differ (entries_version ignored)
+    """
+    from sqlalchemy import select
+
+    from models import UserMoodStats, UserMoodDaily
+    from mood_stats import rebuild_mood_stats, MOOD_COLUMNS
+    from mood_timeline import rebuild_mood_daily
+
+    def snapshot(model, keys):
+        table = model.__table__
+        columns = [table.c[key] for key in keys] + [table.c.entry_count] + [table.c[column] for column in MOOD_COLUMNS]
+        # Rows of users without entries are kept by a rebuild but may be missing before it
+        return sorted(tuple(row) for row in session.execute(select(*columns)) if row.entry_count)
+
+    tables = [(UserMoodStats, ['user_id'], rebuild_mood_stats), (UserMoodDaily, ['user_id', 'day'], rebuild_mood_daily)]
+    maintained = [snapshot(model, keys) for model, keys, _ in tables]
+    for _, _, rebuild in tables:
+        rebuild(session)
+    rebuilt = [snapshot(model, keys) for model, keys, _ in tables]
+    session.rollback()
+    return [model.__tablename__ for (model, _, _), before, after in zip(tables, maintained, rebuilt) if before != after]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Concurrent read/write stress test of the SQLite engine profiles")
+    parser.add_argument('--profiles', default='default,tuned', help="comma-separated DB_ENGINE_PROFILE values")
+    parser.add_argument('--writers', type=int, default=8, help="writer threads")
+    parser.add_argument('--readers', type=int, default=8, help="reader threads")
+    parser.add_argument('--seconds', type=float, default=10, help="duration per profile")
+    parser.add_argument('--users', type=int, default=50, help="synthetic users to start with")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+def run_workload(args):
+    """Run the workload under the current process's profile and print one RESULT line"""
+    database_path = use_temporary_database()
+    os.environ.setdefault('MOOD_JOB_WORKERS', '0')
+    os.environ.setdefault('BCRYPT_ROUNDS', '4')
+    os.environ.setdefault('METRICS_ENABLED', 'false')
+
+    from flask_migrate import upgrade
+
+    from app import create_app
+    from config import db, init_migrations
+    from datagen import generate_dataset
+    from models import User
+
+    app = create_app()
+    init_migrations(app)
+    with app.app_context():
+        upgrade()
+        first_id, user_count, _ = generate_dataset(db.session, args.users, 20, seed=1)
+        journal_mode = db.session.execute(db.text("PRAGMA journal_mode")).scalar()
+        # Users without entries yet: their first writes create the aggregate rows
+        fresh_ids = list(range(first_id + user_count, first_id + 2 * user_count))
+        db.session.execute(db.insert(User.__table__), [
+            {"id": user_id, "username": f"fresh-{user_id}", "_password_hash": "-"} for user_id in fresh_ids
+        ])
+        db.session.commit()
+    user_ids = list(range(first_id, first_id + user_count))
+
+    stop = threading.Event()
+    results = {"read": [], "write": []}
+    failures = {"read": 0, "write": 0}
+    lock = threading.Lock()
+
+    def record(kind, started, ok):
+        elapsed = time.perf_counter() - started
+        with lock:
+            if ok:
+                results[kind].append(elapsed)
+            else:
+                failures[kind] += 1
+
+    def writer(seed):
+        rng = random.Random(seed)
+        client = app.test_client()
+        created = []
+        while not stop.is_set():
+            started = time.perf_counter()
+            user_id = rng.choice(fresh_ids if rng.random() < 0.5 else user_ids)
+            try:
+                if created and rng.random() < 0.3:
+                    entry_id, owner = rng.choice(created)
+                    response = client.patch(f'/entries/{entry_id}', json={"user_id": owner, "mood": "calm"})
+                else:
+                    response = client.post('/entries', json={
+                        "title": "Stress", "content": f"Writing under load {rng.random()}", "mood": "hopeful",
+                        "user_id": user_id
+                    })
+                    if response.status_code == 201:
+                        created.append((response.json['id'], user_id))
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            record("write", started, ok)
+
+    def reader(seed):
+        rng = random.Random(seed)
+        client = app.test_client()
+        while not stop.is_set():
+            started = time.perf_counter()
+            user_id = rng.choice(user_ids)
+            try:
+                if rng.random() < 0.5:
+                    response = client.get(f'/entries?user_id={user_id}')
+                else:
+                    response = client.get(f'/users/{user_id}/mood-timeline?bucket=week')
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            record("read", started, ok)
+
+    threads = ([threading.Thread(target=writer, args=(index,)) for index in range(args.writers)]
+               + [threading.Thread(target=reader, args=(1000 + index,)) for index in range(args.readers)])
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    with app.app_context():
+        drift = aggregate_drift(db.session)
+    os.remove(database_path)
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(database_path + suffix):
+            os.remove(database_path + suffix)
+
+    summary = {"journal_mode": journal_mode, "drift": drift}
+    for kind in ("read", "write"):
+        latencies = results[kind]
+        summary[kind] = {
+            "ok": len(latencies),
+            "failed": failures[kind],
+            "per_second": len(latencies) / args.seconds,
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+        }
+    print(RESULT_PREFIX + json.dumps(summary), flush=True)
+
+def milliseconds(value):
+    return f"{value * 1000:.1f}" if value is not None else "-"
+
+def main():
+    args = parse_args()
+    if args.child:
+        run_workload(args)
+        return
+
+    print(f"{args.writers} writers, {args.readers} readers, {args.seconds:g}s per profile")
+    print(f"{'profile':<9}{'journal':>9}{'kind':>7}{'ok/s':>9}{'failed':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    drifted = []
+    for profile in args.profiles.split(','):
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_sqlite_concurrency', '--child',
+             '--writers', str(args.writers), '--readers', str(args.readers),
+             '--seconds', str(args.seconds), '--users', str(args.users)],
+            env=dict(os.environ, DB_ENGINE_PROFILE=profile), capture_output=True, text=True
+        )
+        lines = [line for line in output.stdout.splitlines() if line.startswith(RESULT_PREFIX)]
+        if not lines:
+            print(f"{profile:<9} run failed:\n{output.stderr[-2000:]}")
+            continue
+        summary = json.loads(lines[-1][len(RESULT_PREFIX):])
+        for kind in ("read", "write"):
+            row = summary[kind]
+            print(f"{profile:<9}{summary['journal_mode']:>9}{kind:>7}{row['per_second']:>9.1f}{row['failed']:>8}"
+                  f"{milliseconds(row['p50']):>9}{milliseconds(row['p95']):>9}{milliseconds(row['p99']):>9}")
+        drifted += [f"{table} ({profile})" for table in summary['drift']]
+
+    if drifted:
+        print(f"FAIL: maintained aggregates differ from a rebuild: {', '.join(drifted)}")
+        sys.exit(1)
+    print("ok: maintained aggregates match a rebuild")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# SQL statements and latency of GET /users as the number of users grows
+#
+#   cd server && python -m benchmarks.bench_users_listing --sizes 10,100,1000,5000
+#
+# The listing must issue a fixed number of statements per page however many
+# users exist (1 for the lean listing, 2 with ?include=entries). The script
+# exits with status 1 if either count changes with the user count, and prints
+# the old lazy-loading pattern (User.query.all() + to_dict()) for comparison.
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.common import use_temporary_database, percentile
+
+database_path = use_temporary_database()
+os.environ.setdefault('MOOD_JOB_WORKERS', '0')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+
+from sqlalchemy import event
+
+from app import create_app
+from config import db
+from datagen import generate_dataset
+from models import User
+
+app = create_app()
+
+class StatementCounter:
+    """Counts statements sent to the database while active"""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self.on_execute)
+
+    def on_execute(self, *args):
+        self.count += 1
+
+def measure(counter, function, repeat):
+    """
+    Run function repeat times.
+
+    Returns:
+        tuple: (statements issued by one call, median seconds per call)
+    """
+    timings = []
+    for _ in range(repeat):
+        before = counter.count
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+        statements = counter.count - before
+    return statements, percentile(timings, 50)
+
+def main():
+    parser = argparse.ArgumentParser(description="SQL statements and latency of GET /users")
+    parser.add_argument('--sizes', default='10,100,1000', help="comma-separated total user counts")
+    parser.add_argument('--entries-per-user', type=float, default=20, help="mean entries per user")
+    parser.add_argument('--repeat', type=int, default=20, help="timed calls per measurement")
+    args = parser.parse_args()
+
+    client = app.test_client()
+    with app.app_context():
+        db.create_all()
+        counter = StatementCounter(db.engine)
+
+        def lean():
+            assert client.get('/users?limit=100').status_code == 200
+
+        def with_entries():
+            assert client.get('/users?limit=100&include=entries').status_code == 200
+
+        def lazy():
+            db.session.expunge_all()
+            [user.to_dict() for user in User.query.all()]
+
+        print(f"{'users':>7}{'lean stmts':>12}{'lean ms':>10}{'+entries stmts':>16}{'+entries ms':>13}"
+              f"{'lazy stmts':>12}{'lazy ms':>10}")
+        lean_counts, entries_counts = set(), set()
+        total = 0
+        try:
+            for size in (int(value) for value in args.sizes.split(',')):
+                _, added, _ = generate_dataset(db.session, size - total, args.entries_per_user, seed=size)
+                total += added
+                lean_statements, lean_seconds = measure(counter, lean, args.repeat)
+                entries_statements, entries_seconds = measure(counter, with_entries, args.repeat)
+                lazy_statements, lazy_seconds = measure(counter, lazy, max(1, args.repeat // 10))
+                lean_counts.add(lean_statements)
+                entries_counts.add(entries_statements)
+                print(f"{total:>7}{lean_statements:>12}{lean_seconds * 1000:>10.1f}"
+                      f"{entries_statements:>16}{entries_seconds * 1000:>13.1f}"
+                      f"{lazy_statements:>12}{lazy_seconds * 1000:>10.1f}")
+        finally:
+            os.remove(database_path)
+
+    if len(lean_counts) > 1 or len(entries_counts) > 1:
+        print("FAIL: GET /users statement count depends on the number of users")
+        sys.exit(1)
+    print("ok: statement count is independent of the number of users")
+
+if __name__ == '__main__':
+    main()
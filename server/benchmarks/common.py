@@ -0,0 +1,25 @@
+# Helpers shared by the benchmark scripts
+import os
+import tempfile
+
+def use_temporary_database():
+    """
+    Point the app at a fresh SQLite file (call before create_app()).
+
+    A file rather than sqlite:// so that every thread sees the same database.
+
+    Returns:
+        str: Path of the database file
+    """
+    handle, path = tempfile.mkstemp(prefix='moodring-bench-', suffix='.db')
+    os.close(handle)
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    return path
+
+def percentile(values, percent):
+    """Nearest-rank percentile of a list of numbers (None if empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[rank]
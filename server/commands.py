@@ -0,0 +1,142 @@
+# Flask CLI maintenance commands (run with `flask <command>` from the server directory)
+from datetime import datetime
+
+import click
+from flask import Blueprint, current_app
+from sqlalchemy import select, or_, and_, text
+
+from config import db, init_migrations
+from models import Entry
+from mood_stats import rebuild_mood_stats
+from mood_timeline import rebuild_mood_daily
+from mood_jobs import run_queued_jobs
+from entry_transfer import export_entries, import_entries
+from replica import sync_sqlite_replica
+
+class MigrationCommands(click.Group):
+    """`flask db`: Flask-Migrate's command group, loaded (with Alembic) only when it is used"""
+
+    def migration_group(self):
+        init_migrations(current_app._get_current_object())
+        from flask_migrate.cli import db as migration_group
+        return migration_group
+
+    def list_commands(self, ctx):
+        return self.migration_group().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self.migration_group().get_command(ctx, name)
+
+# Top-level `flask <command>` commands, added to each application by init_commands()
+cli_blueprint = Blueprint('commands', __name__, cli_group=None)
+
+def init_commands(app):
+    """
+    Add the maintenance commands and the lazy `flask db` group to an application.
+
+    Args:
+        app (Flask): Application being created
+    """
+    app.register_blueprint(cli_blueprint)
+    app.cli.add_command(MigrationCommands('db', help="Perform database migrations."))
+
+def hot_entry_queries():
+    """
+    Build the entry queries issued on every Journal and Profile page load.
+
+    Returns:
+        list: (name, statement) pairs mirroring the queries in app.py
+    """
+    newest_first = (Entry.created_at.desc(), Entry.id.desc())
+    cursor_created_at, cursor_id = datetime(2000, 1, 1), 1
+    return [
+        ("entries page", select(Entry).filter_by(user_id=1).order_by(*newest_first).limit(21)),
+        ("entries page after cursor", select(Entry).filter_by(user_id=1).filter(or_(
+            Entry.created_at < cursor_created_at,
+            and_(Entry.created_at == cursor_created_at, Entry.id < cursor_id)
+        )).order_by(*newest_first).limit(21)),
+        ("profile entries", select(Entry).filter_by(user_id=1)),
+    ]
+
+def explain_query_plan(statement):
+    """
+    Run SQLite's EXPLAIN QUERY PLAN for a statement.
+
+    Args:
+        statement: SQLAlchemy selectable to explain
+
+    Returns:
+        list: Plan detail strings, one per plan step
+    """
+    compiled = statement.compile(db.engine, compile_kwargs={"literal_binds": True})
+    rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+    return [row[-1] for row in rows]
+
+def plan_problems(plan):
+    """Return the plan steps that indicate a table scan or an unindexed sort"""
+    return [step for step in plan
+            if (step.startswith('SCAN ') and 'INDEX' not in step) or 'TEMP B-TREE' in step]
+
+@cli_blueprint.cli.command('check-query-plans')
+def check_query_plans():
+    """Fail if a hot entries query regresses to a full table scan"""
+    if db.engine.dialect.name != 'sqlite':
+        click.echo(f"Query plan check only supports SQLite (got {db.engine.dialect.name}), skipping")
+        return
+
+    failed = False
+    for name, statement in hot_entry_queries():
+        plan = explain_query_plan(statement)
+        problems = plan_problems(plan)
+        status = "FAIL" if problems else "ok"
+        click.echo(f"[{status}] {name}: {' | '.join(plan)}")
+        failed = failed or bool(problems)
+
+    if failed:
+        raise SystemExit(1)
+
+@cli_blueprint.cli.command('rebuild-mood-stats')
+def rebuild_mood_stats_command():
+    """Recompute user_mood_stats and user_mood_daily from the entries table to repair drift"""
+    user_count = rebuild_mood_stats(db.session)
+    day_count = rebuild_mood_daily(db.session)
+    db.session.commit()
+    click.echo(f"Rebuilt mood stats for {user_count} users ({day_count} daily rollups)")
+
+@cli_blueprint.cli.command('process-mood-jobs')
+def process_mood_jobs_command():
+    """Run queued background mood analysis jobs in the foreground"""
+    job_count = run_queued_jobs()
+    click.echo(f"Processed {job_count} mood jobs")
+
+@cli_blueprint.cli.command('export-entries')
+@click.argument('user_id', type=int)
+@click.argument('output', type=click.File('wb'))
+def export_entries_command(user_id, output):
+    """Write a user's entries to OUTPUT as NDJSON ("-" for stdout)"""
+    count = 0
+    for line in export_entries(db.session, user_id):
+        output.write(line)
+        count += 1
+    click.echo(f"Exported {count} entries", err=True)
+
+@cli_blueprint.cli.command('import-entries')
+@click.argument('user_id', type=int)
+@click.argument('source', type=click.File('rb'))
+def import_entries_command(user_id, source):
+    """Load NDJSON entries from SOURCE into a user's journal ("-" for stdin)"""
+    result = import_entries(db.session, user_id, source)
+    click.echo(f"Imported {result['imported']} entries")
+    if result['error']:
+        click.echo(f"Stopped at {result['error']}", err=True)
+        raise SystemExit(1)
+
+@cli_blueprint.cli.command('sync-read-replica')
+def sync_read_replica_command():
+    """Copy the primary SQLite database to the DATABASE_READ_URL file"""
+    try:
+        primary_path, replica_path = sync_sqlite_replica()
+    except ValueError as e:
+        click.echo(str(e), err=True)
+        raise SystemExit(1)
+    click.echo(f"Copied {primary_path} to {replica_path}")
@@ -1,47 +1,163 @@
 # Flask application configuration and setup
-from flask import Flask
+#
+# load_config() reads every setting from the environment, and the extensions
+# here are unbound: app.create_app() builds each application, configures it
+# and binds them to it. Imports needed only on some code paths are deferred:
+# Flask-Migrate and Alembic until `flask db` runs (init_migrations), the OpenAI
+# SDK until the first model call (ai_client.py).
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_restful import Api
-from flask_cors import CORS
 import os
 from dotenv import load_dotenv
+from db_engine import engine_options
 
-# Load environment variables from .env file
+# Load environment variables from .env file (the only place they are loaded)
 load_dotenv()
 
-# Initialize Flask application
-app = Flask(__name__)
+def load_config(app, overrides=None):
+    """
+    Apply the settings from the environment (and .env) to an application.
 
-# Database configuration
-# Use DATABASE_URL from environment or default to SQLite
-app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///moodring.db')
+    Args:
+        app (Flask): Application being created
+        overrides (dict): Settings that replace the environment values
+    """
+    # Database configuration
+    # Use DATABASE_URL from environment or default to SQLite
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///moodring.db')
 
-# Disable SQLAlchemy modification tracking for performance
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Optional read replica (see replica.py)
+    # Read-only handlers use DATABASE_READ_URL when set, falling back to the
+    # primary for a user whose journal the replica hasn't caught up with
+    app.config['DATABASE_READ_URL'] = os.getenv('DATABASE_READ_URL')
 
-# Secret key for session management and security
-# Use SECRET_KEY from environment or default to development key
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
+    # Disable SQLAlchemy modification tracking for performance
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-# Initialize Flask extensions
+    # Database engine profile (see db_engine.py)
+    # tuned (default) or default; SQLite pragmas for tuned: lock wait, page cache
+    # and memory map size; pool sizing for server databases such as PostgreSQL
+    app.config['DB_ENGINE_PROFILE'] = os.getenv('DB_ENGINE_PROFILE', 'tuned')
+    app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    app.config['SQLITE_CACHE_SIZE_KB'] = int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024))
+    app.config['SQLITE_MMAP_SIZE_BYTES'] = int(os.getenv('SQLITE_MMAP_SIZE_BYTES', 256 * 1024 * 1024))
+    app.config['DB_POOL_SIZE'] = int(os.getenv('DB_POOL_SIZE', 10))
+    app.config['DB_MAX_OVERFLOW'] = int(os.getenv('DB_MAX_OVERFLOW', 20))
+    app.config['DB_POOL_TIMEOUT_SECONDS'] = float(os.getenv('DB_POOL_TIMEOUT_SECONDS', 10))
+    app.config['DB_POOL_RECYCLE_SECONDS'] = int(os.getenv('DB_POOL_RECYCLE_SECONDS', 1800))
+
+    # Secret key for session management and security
+    # Use SECRET_KEY from environment or default to development key
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
+
+    # AI mood analysis result cache (see mood_cache.py)
+    # Entries kept in the in-process LRU tier and lifetime of persisted results
+    app.config['MOOD_CACHE_SIZE'] = int(os.getenv('MOOD_CACHE_SIZE', 1024))
+    app.config['MOOD_CACHE_TTL_SECONDS'] = int(os.getenv('MOOD_CACHE_TTL_SECONDS', 30 * 24 * 60 * 60))
+
+    # Batched mood analysis (POST /analyze-mood/batch)
+    # Entries accepted per request, prompt token budget and entry cap per model call,
+    # and how many model calls may run concurrently
+    app.config['MOOD_BATCH_MAX_ENTRIES'] = int(os.getenv('MOOD_BATCH_MAX_ENTRIES', 500))
+    app.config['MOOD_BATCH_TOKEN_BUDGET'] = int(os.getenv('MOOD_BATCH_TOKEN_BUDGET', 3000))
+    app.config['MOOD_BATCH_MAX_ITEMS_PER_CALL'] = int(os.getenv('MOOD_BATCH_MAX_ITEMS_PER_CALL', 20))
+    app.config['MOOD_BATCH_PARALLELISM'] = int(os.getenv('MOOD_BATCH_PARALLELISM', 4))
+
+    # Background mood analysis for entries saved without a mood (see mood_jobs.py)
+    app.config['MOOD_JOB_WORKERS'] = int(os.getenv('MOOD_JOB_WORKERS', 2))
+
+    # Mood analysis engine selection (see mood_engine.py)
+    # Default engine (auto, local or remote), local classifier confidence needed to
+    # skip the model in auto mode (check it with benchmarks/bench_mood_classifier.py
+    # before lowering it), and how long to wait for the model before falling back
+    app.config['MOOD_ENGINE'] = os.getenv('MOOD_ENGINE', 'auto')
+    app.config['MOOD_LOCAL_CONFIDENCE'] = float(os.getenv('MOOD_LOCAL_CONFIDENCE', 0.8))
+    app.config['MOOD_REQUEST_TIMEOUT_SECONDS'] = float(os.getenv('MOOD_REQUEST_TIMEOUT_SECONDS', 8))
+
+    # Map-reduce profile generation (see profile_generation.py)
+    # Largest estimated prompt any single profile call may send, size below which
+    # entries are used verbatim instead of summarized, and concurrent summary calls
+    app.config['PROFILE_TOKEN_BUDGET'] = int(os.getenv('PROFILE_TOKEN_BUDGET', 3000))
+    app.config['PROFILE_SUMMARY_TOKENS'] = int(os.getenv('PROFILE_SUMMARY_TOKENS', 60))
+    app.config['PROFILE_PARALLELISM'] = int(os.getenv('PROFILE_PARALLELISM', 4))
+
+    # Shared OpenAI client (see ai_client.py)
+    # Keep-alive connections kept open, per-attempt timeout, total deadline per call
+    # including retries, retry count and base backoff delay, and the circuit breaker:
+    # consecutive failures before it opens and how long it stays open
+    app.config['AI_POOL_SIZE'] = int(os.getenv('AI_POOL_SIZE', 10))
+    app.config['AI_REQUEST_TIMEOUT_SECONDS'] = float(os.getenv('AI_REQUEST_TIMEOUT_SECONDS', 20))
+    app.config['AI_DEADLINE_SECONDS'] = float(os.getenv('AI_DEADLINE_SECONDS', 30))
+    app.config['AI_MAX_RETRIES'] = int(os.getenv('AI_MAX_RETRIES', 2))
+    app.config['AI_BACKOFF_SECONDS'] = float(os.getenv('AI_BACKOFF_SECONDS', 0.5))
+    app.config['AI_BREAKER_FAILURES'] = int(os.getenv('AI_BREAKER_FAILURES', 5))
+    app.config['AI_BREAKER_RESET_SECONDS'] = float(os.getenv('AI_BREAKER_RESET_SECONDS', 30))
+
+    # Asyncio server for the AI endpoints (see ai_server.py)
+    # Connections its shared aiohttp session may open to the API (bounding the model
+    # calls in flight) and worker threads for the database steps between calls
+    app.config['AI_ASYNC_MAX_CONNECTIONS'] = int(os.getenv('AI_ASYNC_MAX_CONNECTIONS', 200))
+    app.config['AI_ASYNC_DB_THREADS'] = int(os.getenv('AI_ASYNC_DB_THREADS', 8))
+
+    # Password hashing (see passwords.py)
+    # bcrypt cost factor (existing hashes are upgraded on login), hashing threads
+    # (half the cores by default, leaving the rest for other requests), how many
+    # hashes may be queued or running before new logins get a 503, and how long a
+    # request waits for its hash before it gets a 503 instead
+    app.config['BCRYPT_ROUNDS'] = int(os.getenv('BCRYPT_ROUNDS', 12))
+    app.config['BCRYPT_WORKERS'] = int(os.getenv('BCRYPT_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+    app.config['BCRYPT_MAX_PENDING'] = int(os.getenv('BCRYPT_MAX_PENDING', 32))
+    app.config['BCRYPT_WAIT_SECONDS'] = float(os.getenv('BCRYPT_WAIT_SECONDS', 5))
+
+    # NDJSON export/import of entries (see entry_transfer.py)
+    # Rows fetched per database round trip while exporting, and lines written per
+    # import transaction
+    app.config['EXPORT_BATCH_SIZE'] = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
+    app.config['IMPORT_CHUNK_SIZE'] = int(os.getenv('IMPORT_CHUNK_SIZE', 1000))
+
+    # Request, SQL and AI call metrics exported at /metrics (see metrics.py)
+    app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes', 'on')
+
+    # Settings passed to create_app() (tests, benchmarks) win over the environment
+    if overrides:
+        app.config.update(overrides)
+
+    # Derived database settings, computed from the final values above
+    if app.config['DATABASE_READ_URL']:
+        app.config['SQLALCHEMY_BINDS'] = {'replica': app.config['DATABASE_READ_URL']}
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+# Flask extensions, bound to each app in app.create_app()
 # SQLAlchemy for database ORM
-db = SQLAlchemy(app)
+db = SQLAlchemy()
+
+def init_migrations(app):
+    """
+    Register Flask-Migrate with the app, importing it (and Alembic) on first use.
+
+    Called by the `flask db` commands and by scripts that run migrations.
 
-# Flask-Migrate for database migrations
-migrate = Migrate(app, db)
+    Args:
+        app (Flask): Application to register with
+    """
+    if 'migrate' not in app.extensions:
+        from flask_migrate import Migrate
+        Migrate(app, db)
 
-# Flask-RESTful for API endpoints
-api = Api(app)
+def with_app_context(function):
+    """
+    Wrap function so it runs inside an app context of the current application.
 
-# Enable Cross-Origin Resource Sharing (CORS)
-# Allows frontend to make requests to backend from different origins
-CORS(app)
+    For work handed to other threads (model call pools, the asyncio server's
+    database threads), which do not inherit the caller's app context. Each call
+    gets a fresh context, and with it its own db.session.
 
-# Import models after database is initialized
-# This ensures models can use the db instance
-from models import *
+    Returns:
+        callable: function taking the same arguments
+    """
+    app = current_app._get_current_object()
 
-# Import routes after models are imported
-# This ensures routes can access the models
-# from routes import *
+    def run(*args, **kwargs):
+        with app.app_context():
+            return function(*args, **kwargs)
+    return run
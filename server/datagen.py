@@ -0,0 +1,185 @@
+# Synthetic data generator for capacity planning and benchmarks
+#
+#   cd server && python datagen.py --users 100000 --entries-per-user 40
+#
+# Adds users and entries with executemany Core inserts of --chunk-size rows,
+# rebuilds the mood aggregates in one pass and commits it all as a single
+# transaction; the search index triggers stay in place and index each row.
+# Entry text and mood combinations are resampled from the labelled seed
+# entries, so the mood mix, entry lengths and search terms look like real
+# journals:
+#   - each user gets their own temperament (a skewed weighting of the seed moods)
+#   - entries per user follow a long-tailed distribution around the requested mean
+#   - entries are spread over the last --days days, mostly written in the evening
+# Every generated user shares the seed password (seed_data.SEED_PASSWORD),
+# hashed once, so any of them can log in.
+import argparse
+from datetime import datetime, timedelta
+import math
+import random
+import re
+import time
+
+from sqlalchemy import select, insert, func
+
+from app import create_app
+from config import db
+from models import User, Entry
+from moods import moods_to_mask, parse_moods
+from mood_stats import rebuild_mood_stats
+from mood_timeline import rebuild_mood_daily
+from passwords import hash_password
+from seed_data import SEED_ENTRIES, SEED_PASSWORD
+
+# Relative likelihood of writing at each hour of the day (evenings dominate)
+HOUR_WEIGHTS = [1, 1, 0, 0, 0, 0, 1, 2, 3, 2, 2, 2, 3, 2, 2, 2, 2, 3, 4, 5, 7, 8, 7, 4]
+
+# Spread of the per-user entry count (lognormal sigma); larger means a longer tail of heavy writers
+ENTRY_COUNT_SPREAD = 1.0
+
+# Dirichlet concentration for a user's mood temperament; smaller means more one-sided users
+TEMPERAMENT_CONCENTRATION = 0.5
+
+def entry_templates():
+    """
+    Split the seed entries into reusable pieces.
+
+    Returns:
+        list: (title, sentences, mood_mask) per seed entry
+    """
+    return [
+        (entry["title"], re.split(r'(?<=[.!?])\s+', entry["content"]), moods_to_mask(parse_moods(entry["mood"])))
+        for entry in SEED_ENTRIES
+    ]
+
+def entry_count(rng, mean):
+    """Long-tailed number of entries for one user, averaging about mean"""
+    mu = math.log(mean) - ENTRY_COUNT_SPREAD ** 2 / 2
+    return max(1, round(rng.lognormvariate(mu, ENTRY_COUNT_SPREAD)))
+
+def generate_user_entries(rng, user_id, count, templates, now, days):
+    """
+    Build one user's entries, oldest first.
+
+    Args:
+        rng (Random): Random source
+        user_id (int): Owner
+        count (int): Number of entries
+        templates (list): From entry_templates()
+        now (datetime): Latest possible timestamp
+        days (int): How far back entries go
+
+    Returns:
+        list: Row dicts for the entries table
+    """
+    weights = [rng.gammavariate(TEMPERAMENT_CONCENTRATION, 1) for _ in templates]
+    chosen = rng.choices(templates, weights=weights, k=count)
+    midnight = now.replace(hour=0, minute=0)
+    hours = rng.choices(range(24), weights=HOUR_WEIGHTS, k=count)
+    timestamps = sorted(
+        min(now, midnight - timedelta(days=rng.randrange(days)) + timedelta(hours=hour, minutes=rng.randrange(60)))
+        for hour in hours
+    )
+    rows = []
+    for (title, sentences, mood_mask), created_at in zip(chosen, timestamps):
+        keep = sorted(rng.sample(range(len(sentences)), rng.randint(min(3, len(sentences)), len(sentences))))
+        rows.append({
+            "title": title,
+            "content": " ".join(sentences[index] for index in keep),
+            "mood_mask": mood_mask,
+            "created_at": created_at,
+            "updated_at": created_at,
+            "user_id": user_id
+        })
+    return rows
+
+def bulk_insert(session, table, rows, chunk_size, label):
+    """
+    Insert rows with executemany, chunk_size rows per statement (caller commits).
+
+    Args:
+        session (Session): Database session
+        table (Table): Target table
+        rows (iterable): Row dicts (consumed lazily)
+        chunk_size (int): Rows per executemany
+        label (str): Name used in progress output
+
+    Returns:
+        int: Rows inserted
+    """
+    inserted = 0
+    chunk = []
+    started = time.perf_counter()
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            session.execute(insert(table), chunk)
+            inserted += len(chunk)
+            chunk = []
+            print(f"  {inserted:,} {label} ({inserted / (time.perf_counter() - started):,.0f}/s)")
+    if chunk:
+        session.execute(insert(table), chunk)
+        inserted += len(chunk)
+    return inserted
+
+def generate_dataset(session, users, entries_per_user, days=365, chunk_size=5000, seed=None, prefix='synthetic-'):
+    """
+    Add synthetic users and entries and refresh the mood aggregates, in one transaction.
+
+    Args:
+        session (Session): Database session
+        users (int): Users to add
+        entries_per_user (float): Mean entries per user
+        days (int): How far back entries go
+        chunk_size (int): Rows per executemany
+        seed (int): Random seed for reproducible data (None = random)
+        prefix (str): Username prefix (usernames are prefix + user id)
+
+    Returns:
+        tuple: (first user id, users added, entries added)
+    """
+    rng = random.Random(seed)
+    templates = entry_templates()
+    now = datetime.now().replace(second=0, microsecond=0)
+    first_id = (session.scalar(select(func.max(User.id))) or 0) + 1
+    user_ids = range(first_id, first_id + users)
+    password_hash = hash_password(SEED_PASSWORD)
+
+    user_count = bulk_insert(
+        session, User.__table__,
+        ({"id": user_id, "username": f"{prefix}{user_id}", "_password_hash": password_hash} for user_id in user_ids),
+        chunk_size, "users"
+    )
+    entry_rows = (
+        row
+        for user_id in user_ids
+        for row in generate_user_entries(rng, user_id, entry_count(rng, entries_per_user), templates, now, days)
+    )
+    entry_total = bulk_insert(session, Entry.__table__, entry_rows, chunk_size, "entries")
+
+    # Core inserts bypass the flush listeners, so the aggregates are rebuilt in one pass
+    rebuild_mood_stats(session)
+    rebuild_mood_daily(session)
+    session.commit()
+    return first_id, user_count, entry_total
+
+def main():
+    parser = argparse.ArgumentParser(description="Add synthetic users and journal entries")
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--entries-per-user', type=float, default=30, help="mean entries per user (long-tailed)")
+    parser.add_argument('--days', type=int, default=365, help="how far back entries go")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="rows per insert statement")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for reproducible data")
+    parser.add_argument('--prefix', default='synthetic-', help="username prefix")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with create_app().app_context():
+        first_id, user_count, entry_total = generate_dataset(
+            db.session, args.users, args.entries_per_user, args.days, args.chunk_size, args.seed, args.prefix
+        )
+    print(f"Added {user_count:,} users (ids from {first_id}) and {entry_total:,} entries "
+          f"in {time.perf_counter() - started:.1f}s; password for all: {SEED_PASSWORD}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+# Bulk export and import of a user's journal as NDJSON (one entry per line)
+#
+# Export streams rows straight from a yield_per cursor through the compiled
+# serializer, so memory stays flat however large the journal is. Import parses
+# lines as they arrive and writes them with executemany-style Core inserts,
+# one transaction per IMPORT_CHUNK_SIZE lines. Core inserts bypass the ORM
+# flush listeners, so each chunk applies the matching mood_stats and
+# user_mood_daily deltas itself (the FTS triggers still fire in the database).
+from collections import defaultdict
+from datetime import datetime
+import json
+
+from flask import current_app
+from sqlalchemy import select, insert
+
+from models import Entry
+from moods import NEUTRAL_MASK, PENDING_MOOD, parse_moods, moods_to_mask
+from mood_stats import new_delta, add_entry_to_delta, apply_mood_deltas
+from mood_timeline import entry_day, apply_daily_deltas
+from serializers import serialize_user_entry, encode_json
+
+# Columns read by export, in the attribute names serialize_user_entry expects
+EXPORT_COLUMNS = [Entry.id, Entry.title, Entry.content, Entry.mood_mask,
+                  Entry.created_at, Entry.updated_at, Entry.user_id]
+
+def export_entries(session, user_id):
+    """
+    Yield one user's entries as NDJSON lines, oldest first.
+
+    Rows are plain column tuples (no ORM identity map), fetched EXPORT_BATCH_SIZE at a time.
+
+    Args:
+        session (Session): Database session
+        user_id (int): Whose entries to export
+
+    Yields:
+        bytes: One JSON object per entry, newline terminated (same fields as GET /entries)
+    """
+    rows = session.execute(
+        select(*EXPORT_COLUMNS)
+        .where(Entry.user_id == user_id)
+        .order_by(Entry.id)
+        .execution_options(yield_per=current_app.config['EXPORT_BATCH_SIZE'])
+    )
+    for row in rows:
+        yield encode_json(serialize_user_entry(row)) + b'\n'
+
+def parse_import_line(line, user_id):
+    """
+    Turn one NDJSON line into an entries row for user_id.
+
+    id and user_id in the line are ignored: imported entries get new ids and
+    belong to the importing user. Entries without a recognised mood (including
+    "pending" ones) are stored as neutral, since no analysis job is queued for them.
+
+    Args:
+        line (bytes or str): JSON object with title, content and optionally
+            mood, created_at and updated_at
+        user_id (int): Owner of the imported entries
+
+    Returns:
+        dict: Column values for the insert
+
+    Raises:
+        ValueError: If the line is not a JSON object with a title and content, or a
+            field has the wrong type
+    """
+    data = json.loads(line)
+    if not isinstance(data, dict):
+        raise ValueError("expected a JSON object")
+    for field in ('title', 'content'):
+        if not isinstance(data.get(field), str):
+            raise ValueError(f"missing required field: {field}")
+
+    for field in ('created_at', 'updated_at'):
+        if data.get(field) is not None and not isinstance(data[field], str):
+            raise ValueError(f"{field} must be an ISO 8601 string")
+
+    # "happy,excited" as exported, or a list of moods
+    mood_field = data.get('mood')
+    if isinstance(mood_field, list) and all(isinstance(item, str) for item in mood_field):
+        mood_field = ','.join(mood_field)
+    elif mood_field is not None and not isinstance(mood_field, str):
+        raise ValueError("mood must be a string or a list of strings")
+
+    moods = [mood for mood in parse_moods(mood_field) if mood != PENDING_MOOD]
+    now = datetime.now()
+    created_at = datetime.fromisoformat(data['created_at']) if data.get('created_at') else now
+    updated_at = datetime.fromisoformat(data['updated_at']) if data.get('updated_at') else created_at
+    return {
+        "title": data['title'],
+        "content": data['content'],
+        "mood_mask": moods_to_mask(moods) or NEUTRAL_MASK,
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "user_id": user_id
+    }
+
+def insert_chunk(session, user_id, rows):
+    """
+    Insert one chunk of parsed rows and the aggregates they affect, then commit.
+
+    Args:
+        session (Session): Database session
+        user_id (int): Owner of the rows
+        rows (list): Dicts from parse_import_line
+    """
+    session.execute(insert(Entry.__table__), rows)
+
+    stats_delta = new_delta()
+    daily_deltas = defaultdict(new_delta)
+    for row in rows:
+        add_entry_to_delta(stats_delta, row['mood_mask'], 1)
+        add_entry_to_delta(daily_deltas[user_id, entry_day(row['created_at'])], row['mood_mask'], 1)
+    stats_delta['entries_version'] += 1
+    apply_mood_deltas(session, {user_id: stats_delta})
+    apply_daily_deltas(session, daily_deltas)
+    session.commit()
+
+def import_entries(session, user_id, lines, chunk_size=None):
+    """
+    Import NDJSON entries for a user in bounded transactions.
+
+    Each chunk of lines is committed on its own. On a malformed line the valid
+    lines before it are committed and the import stops, so a client can fix
+    that line and resume from it.
+
+    Args:
+        session (Session): Database session (committed by this function)
+        user_id (int): Owner of the imported entries
+        lines (iterable): NDJSON lines (bytes or str); blank lines are skipped
+        chunk_size (int): Lines per transaction (None = IMPORT_CHUNK_SIZE)
+
+    Returns:
+        dict: imported (entries written) and error (None, or "line N: reason")
+    """
+    chunk_size = chunk_size or current_app.config['IMPORT_CHUNK_SIZE']
+    imported = 0
+    rows = []
+    error = None
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            rows.append(parse_import_line(line, user_id))
+        except ValueError as e:  # json.JSONDecodeError is a ValueError too
+            error = f"line {number}: {e}"
+            break
+        if len(rows) >= chunk_size:
+            insert_chunk(session, user_id, rows)
+            imported += len(rows)
+            rows = []
+
+    if rows:
+        insert_chunk(session, user_id, rows)
+        imported += len(rows)
+    return {"imported": imported, "error": error}
@@ -0,0 +1,71 @@
+# Strong ETags and conditional GET (If-None-Match -> 304) for read endpoints
+#
+# Tags are hashes of cheap version data (entries_version, updated_at, ...)
+# looked up before the full rows are loaded, so a client with a current copy
+# costs one small query and no serialization or transfer.
+import hashlib
+
+from flask import request, Response
+from sqlalchemy import select
+
+from models import Entry, User, UserMoodStats
+
+def make_etag(*parts):
+    """
+    Build a strong ETag value from the data a response depends on.
+
+    Args:
+        parts: Values identifying the representation (versions, timestamps, query params)
+
+    Returns:
+        str: Unquoted tag
+    """
+    raw = "\x1f".join(str(part) for part in parts)
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+def tag_response(response, etag):
+    """Attach the ETag and ask clients to revalidate before reusing their copy"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def not_modified(etag):
+    """
+    Answer a conditional GET whose cached copy is still current.
+
+    Returns:
+        Response: Empty 304 if If-None-Match matches the tag, otherwise None
+    """
+    if etag in request.if_none_match:
+        return tag_response(Response(status=304), etag)
+    return None
+
+def journal_version(session, user_id):
+    """
+    Version data for everything under a user: username plus entries_version.
+
+    entries_version is bumped by every entry insert, edit and delete (see mood_stats.py).
+
+    Returns:
+        tuple: (username, entries_version), (None, None) for unknown users
+    """
+    row = session.execute(
+        select(User.username, UserMoodStats.entries_version)
+        .outerjoin(UserMoodStats, UserMoodStats.user_id == User.id)
+        .where(User.id == user_id)
+    ).first()
+    return tuple(row) if row else (None, None)
+
+def entry_version(session, entry_id):
+    """
+    Version data for a single entry: its updated_at plus the embedded author's username.
+
+    Returns:
+        tuple: (updated_at, username), or None if the entry doesn't exist
+    """
+    row = session.execute(
+        select(Entry.updated_at, User.username)
+        .outerjoin(User, User.id == Entry.user_id)
+        .where(Entry.id == entry_id)
+    ).first()
+    return tuple(row) if row else None
@@ -0,0 +1,170 @@
+# Local stand-in for the OpenAI chat completions API
+#
+# Answers the prompts this app sends (single and batched mood analysis, entry
+# summaries, profile windows and profiles) using the offline classifier, with
+# configurable latency and failure rate. Point the app at it to exercise the
+# AI code paths without network access or API costs:
+#
+#   python fake_openai.py --port 8089 --latency 0.3 --error-rate 0.1
+#   OPENAI_API_BASE=http://127.0.0.1:8089/v1 OPENAI_API_KEY=test flask run
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import re
+import threading
+import time
+
+from mood_classifier import classify_mood
+
+def quoted_items(prompt):
+    """Texts of the numbered [n] "..." items in a batch prompt"""
+    return re.findall(r'^\s*\[\d+\] "(.*)"\s*$', prompt, re.M)
+
+def first_words(text, count):
+    words = text.split()
+    return " ".join(words[:count]) + ("..." if len(words) > count else "")
+
+def answer_prompt(prompt):
+    """Produce a plausible answer in the format each app prompt asks for"""
+    if 'Summarize each numbered' in prompt:
+        return "\n".join(f"{number}: {first_words(text, 25)}"
+                         for number, text in enumerate(quoted_items(prompt), start=1))
+    if 'numbered journal entry' in prompt:
+        return "\n".join(f"{number}: {classify_mood(text)[0]}"
+                         for number, text in enumerate(quoted_items(prompt), start=1))
+    if 'Condense them' in prompt:
+        return first_words(" ".join(re.findall(r'^\s*- (.*)$', prompt, re.M)), 100)
+    if 'DOMINANT_MOOD' in prompt:
+        moods = classify_mood(" ".join(re.findall(r'^\s*- (.*)$', prompt, re.M)))[0].split(',')
+        secondary = moods[1] if len(moods) > 1 else 'calm'
+        return (f"DOMINANT_MOOD: {moods[0]}\nSECONDARY_MOOD: {secondary}\n"
+                f"DESCRIPTION: You write with honesty about your days. Your journal shows a lot of {moods[0]} moments.")
+    match = re.search(r'Journal entry: "(.*)"', prompt, re.S)
+    return classify_mood(match.group(1) if match else prompt)[0]
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Handles POST .../chat/completions like the real API, including stream=true"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+        time.sleep(self.server.latency)
+
+        if not self.path.endswith('/chat/completions'):
+            return self.send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+        if random.random() < self.server.error_rate:
+            return self.send_json(503, {"error": {"message": "Fake upstream overloaded", "type": "server_error"}})
+
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        self.server.requests += 1
+        if body.get('stream'):
+            return self.send_stream(body.get('model', 'gpt-3.5-turbo'), answer_prompt(prompt))
+        self.send_json(200, {
+            "id": f"chatcmpl-fake-{self.server.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get('model', 'gpt-3.5-turbo'),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": answer_prompt(prompt)},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": 20, "total_tokens": len(prompt) // 4 + 20}
+        })
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def send_stream(self, model, answer):
+        """Send the answer word by word as chat.completion.chunk events"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        pieces = re.findall(r'\S+\s*|\s+', answer)
+        for index, piece in enumerate(pieces):
+            delta = {"role": "assistant", "content": piece} if index == 0 else {"content": piece}
+            self.write_chunk(model, delta, None)
+            time.sleep(self.server.token_delay)
+        self.write_chunk(model, {}, "stop")
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def write_chunk(self, model, delta, finish_reason):
+        chunk = {
+            "id": f"chatcmpl-fake-{self.server.requests}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog deep enough for hundreds of concurrent clients"""
+
+    request_queue_size = 1024
+
+def start_fake_openai(host='127.0.0.1', port=0, latency=0.0, error_rate=0.0, token_delay=0.0, verbose=False):
+    """
+    Start the stand-in server on a background thread.
+
+    Args:
+        host (str): Interface to bind
+        port (int): Port to bind (0 = any free port)
+        latency (float): Seconds added to every response
+        error_rate (float): Fraction of requests answered with a 503
+        token_delay (float): Seconds between words of a streamed answer
+        verbose (bool): Log every request
+
+    Returns:
+        FakeOpenAIServer: Running server; its api_base attribute is the
+        value for OPENAI_API_BASE, requests and connections count the
+        answered calls and accepted TCP connections, and shutdown() stops it
+    """
+    server = FakeOpenAIServer((host, port), FakeOpenAIHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.error_rate = error_rate
+    server.token_delay = token_delay
+    server.verbose = verbose
+    server.requests = 0
+    server.connections = 0
+    server.api_base = f"http://{host}:{server.server_address[1]}/v1"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenAI chat completions API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with a 503")
+    parser.add_argument('--token-delay', type=float, default=0.0, help="seconds between words of a streamed answer")
+    args = parser.parse_args()
+
+    server = start_fake_openai(args.host, args.port, args.latency, args.error_rate, args.token_delay, verbose=True)
+    print(f"Fake OpenAI API listening - set OPENAI_API_BASE={server.api_base}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
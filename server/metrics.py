@@ -0,0 +1,183 @@
+# In-process metrics exported in the Prometheus text format at /metrics
+#
+# init_metrics() (called from app.create_app()) installs request hooks that time every
+# request per route, and SQLAlchemy cursor events that count and time every
+# statement, attributed to the request that issued it. ai_client.py reports
+# each model call's latency, outcome and token usage. Values live in this
+# process only: with several workers, scrape each one (or sum them upstream).
+from bisect import bisect_left
+import threading
+import time
+
+from flask import g, has_request_context, request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Histogram buckets (upper bounds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class Metric:
+    """A named metric family with labelled children"""
+
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def label_string(self, label_values, extra=()):
+        pairs = list(zip(self.labels, label_values)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{key}="{escape_label(value)}"' for key, value in pairs) + '}'
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self.values.items())
+        for label_values, value in items:
+            lines.extend(self.render_child(label_values, value))
+        return lines
+
+class Counter(Metric):
+    """Monotonically increasing total"""
+
+    kind = 'counter'
+
+    def inc(self, label_values=(), amount=1):
+        with self._lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render_child(self, label_values, value):
+        return [f"{self.name}{self.label_string(label_values)} {value}"]
+
+class Histogram(Metric):
+    """Cumulative bucket counts plus sum and count"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+
+    def observe(self, label_values, value):
+        with self._lock:
+            child = self.values.get(label_values)
+            if child is None:
+                child = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            child[0][bisect_left(self.buckets, value)] += 1
+            child[1] += value
+            child[2] += 1
+
+    def render_child(self, label_values, value):
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(list(self.buckets) + ['+Inf'], counts):
+            cumulative += bucket_count
+            lines.append(f"{self.name}_bucket{self.label_string(label_values, [('le', bound)])} {cumulative}")
+        lines.append(f"{self.name}_sum{self.label_string(label_values)} {total}")
+        lines.append(f"{self.name}_count{self.label_string(label_values)} {count}")
+        return lines
+
+REGISTRY = []
+
+request_duration = Histogram(
+    'moodring_http_request_duration_seconds', "Time spent handling requests",
+    ('method', 'route', 'status')
+)
+request_statements = Histogram(
+    'moodring_http_request_db_statements', "SQL statements executed per request",
+    ('method', 'route'), STATEMENT_BUCKETS
+)
+request_db_time = Histogram(
+    'moodring_http_request_db_seconds', "Time spent in SQL statements per request",
+    ('method', 'route')
+)
+db_statements = Counter('moodring_db_statements_total', "SQL statements executed (including outside requests)")
+db_time = Counter('moodring_db_statement_seconds_total', "Time spent in SQL statements (including outside requests)")
+ai_call_duration = Histogram(
+    'moodring_ai_call_duration_seconds', "Model call latency including retries",
+    ('model', 'kind', 'outcome')
+)
+ai_tokens = Counter('moodring_ai_tokens_total', "Tokens used by model calls", ('model', 'type'))
+
+def route_label():
+    """URL rule of the current request (bounded cardinality: ids are not expanded)"""
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+def before_request():
+    g.metrics_started = time.perf_counter()
+    g.metrics_statements = 0
+    g.metrics_db_seconds = 0.0
+
+def after_request(response):
+    started = g.pop('metrics_started', None)
+    if started is not None:
+        route = route_label()
+        request_duration.observe((request.method, route, str(response.status_code)), time.perf_counter() - started)
+        request_statements.observe((request.method, route), g.pop('metrics_statements', 0))
+        request_db_time.observe((request.method, route), g.pop('metrics_db_seconds', 0.0))
+    return response
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's execution context, which is dropped if the statement fails
+    context.metrics_started = time.perf_counter()
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context.metrics_started
+    db_statements.inc()
+    db_time.inc(amount=elapsed)
+    if has_request_context() and 'metrics_statements' in g:
+        g.metrics_statements += 1
+        g.metrics_db_seconds += elapsed
+
+def init_metrics(app):
+    """
+    Install the request hooks and SQL statement listeners.
+
+    Streamed responses are timed until the view returns, not until the last byte is sent.
+
+    Args:
+        app (Flask): Application to instrument
+    """
+    app.before_request(before_request)
+    app.after_request(after_request)
+    # The statement listeners cover every engine in the process, so they are installed once
+    if not event.contains(Engine, 'before_cursor_execute', before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+
+def observe_ai_call(model, kind, outcome, seconds, prompt_tokens=0, completion_tokens=0):
+    """
+    Record one model call.
+
+    Args:
+        model (str): Model name
+        kind (str): 'completion' or 'stream'
+        outcome (str): 'ok', 'error' (request rejected) or 'unavailable' (AIUnavailable)
+        seconds (float): Latency including retries
+        prompt_tokens (int): Prompt tokens reported by the API
+        completion_tokens (int): Completion tokens (streamed chunks for streams)
+    """
+    ai_call_duration.observe((model, kind, outcome), seconds)
+    if prompt_tokens:
+        ai_tokens.inc((model, 'prompt'), prompt_tokens)
+    if completion_tokens:
+        ai_tokens.inc((model, 'completion'), completion_tokens)
+
+def render_metrics():
+    """All metrics in the Prometheus text exposition format"""
+    return '\n'.join(line for metric in REGISTRY for line in metric.render()) + '\n'
+
+def metrics_response():
+    """GET /metrics response"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,42 @@
+"""Add mood_jobs background analysis queue
+
+Revision ID: 0a9c3e5b7d21
+Revises: f2a6d8b0c391
+Create Date: 2026-10-18 13:02:57.140662
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a9c3e5b7d21'
+down_revision = 'f2a6d8b0c391'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('mood_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('mood', sa.String(), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], name='fk_mood_jobs_entry_id', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('mood_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_mood_jobs_entry_id'), ['entry_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_mood_jobs_status'), ['status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('mood_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_mood_jobs_status'))
+        batch_op.drop_index(batch_op.f('ix_mood_jobs_entry_id'))
+
+    op.drop_table('mood_jobs')
@@ -0,0 +1,31 @@
+"""Add entry_summaries for map-reduce profile generation
+
+Revision ID: 1b4d7f2e9a63
+Revises: 0a9c3e5b7d21
+Create Date: 2026-10-18 14:21:08.513927
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b4d7f2e9a63'
+down_revision = '0a9c3e5b7d21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('entry_summaries',
+    sa.Column('entry_id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('summary', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['entry_id'], ['entries.id'], name='fk_entry_summaries_entry_id', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('entry_id')
+    )
+
+
+def downgrade():
+    op.drop_table('entry_summaries')
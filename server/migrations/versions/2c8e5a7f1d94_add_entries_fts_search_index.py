@@ -0,0 +1,59 @@
+"""Add entries_fts full-text search index (SQLite FTS5)
+
+Revision ID: 2c8e5a7f1d94
+Revises: 1b4d7f2e9a63
+Create Date: 2026-10-18 15:10:44.902316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c8e5a7f1d94'
+down_revision = '1b4d7f2e9a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other databases use the LIKE fallback in search.py
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    # External-content index: stores only the inverted index, text stays in entries
+    op.execute(
+        "CREATE VIRTUAL TABLE entries_fts USING fts5("
+        "title, content, content='entries', content_rowid='id', tokenize='porter unicode61')"
+    )
+
+    # Keep the index in step with every insert, delete and text edit
+    op.execute(
+        "CREATE TRIGGER entries_fts_after_insert AFTER INSERT ON entries BEGIN "
+        "INSERT INTO entries_fts(rowid, title, content) VALUES (new.id, new.title, new.content); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER entries_fts_after_delete AFTER DELETE ON entries BEGIN "
+        "INSERT INTO entries_fts(entries_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER entries_fts_after_update AFTER UPDATE OF title, content ON entries BEGIN "
+        "INSERT INTO entries_fts(entries_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+        "INSERT INTO entries_fts(rowid, title, content) VALUES (new.id, new.title, new.content); "
+        "END"
+    )
+
+    # Index the entries that already exist
+    op.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("DROP TRIGGER IF EXISTS entries_fts_after_update")
+    op.execute("DROP TRIGGER IF EXISTS entries_fts_after_delete")
+    op.execute("DROP TRIGGER IF EXISTS entries_fts_after_insert")
+    op.execute("DROP TABLE IF EXISTS entries_fts")
@@ -0,0 +1,47 @@
+"""Add user_mood_daily rollup table
+
+Revision ID: 3d9f6b8a2e15
+Revises: 2c8e5a7f1d94
+Create Date: 2026-10-18 16:02:17.340571
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d9f6b8a2e15'
+down_revision = '2c8e5a7f1d94'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of moods.VALID_MOODS at the time of this migration (bit order matters)
+MOODS = ['happy', 'excited', 'calm', 'neutral', 'sad', 'angry', 'anxious', 'grateful', 'hopeful', 'confused', 'in love']
+
+
+def upgrade():
+    op.create_table('user_mood_daily',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    *[sa.Column(mood.replace(' ', '_'), sa.Integer(), nullable=False) for mood in MOODS],
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='fk_user_mood_daily_user_id'),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+    # Backfill from existing entries
+    day = 'date(created_at)' if op.get_bind().dialect.name == 'sqlite' else 'CAST(created_at AS DATE)'
+    mood_columns = ', '.join(mood.replace(' ', '_') for mood in MOODS)
+    mood_sums = ', '.join(
+        f'SUM(CASE WHEN (mood_mask & {1 << position}) != 0 THEN 1 ELSE 0 END)'
+        for position in range(len(MOODS))
+    )
+    op.execute(
+        f'INSERT INTO user_mood_daily (user_id, day, entry_count, {mood_columns}) '
+        f'SELECT user_id, {day}, COUNT(id), {mood_sums} FROM entries '
+        f'WHERE user_id IS NOT NULL AND created_at IS NOT NULL GROUP BY user_id, {day}'
+    )
+
+
+def downgrade():
+    op.drop_table('user_mood_daily')
@@ -0,0 +1,27 @@
+"""Drop the unused entries (user_id, mood_mask) index
+
+Revision ID: 4e7b1c9a5d32
+Revises: 3d9f6b8a2e15
+Create Date: 2026-10-18 17:05:12.418903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e7b1c9a5d32'
+down_revision = '3d9f6b8a2e15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Mood filters test mood_mask & bit, which a B-tree on the raw mask cannot serve
+    with op.batch_alter_table('entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_entries_user_id_mood_mask')
+
+
+def downgrade():
+    with op.batch_alter_table('entries', schema=None) as batch_op:
+        batch_op.create_index('ix_entries_user_id_mood_mask', ['user_id', 'mood_mask'], unique=False)
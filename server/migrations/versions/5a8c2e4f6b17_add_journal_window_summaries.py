@@ -0,0 +1,32 @@
+"""Add journal_window_summaries for stored profile reduce paragraphs
+
+Revision ID: 5a8c2e4f6b17
+Revises: 4e7b1c9a5d32
+Create Date: 2026-10-18 18:12:44.530826
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a8c2e4f6b17'
+down_revision = '4e7b1c9a5d32'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('journal_window_summaries',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.String(length=10), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('summary', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='fk_journal_window_summaries_user_id', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'period')
+    )
+
+
+def downgrade():
+    op.drop_table('journal_window_summaries')
@@ -0,0 +1,67 @@
+"""Add user_id to the entries_fts index so searches only walk one user's postings
+
+Revision ID: 6b3d9e1f7a28
+Revises: 5a8c2e4f6b17
+Create Date: 2026-10-18 19:02:17.318640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b3d9e1f7a28'
+down_revision = '5a8c2e4f6b17'
+branch_labels = None
+depends_on = None
+
+
+def create_index(columns):
+    """(Re)create the external-content entries_fts index over columns, its triggers, and fill it"""
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+
+    op.execute("DROP TRIGGER IF EXISTS entries_fts_after_update")
+    op.execute("DROP TRIGGER IF EXISTS entries_fts_after_delete")
+    op.execute("DROP TRIGGER IF EXISTS entries_fts_after_insert")
+    op.execute("DROP TABLE IF EXISTS entries_fts")
+
+    op.execute(
+        f"CREATE VIRTUAL TABLE entries_fts USING fts5("
+        f"{column_list}, content='entries', content_rowid='id', tokenize='porter unicode61')"
+    )
+    op.execute(
+        f"CREATE TRIGGER entries_fts_after_insert AFTER INSERT ON entries BEGIN "
+        f"INSERT INTO entries_fts(rowid, {column_list}) VALUES (new.id, {new_values}); "
+        f"END"
+    )
+    op.execute(
+        f"CREATE TRIGGER entries_fts_after_delete AFTER DELETE ON entries BEGIN "
+        f"INSERT INTO entries_fts(entries_fts, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+        f"END"
+    )
+    op.execute(
+        f"CREATE TRIGGER entries_fts_after_update AFTER UPDATE OF {column_list} ON entries BEGIN "
+        f"INSERT INTO entries_fts(entries_fts, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO entries_fts(rowid, {column_list}) VALUES (new.id, {new_values}); "
+        f"END"
+    )
+    op.execute("INSERT INTO entries_fts(entries_fts) VALUES ('rebuild')")
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    # user_id is an indexed column (not UNINDEXED) so search.py can AND a
+    # user_id:<id> term into MATCH and FTS5 intersects the postings instead of
+    # finding every user's matches and filtering them afterwards
+    create_index(['title', 'content', 'user_id'])
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    create_index(['title', 'content'])
@@ -0,0 +1,26 @@
+"""Add composite index on entries (user_id, created_at, id)
+
+Revision ID: b41c6e2f8a17
+Revises: 9333e88b5b28
+Create Date: 2026-10-18 10:02:11.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b41c6e2f8a17'
+down_revision = '9333e88b5b28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('entries', schema=None) as batch_op:
+        batch_op.create_index('ix_entries_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_entries_user_id_created_at_id')
@@ -0,0 +1,69 @@
+"""Store entry moods as an integer bitmask
+
+Revision ID: c5e91d3a4b60
+Revises: b41c6e2f8a17
+Create Date: 2026-10-18 10:31:47.205318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5e91d3a4b60'
+down_revision = 'b41c6e2f8a17'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of moods.VALID_MOODS at the time of this migration (bit order matters)
+MOODS = ['happy', 'excited', 'calm', 'neutral', 'sad', 'angry', 'anxious', 'grateful', 'hopeful', 'confused', 'in love']
+NEUTRAL_MASK = 1 << MOODS.index('neutral')
+
+entries = sa.table('entries',
+    sa.column('id', sa.Integer),
+    sa.column('mood', sa.String),
+    sa.column('mood_mask', sa.Integer),
+)
+
+
+def encode(mood_string):
+    mask = 0
+    for mood in (mood_string or '').split(','):
+        mood = mood.strip().lower()
+        if mood in MOODS:
+            mask |= 1 << MOODS.index(mood)
+    return mask
+
+
+def decode(mask):
+    return ','.join(mood for position, mood in enumerate(MOODS) if mask & (1 << position))
+
+
+def upgrade():
+    with op.batch_alter_table('entries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('mood_mask', sa.Integer(), nullable=False, server_default=str(NEUTRAL_MASK)))
+
+    # Backfill the mask from the existing comma-separated strings
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(entries.c.id, entries.c.mood)).all()
+    for entry_id, mood in rows:
+        mask = encode(mood) if mood is not None else NEUTRAL_MASK
+        connection.execute(entries.update().where(entries.c.id == entry_id).values(mood_mask=mask))
+
+    with op.batch_alter_table('entries', schema=None) as batch_op:
+        batch_op.drop_column('mood')
+        batch_op.create_index('ix_entries_user_id_mood_mask', ['user_id', 'mood_mask'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('entries', schema=None) as batch_op:
+        batch_op.drop_index('ix_entries_user_id_mood_mask')
+        batch_op.add_column(sa.Column('mood', sa.String(), nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(entries.c.id, entries.c.mood_mask)).all()
+    for entry_id, mask in rows:
+        connection.execute(entries.update().where(entries.c.id == entry_id).values(mood=decode(mask)))
+
+    with op.batch_alter_table('entries', schema=None) as batch_op:
+        batch_op.drop_column('mood_mask')
@@ -0,0 +1,45 @@
+"""Add user_mood_stats aggregate table
+
+Revision ID: d3f7a9c1e254
+Revises: c5e91d3a4b60
+Create Date: 2026-10-18 11:05:32.618204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3f7a9c1e254'
+down_revision = 'c5e91d3a4b60'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of moods.VALID_MOODS at the time of this migration (bit order matters)
+MOODS = ['happy', 'excited', 'calm', 'neutral', 'sad', 'angry', 'anxious', 'grateful', 'hopeful', 'confused', 'in love']
+
+
+def upgrade():
+    op.create_table('user_mood_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    *[sa.Column(mood.replace(' ', '_'), sa.Integer(), nullable=False) for mood in MOODS],
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='fk_user_mood_stats_user_id'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Backfill from existing entries
+    mood_columns = ', '.join(mood.replace(' ', '_') for mood in MOODS)
+    mood_sums = ', '.join(
+        f'SUM(CASE WHEN (mood_mask & {1 << position}) != 0 THEN 1 ELSE 0 END)'
+        for position in range(len(MOODS))
+    )
+    op.execute(
+        f'INSERT INTO user_mood_stats (user_id, entry_count, {mood_columns}) '
+        f'SELECT user_id, COUNT(id), {mood_sums} FROM entries '
+        f'WHERE user_id IS NOT NULL GROUP BY user_id'
+    )
+
+
+def downgrade():
+    op.drop_table('user_mood_stats')
@@ -0,0 +1,35 @@
+"""Add mood_analysis_cache table
+
+Revision ID: e81b2c4d9f03
+Revises: d3f7a9c1e254
+Create Date: 2026-10-18 11:48:09.337516
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e81b2c4d9f03'
+down_revision = 'd3f7a9c1e254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('mood_analysis_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('mood', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    with op.batch_alter_table('mood_analysis_cache', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_mood_analysis_cache_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('mood_analysis_cache', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_mood_analysis_cache_expires_at'))
+
+    op.drop_table('mood_analysis_cache')
@@ -0,0 +1,39 @@
+"""Add user_profiles cache and entries_version counter
+
+Revision ID: f2a6d8b0c391
+Revises: e81b2c4d9f03
+Create Date: 2026-10-18 12:20:45.904117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6d8b0c391'
+down_revision = 'e81b2c4d9f03'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user_mood_stats', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('entries_version', sa.Integer(), nullable=False, server_default='0'))
+
+    op.create_table('user_profiles',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entries_version', sa.Integer(), nullable=False),
+    sa.Column('dominant_mood', sa.String(), nullable=False),
+    sa.Column('secondary_mood', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=False),
+    sa.Column('generated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='fk_user_profiles_user_id'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('user_profiles')
+
+    with op.batch_alter_table('user_mood_stats', schema=None) as batch_op:
+        batch_op.drop_column('entries_version')
@@ -4,7 +4,8 @@ from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import validates
 from datetime import datetime
 from config import db
-import bcrypt
+from moods import VALID_MOODS, NEUTRAL_MASK, parse_moods, moods_to_mask, mask_to_moods, mood_column
+from passwords import hash_password, check_password, needs_rehash
 
 class User(db.Model, SerializerMixin):
     """
@@ -30,18 +31,32 @@ class User(db.Model, SerializerMixin):
     # Relationships: One user can have many journal entries
     entries = db.relationship('Entry', back_populates='user', cascade='all, delete-orphan')
     
+    # Relationship: Incrementally maintained mood aggregates (see mood_stats.py)
+    mood_stats = db.relationship('UserMoodStats', uselist=False, cascade='all, delete-orphan')
+    
+    # Relationship: Last generated AI personality profile
+    profile_cache = db.relationship('UserProfileCache', uselist=False, cascade='all, delete-orphan')
+    
+    # Relationship: Per-day mood rollups behind the mood timeline (see mood_timeline.py)
+    mood_daily = db.relationship('UserMoodDaily', cascade='all, delete-orphan')
+    
+    # Relationship: Condensed month and year paragraphs used for profiles (see profile_generation.py)
+    window_summaries = db.relationship('JournalWindowSummary', cascade='all, delete-orphan')
+    
     # Serialization rules to prevent circular references when converting to JSON
-    serialize_rules = ('-_password_hash', '-entries.user')
+    serialize_rules = ('-_password_hash', '-entries.user', '-mood_stats', '-profile_cache', '-mood_daily', '-window_summaries')
     
     def set_password(self, password):
         """
-        Hash and set the user's password using bcrypt.
+        Hash and set the user's password using bcrypt (on the hashing pool, at BCRYPT_ROUNDS).
         
         Args:
             password (str): Plain text password to hash
+            
+        Raises:
+            PasswordHashingBusy: If the hashing pool is saturated
         """
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-        self._password_hash = password_hash.decode('utf-8')
+        self._password_hash = hash_password(password)
 
     def authenticate(self, password):
         """
@@ -52,8 +67,15 @@ class User(db.Model, SerializerMixin):
             
         Returns:
             bool: True if password matches, False otherwise
+            
+        Raises:
+            PasswordHashingBusy: If the hashing pool is saturated
         """
-        return bcrypt.checkpw(password.encode('utf-8'), self._password_hash.encode('utf-8'))
+        return check_password(password, self._password_hash)
+    
+    def password_needs_rehash(self):
+        """True if the stored hash uses a different cost than BCRYPT_ROUNDS"""
+        return needs_rehash(self._password_hash)
 
 class Entry(db.Model, SerializerMixin):
     """
@@ -63,7 +85,8 @@ class Entry(db.Model, SerializerMixin):
         id: Primary key for entry identification
         title: Entry title (required)
         content: Entry content/body text (required)
-        mood: AI-detected emotions (comma-separated string)
+        mood_mask: AI-detected emotions stored as a bitmask over moods.VALID_MOODS
+        mood: Comma-separated view of mood_mask used by the API
         created_at: Timestamp when entry was created
         updated_at: Timestamp when entry was last updated
         user_id: Foreign key linking to user
@@ -71,6 +94,11 @@ class Entry(db.Model, SerializerMixin):
     """
     __tablename__ = 'entries'
 
+    # Composite index backing the per-user, newest-first listing and keyset pagination
+    __table_args__ = (
+        db.Index('ix_entries_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
+
     # Primary key for entry identification
     id = db.Column(db.Integer, primary_key = True)
     
@@ -80,13 +108,14 @@ class Entry(db.Model, SerializerMixin):
     # Entry content/body text (required field)
     content = db.Column(db.String, nullable = False)
     
-    # AI-detected emotions stored as comma-separated string
-    # Examples: "happy,excited" or "sad,anxious" or "neutral"
-    mood = db.Column(db.String, default = 'neutral')
+    # AI-detected emotions stored as a bitmask (one bit per mood in moods.VALID_MOODS)
+    # Exposed to the API as a comma-separated string through the mood property
+    mood_mask = db.Column(db.Integer, nullable = False, default = NEUTRAL_MASK)
     
     # Timestamps for tracking creation and updates
+    # updated_at is refreshed on every ORM update and feeds the entry's ETag
     created_at = db.Column(db.DateTime, default = datetime.now)
-    updated_at = db.Column(db.DateTime, default = datetime.now)
+    updated_at = db.Column(db.DateTime, default = datetime.now, onupdate = datetime.now)
 
     # Foreign key relationship to user
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
@@ -94,27 +123,291 @@ class Entry(db.Model, SerializerMixin):
     # Relationship: Many entries belong to one user
     user = db.relationship('User', back_populates = 'entries')
     
+    # Relationship: Stored summary used for profile generation (internal, not serialized)
+    summary = db.relationship('EntrySummary', uselist=False, cascade='all, delete-orphan')
+    
     # Serialization rules to prevent circular references when converting to JSON
-    serialize_rules = ('-user.entries',)
+    # The API keeps emitting the comma-separated mood string instead of the raw mask
+    serialize_rules = ('-user.entries', '-mood_mask', 'mood', '-summary')
+
+    @property
+    def mood(self):
+        """Moods as a comma-separated string, e.g. "happy,excited" or "neutral" """
+        return ','.join(self.get_moods_list())
+
+    @mood.setter
+    def mood(self, mood_string):
+        """Store moods from a comma-separated string; unknown moods are dropped"""
+        self.set_moods_list(parse_moods(mood_string))
 
     def get_moods_list(self):
         """
-        Convert comma-separated mood string to a list of individual moods.
+        Decode the stored mood bitmask into a list of individual moods.
         
         Returns:
-            list: List of individual mood strings
+            list: List of individual mood strings in canonical order
         """
-        return [mood.strip() for mood in self.mood.split(',') if mood.strip()]
+        return mask_to_moods(self.mood_mask)
     
     def set_moods_list(self, moods_list):
         """
-        Set moods from a list, converting to comma-separated string for storage.
+        Set moods from a list, encoding them as a bitmask for storage.
         
         Args:
             moods_list (list): List of mood strings to combine
         """
-        self.mood = ','.join(moods_list)
+        self.mood_mask = moods_to_mask(moods_list)
     
     def __repr__(self):
         """String representation of the entry for debugging"""
-        return f'<Entry {self.title}>'
\ No newline at end of file
+        return f'<Entry {self.title}>'
+
+class UserMoodStats(db.Model):
+    """
+    Per-user mood aggregates, kept in sync with the entries table by mood_stats.py.
+    
+    Attributes:
+        user_id: Primary key and foreign key linking to user
+        entry_count: Number of entries the user has written
+        entries_version: Counter bumped on every create/edit/delete of the user's entries
+        <mood>: Number of entries tagged with each mood (spaces become underscores)
+    """
+    __tablename__ = 'user_mood_stats'
+
+    # One row per user, looked up by primary key
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key = True)
+    
+    # Total number of entries
+    entry_count = db.Column(db.Integer, nullable = False, default = 0)
+    
+    # Journal change counter used to invalidate derived data such as the cached profile
+    entries_version = db.Column(db.Integer, nullable = False, default = 0)
+    
+    # Number of entries tagged with each mood in moods.VALID_MOODS
+    happy = db.Column(db.Integer, nullable = False, default = 0)
+    excited = db.Column(db.Integer, nullable = False, default = 0)
+    calm = db.Column(db.Integer, nullable = False, default = 0)
+    neutral = db.Column(db.Integer, nullable = False, default = 0)
+    sad = db.Column(db.Integer, nullable = False, default = 0)
+    angry = db.Column(db.Integer, nullable = False, default = 0)
+    anxious = db.Column(db.Integer, nullable = False, default = 0)
+    grateful = db.Column(db.Integer, nullable = False, default = 0)
+    hopeful = db.Column(db.Integer, nullable = False, default = 0)
+    confused = db.Column(db.Integer, nullable = False, default = 0)
+    in_love = db.Column(db.Integer, nullable = False, default = 0)
+
+    def mood_counts(self):
+        """
+        Collect the per-mood counters into a dictionary.
+        
+        Returns:
+            dict: Mapping of mood (as in moods.VALID_MOODS) to entry count
+        """
+        return {mood: getattr(self, mood_column(mood)) for mood in VALID_MOODS}
+    
+    def __repr__(self):
+        """String representation of the stats row for debugging"""
+        return f'<UserMoodStats user={self.user_id} entries={self.entry_count}>'
+
+class UserMoodDaily(db.Model):
+    """
+    Per-user, per-day mood rollup, kept in sync with the entries table by mood_timeline.py.
+    
+    Attributes:
+        user_id: Part of the primary key, foreign key linking to user
+        day: Part of the primary key, calendar day of the entries' created_at
+        entry_count: Number of entries the user wrote that day
+        <mood>: Number of that day's entries tagged with each mood (spaces become underscores)
+    """
+    __tablename__ = 'user_mood_daily'
+
+    # One row per user and day with at least one entry; a timeline reads a contiguous key range
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key = True)
+    day = db.Column(db.Date, primary_key = True)
+    
+    # Number of entries written that day
+    entry_count = db.Column(db.Integer, nullable = False, default = 0)
+    
+    # Number of that day's entries tagged with each mood in moods.VALID_MOODS
+    happy = db.Column(db.Integer, nullable = False, default = 0)
+    excited = db.Column(db.Integer, nullable = False, default = 0)
+    calm = db.Column(db.Integer, nullable = False, default = 0)
+    neutral = db.Column(db.Integer, nullable = False, default = 0)
+    sad = db.Column(db.Integer, nullable = False, default = 0)
+    angry = db.Column(db.Integer, nullable = False, default = 0)
+    anxious = db.Column(db.Integer, nullable = False, default = 0)
+    grateful = db.Column(db.Integer, nullable = False, default = 0)
+    hopeful = db.Column(db.Integer, nullable = False, default = 0)
+    confused = db.Column(db.Integer, nullable = False, default = 0)
+    in_love = db.Column(db.Integer, nullable = False, default = 0)
+    
+    def __repr__(self):
+        """String representation of the rollup row for debugging"""
+        return f'<UserMoodDaily user={self.user_id} day={self.day} entries={self.entry_count}>'
+
+class MoodAnalysisCache(db.Model):
+    """
+    Persistent tier of the /analyze-mood result cache (see mood_cache.py).
+    
+    Attributes:
+        key: SHA-256 of the normalized content plus prompt/model version
+        mood: Cached comma-separated analysis result
+        created_at: When the result was stored
+        expires_at: When the result stops being served
+    """
+    __tablename__ = 'mood_analysis_cache'
+
+    # Content hash is the primary key, so lookups are a single index probe
+    key = db.Column(db.String(64), primary_key = True)
+    
+    # Cached analysis result, e.g. "sad,anxious"
+    mood = db.Column(db.String, nullable = False)
+    
+    # Timestamps for TTL eviction (indexed so expired rows can be purged cheaply)
+    created_at = db.Column(db.DateTime, default = datetime.now)
+    expires_at = db.Column(db.DateTime, nullable = False, index = True)
+    
+    def __repr__(self):
+        """String representation of the cache row for debugging"""
+        return f'<MoodAnalysisCache {self.key[:12]} {self.mood}>'
+
+class UserProfileCache(db.Model):
+    """
+    Last AI-generated personality profile for a user.
+    
+    A row is only served while its entries_version matches the user's
+    UserMoodStats.entries_version, i.e. until the journal changes.
+    
+    Attributes:
+        user_id: Primary key and foreign key linking to user
+        entries_version: Journal version the profile was generated from
+        dominant_mood: Most frequent mood
+        secondary_mood: Second most frequent mood
+        description: AI-written personality description
+        generated_at: When the profile was generated
+    """
+    __tablename__ = 'user_profiles'
+
+    # One cached profile per user
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key = True)
+    
+    # Journal version this profile was computed from
+    entries_version = db.Column(db.Integer, nullable = False)
+    
+    # Generated profile fields
+    dominant_mood = db.Column(db.String, nullable = False)
+    secondary_mood = db.Column(db.String, nullable = False)
+    description = db.Column(db.String, nullable = False)
+    generated_at = db.Column(db.DateTime, default = datetime.now)
+    
+    def __repr__(self):
+        """String representation of the cached profile for debugging"""
+        return f'<UserProfileCache user={self.user_id} version={self.entries_version}>'
+
+class EntrySummary(db.Model):
+    """
+    Short AI summary of one entry, the "map" output of profile generation.
+    
+    Summaries are computed once and reused for every later profile; the
+    content_hash detects entries edited since they were summarized.
+    
+    Attributes:
+        entry_id: Primary key and foreign key linking to the entry
+        content_hash: Hash of the title and content that were summarized
+        summary: One or two sentence summary of the entry's emotional content
+        created_at: When the summary was generated
+    """
+    __tablename__ = 'entry_summaries'
+
+    # One summary per entry (summaries go away with their entry)
+    entry_id = db.Column(db.Integer, db.ForeignKey('entries.id', ondelete = 'CASCADE'), primary_key = True)
+    
+    # Hash of the summarized text (see profile_generation.summary_hash)
+    content_hash = db.Column(db.String(64), nullable = False)
+    
+    # The summary itself
+    summary = db.Column(db.String, nullable = False)
+    created_at = db.Column(db.DateTime, default = datetime.now)
+    
+    def __repr__(self):
+        """String representation of the summary for debugging"""
+        return f'<EntrySummary entry={self.entry_id}>'
+
+class JournalWindowSummary(db.Model):
+    """
+    AI paragraph condensing one calendar month or year of a journal, the stored "reduce" output of profile generation.
+    
+    A paragraph is reused until the entries (for a month) or the month
+    paragraphs (for a year) it was written from change, so a new entry only
+    costs the paragraphs of its own month and year.
+    
+    Attributes:
+        user_id: Part of the primary key, foreign key linking to the journal owner
+        period: Part of the primary key, first day of the month (YYYY-MM-DD) or the year (YYYY)
+        content_hash: Hash of what the paragraph was written from
+        summary: The condensed paragraph
+        created_at: When the paragraph was generated
+    """
+    __tablename__ = 'journal_window_summaries'
+
+    # One paragraph per user and period (paragraphs go away with their user)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete = 'CASCADE'), primary_key = True)
+    period = db.Column(db.String(10), primary_key = True)
+    
+    # Fingerprint of the window's contents (see profile_generation.window_hash)
+    content_hash = db.Column(db.String(64), nullable = False)
+    
+    # The paragraph itself
+    summary = db.Column(db.String, nullable = False)
+    created_at = db.Column(db.DateTime, default = datetime.now)
+    
+    def __repr__(self):
+        """String representation of the paragraph for debugging"""
+        return f'<JournalWindowSummary user={self.user_id} {self.period}>'
+
+class MoodJob(db.Model, SerializerMixin):
+    """
+    Background mood analysis job for an entry saved with mood "pending".
+    
+    The table doubles as a durable queue: queued jobs left behind by a
+    restart are picked up again by mood_jobs.resume_queued_jobs().
+    
+    Attributes:
+        id: Primary key for job identification
+        entry_id: Foreign key linking to the entry being analyzed
+        status: One of queued, running, done, failed
+        mood: Analysis result once done
+        error: Failure reason if the job failed
+        attempts: Number of times a worker has started the job
+        created_at: Timestamp when the job was enqueued
+        updated_at: Timestamp of the last status change
+    """
+    __tablename__ = 'mood_jobs'
+
+    # Primary key for job identification
+    id = db.Column(db.Integer, primary_key = True)
+    
+    # Entry whose mood is being analyzed (jobs go away with their entry)
+    entry_id = db.Column(db.Integer, db.ForeignKey('entries.id', ondelete = 'CASCADE'), nullable = False, index = True)
+    
+    # Job lifecycle (indexed so queued jobs can be found on startup)
+    status = db.Column(db.String, nullable = False, default = 'queued', index = True)
+    
+    # Outcome of the analysis
+    mood = db.Column(db.String)
+    error = db.Column(db.String)
+    attempts = db.Column(db.Integer, nullable = False, default = 0)
+    
+    # Timestamps for tracking progress
+    created_at = db.Column(db.DateTime, default = datetime.now)
+    updated_at = db.Column(db.DateTime, default = datetime.now, onupdate = datetime.now)
+    
+    # Relationship: The entry being analyzed (one-way, entries don't list their jobs)
+    entry = db.relationship('Entry')
+    
+    # Serialization rules: job status responses don't embed the entry
+    serialize_rules = ('-entry',)
+    
+    def __repr__(self):
+        """String representation of the job for debugging"""
+        return f'<MoodJob {self.id} entry={self.entry_id} {self.status}>'
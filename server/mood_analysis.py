@@ -0,0 +1,316 @@
+# Prompt construction, model call and response parsing for AI mood analysis
+from concurrent.futures import ThreadPoolExecutor
+import os
+import re
+
+from ai_client import chat_completion, async_chat_completion
+from config import with_app_context
+from moods import VALID_MOODS
+
+# Model used for mood analysis
+MOOD_MODEL = "gpt-3.5-turbo"
+
+# Bump whenever the prompt or parsing changes so cached results are not reused
+MOOD_PROMPT_VERSION = 1
+
+MOOD_SYSTEM_PROMPT = "You are an emotion analysis expert. Be CONSERVATIVE and ACCURATE. Only identify emotions that are clearly expressed in the text. Do not infer emotions from minimal content or punctuation. When in doubt, choose 'neutral'."
+
+def get_api_key():
+    """Return the configured OpenAI API key, or None if it is missing or still the placeholder"""
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key or api_key == 'your_openai_api_key_here':
+        return None
+    return api_key
+
+def build_mood_prompt(content):
+    """
+    Create the prompt for mood analysis of a single journal entry.
+
+    Args:
+        content (str): Journal entry text
+
+    Returns:
+        str: User prompt for the model
+    """
+    return f"""
+            Analyze the emotional tone of this journal entry and identify the PRIMARY emotions present.
+
+            IMPORTANT RULES:
+            - Only identify emotions that are CLEARLY expressed in the content
+            - Do NOT infer emotions from punctuation alone (like "...")
+            - Do NOT add emotions unless they are explicitly stated or strongly implied
+            - If the content is minimal or unclear, default to "neutral"
+            - Be conservative - it's better to miss an emotion than to add one that isn't there
+
+            Choose from these categories:
+            - happy: explicitly positive, joyful, content feelings
+            - excited: enthusiastic, energetic, thrilled feelings
+            - calm: peaceful, relaxed, serene feelings
+            - neutral: balanced, factual, or unclear emotional content
+            - sad: explicitly unhappy, down, disappointed feelings
+            - angry: frustrated, irritated, mad feelings
+            - anxious: worried, nervous, stressed feelings
+            - grateful: thankful, appreciative feelings
+            - hopeful: optimistic, looking forward feelings
+            - confused: uncertain, unclear feelings
+            - in love: romantic, passionate, loving feelings
+
+            Journal entry: "{content}"
+
+            Respond with ONLY the mood categories separated by commas (e.g., "happy" or "sad,anxious" or "neutral").
+            If no clear emotions are present, respond with "neutral".
+            """
+
+def parse_mood_response(mood_response):
+    """
+    Parse and validate the model's comma-separated mood answer.
+
+    Args:
+        mood_response (str): Raw model output, e.g. "Sad, anxious"
+
+    Returns:
+        str: Comma-separated validated moods (at most two, "neutral" if none)
+    """
+    # Split by comma and clean up each mood
+    detected_moods = [mood.strip() for mood in mood_response.strip().lower().split(',')]
+
+    # Filter to only include valid moods
+    validated_moods = [mood for mood in detected_moods if mood in VALID_MOODS]
+
+    # If no valid moods found, default to neutral (more conservative approach)
+    if not validated_moods:
+        validated_moods = ['neutral']
+    elif len(validated_moods) == 1 and validated_moods[0] == 'neutral':
+        # Keep neutral if that's what the AI determined
+        pass
+    else:
+        # Limit to maximum 2 emotions to avoid over-analysis
+        validated_moods = validated_moods[:2]
+
+    # Join back into comma-separated string
+    return ','.join(validated_moods)
+
+def mood_messages(content):
+    """Chat messages asking for the moods of a single journal entry"""
+    return [
+        {"role": "system", "content": MOOD_SYSTEM_PROMPT},
+        {"role": "user", "content": build_mood_prompt(content)}
+    ]
+
+def request_mood_analysis(content, api_key, timeout=None):
+    """
+    Ask the model for the moods expressed in a journal entry.
+
+    Args:
+        content (str): Journal entry text
+        api_key (str): OpenAI API key
+        timeout (float): Seconds to wait for each attempt (None = AI_REQUEST_TIMEOUT_SECONDS)
+
+    Returns:
+        str: Comma-separated validated moods
+    """
+    answer = chat_completion(mood_messages(content), api_key, max_tokens=50, model=MOOD_MODEL, timeout=timeout)
+    return parse_mood_response(answer)
+
+async def request_mood_analysis_async(content, api_key, timeout=None):
+    """request_mood_analysis() for coroutines (see ai_server.py)"""
+    answer = await async_chat_completion(mood_messages(content), api_key, max_tokens=50, model=MOOD_MODEL, timeout=timeout)
+    return parse_mood_response(answer)
+
+# Rough characters-per-token ratio for English text, used for prompt budgeting
+CHARS_PER_TOKEN = 4
+
+# Completion tokens reserved per entry in a batched answer ("12: sad,anxious")
+BATCH_TOKENS_PER_ANSWER = 12
+
+def estimate_tokens(text):
+    """Cheap upper-bound estimate of the token count of a piece of text"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def prompt_overhead(build_prompt, max_items, system_prompt=''):
+    """
+    Characters a numbered-list prompt adds around the item texts.
+
+    Measured by rendering the template with no items and with max_items empty
+    ones, so the instructions, numbering and quotes count exactly as they are sent.
+
+    Args:
+        build_prompt (callable): Renders the user prompt from a list of item texts
+        max_items (int): Most items per prompt (numbers get wider as the list grows)
+        system_prompt (str): System message sent with the prompt
+
+    Returns:
+        tuple: (characters with no items, characters added per item at most)
+    """
+    empty = len(system_prompt) + len(build_prompt([]))
+    full = len(system_prompt) + len(build_prompt([''] * max_items))
+    return empty, -(-(full - empty) // max_items)
+
+def chunk_by_token_budget(contents, token_budget, max_items, overhead=(0, 0), tokens_per_item=0):
+    """
+    Pack entries into as few model calls as the prompt budget allows.
+
+    A chunk's cost is the estimate_tokens() of its whole rendered prompt
+    (overhead included) plus tokens_per_item for each entry. Entries are kept
+    in order; an entry larger than the budget gets a chunk of its own.
+
+    Args:
+        contents (list): Journal entry texts
+        token_budget (int): Maximum estimated tokens per call
+        max_items (int): Maximum entries per call
+        overhead (tuple): (fixed, per-entry) prompt characters around the entries, from prompt_overhead()
+        tokens_per_item (int): Tokens reserved per entry on top of its text (e.g. for its answer)
+
+    Returns:
+        list: Chunks, each a list of indexes into contents
+    """
+    fixed_chars, item_chars = overhead
+
+    def cost(chars, count):
+        return (fixed_chars + chars) // CHARS_PER_TOKEN + 1 + tokens_per_item * count
+
+    chunks, current, used = [], [], 0
+    for index, content in enumerate(contents):
+        size = len(content) + item_chars
+        if current and (cost(used + size, len(current) + 1) > token_budget or len(current) >= max_items):
+            chunks.append(current)
+            current, used = [], 0
+        current.append(index)
+        used += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+def build_batch_mood_prompt(contents):
+    """
+    Create one prompt asking for the moods of several numbered entries.
+
+    Args:
+        contents (list): Journal entry texts
+
+    Returns:
+        str: User prompt for the model
+    """
+    numbered = "\n".join(f'[{number}] "{content}"' for number, content in enumerate(contents, start=1))
+    return f"""
+            Analyze the emotional tone of each numbered journal entry below and identify the PRIMARY emotions present in each one.
+
+            Apply the same rules to every entry independently:
+            - Only identify emotions that are CLEARLY expressed in the content
+            - Do NOT infer emotions from punctuation alone (like "...")
+            - If the content is minimal or unclear, use "neutral"
+            - Use at most two emotions per entry
+
+            Choose from these categories: {', '.join(VALID_MOODS)}
+
+            Journal entries:
+            {numbered}
+
+            Respond with exactly one line per entry in the form "<number>: <moods separated by commas>", for example:
+            1: happy
+            2: sad,anxious
+            """
+
+def batch_mood_messages(contents):
+    """Chat messages asking for the moods of several numbered entries"""
+    return [
+        {"role": "system", "content": MOOD_SYSTEM_PROMPT},
+        {"role": "user", "content": build_batch_mood_prompt(contents)}
+    ]
+
+def parse_numbered_lines(response, count):
+    """
+    Split a numbered answer ("1: ...", "[2] ...") into per-item text.
+
+    Args:
+        response (str): Raw model output
+        count (int): Number of items that were sent
+
+    Returns:
+        list: Answer text per item, or None where the answer was missing
+    """
+    results = [None] * count
+    for line in response.splitlines():
+        match = re.match(r'\s*\[?(\d+)\]?\s*[:.)-]\s*(.+)', line)
+        if not match:
+            continue
+        number = int(match.group(1))
+        if 1 <= number <= count and results[number - 1] is None:
+            results[number - 1] = match.group(2).strip()
+    return results
+
+def parse_batch_mood_response(batch_response, count):
+    """
+    Parse a numbered batch answer into per-entry validated moods.
+
+    Args:
+        batch_response (str): Raw model output
+        count (int): Number of entries that were sent
+
+    Returns:
+        list: Validated mood string per entry, or None where the answer was missing
+    """
+    return [parse_mood_response(answer) if answer is not None else None
+            for answer in parse_numbered_lines(batch_response, count)]
+
+def request_batch_mood_analysis(contents, api_key, timeout=None):
+    """
+    Analyze several entries with a single model call.
+
+    Entries the model skipped or answered illegibly are retried one by one.
+
+    Args:
+        contents (list): Journal entry texts
+        api_key (str): OpenAI API key
+        timeout (float): Seconds to wait for each model call (None = AI_REQUEST_TIMEOUT_SECONDS)
+
+    Returns:
+        list: Comma-separated validated moods, one per entry
+    """
+    if len(contents) == 1:
+        return [request_mood_analysis(contents[0], api_key, timeout)]
+
+    answer = chat_completion(
+        batch_mood_messages(contents),
+        api_key,
+        max_tokens=BATCH_TOKENS_PER_ANSWER * len(contents),
+        model=MOOD_MODEL,
+        timeout=timeout
+    )
+    results = parse_batch_mood_response(answer, len(contents))
+    return [mood if mood is not None else request_mood_analysis(content, api_key, timeout)
+            for content, mood in zip(contents, results)]
+
+def analyze_batch(contents, api_key, token_budget, max_items, parallelism, timeout=None):
+    """
+    Analyze many entries, packing them into chunks and running chunks concurrently.
+
+    A failing chunk doesn't fail the batch: its entries come back as None.
+
+    Args:
+        contents (list): Journal entry texts
+        api_key (str): OpenAI API key
+        token_budget (int): Maximum estimated tokens per call: the whole prompt plus BATCH_TOKENS_PER_ANSWER per entry
+        max_items (int): Maximum entries per call
+        parallelism (int): Maximum model calls in flight
+        timeout (float): Seconds to wait for each model call (None = AI_REQUEST_TIMEOUT_SECONDS)
+
+    Returns:
+        list: Comma-separated validated moods (or None on failure), one per entry
+    """
+    overhead = prompt_overhead(build_batch_mood_prompt, max_items, MOOD_SYSTEM_PROMPT)
+    chunks = chunk_by_token_budget(contents, token_budget, max_items, overhead, BATCH_TOKENS_PER_ANSWER)
+
+    def analyze_chunk(chunk):
+        try:
+            return request_batch_mood_analysis([contents[index] for index in chunk], api_key, timeout)
+        except Exception as e:
+            print(f"Error in batch mood analysis chunk: {str(e)}")
+            return [None] * len(chunk)
+
+    results = [None] * len(contents)
+    with ThreadPoolExecutor(max_workers=max(1, min(parallelism, len(chunks)))) as executor:
+        for chunk, moods in zip(chunks, executor.map(with_app_context(analyze_chunk), chunks)):
+            for index, mood in zip(chunk, moods):
+                results[index] = mood
+    return results
@@ -0,0 +1,185 @@
+# Two-tier result cache for AI mood analysis
+#
+# Results are keyed on a hash of the normalized entry content plus the prompt and
+# model version, so re-analyzing unchanged text (edits that don't touch the body,
+# client retries after a timeout) never pays for another model call.
+# Tier 1 is a bounded in-process LRU; tier 2 is the mood_analysis_cache table
+# with TTL eviction, shared by every worker. Tier 2 is read and written in a
+# short session of its own, so a cache write never commits (and a cache error
+# never rolls back) the caller's unfinished work.
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import hashlib
+import re
+import threading
+import unicodedata
+
+from flask import current_app
+from sqlalchemy import delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from werkzeug.local import LocalProxy
+
+from config import db
+from models import MoodAnalysisCache
+from mood_analysis import MOOD_MODEL, MOOD_PROMPT_VERSION
+
+# Purge expired rows from the persistent tier once every this many writes
+PURGE_EVERY_WRITES = 100
+
+def normalize_content(content):
+    """Canonical form of entry text: Unicode NFC with whitespace runs collapsed"""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', content)).strip()
+
+def cache_key(content, namespace='mood'):
+    """
+    Build the cache key for a piece of content.
+
+    Args:
+        content (str): Journal entry text
+        namespace (str): Kind of analysis the result belongs to
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    raw = f"{namespace}:{MOOD_MODEL}:v{MOOD_PROMPT_VERSION}:{normalize_content(content)}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used key"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value (marking it recently used) or None"""
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        """Store a value, evicting the oldest entry when full"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+class MoodResultCache:
+    """
+    In-process LRU in front of the persistent mood_analysis_cache table.
+
+    Attributes:
+        memory: Tier 1 LRU of key -> (mood, expires_at)
+        ttl: Lifetime of a cached result
+        counters: Hit/miss/write counts per tier, for sizing
+    """
+
+    def __init__(self, maxsize, ttl_seconds):
+        self.memory = LRUCache(maxsize)
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.counters = {'memory_hits': 0, 'persistent_hits': 0, 'misses': 0, 'writes': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+            return self.counters[name]
+
+    def get(self, content, namespace='mood'):
+        """
+        Look up a cached analysis result.
+
+        Args:
+            content (str): Journal entry text
+            namespace (str): Kind of analysis
+
+        Returns:
+            str: Cached result, or None on a miss
+        """
+        key = cache_key(content, namespace)
+        now = datetime.now()
+
+        cached = self.memory.get(key)
+        if cached and cached[1] > now:
+            self._count('memory_hits')
+            return cached[0]
+
+        try:
+            with Session(db.engine) as session:
+                row = session.get(MoodAnalysisCache, key)
+                cached = (row.mood, row.expires_at) if row else None
+        except SQLAlchemyError:
+            cached = None
+        if cached and cached[1] > now:
+            self.memory.put(key, cached)
+            self._count('persistent_hits')
+            return cached[0]
+
+        self._count('misses')
+        return None
+
+    def put(self, content, mood, namespace='mood'):
+        """
+        Store an analysis result in both tiers.
+
+        A failure to persist is not fatal: the result is still served from memory.
+
+        Args:
+            content (str): Journal entry text
+            mood (str): Analysis result to cache
+            namespace (str): Kind of analysis
+        """
+        key = cache_key(content, namespace)
+        now = datetime.now()
+        expires_at = now + self.ttl
+        self.memory.put(key, (mood, expires_at))
+
+        writes = self._count('writes')
+        try:
+            with Session(db.engine) as session:
+                session.merge(MoodAnalysisCache(key=key, mood=mood, created_at=now, expires_at=expires_at))
+                if writes % PURGE_EVERY_WRITES == 0:
+                    self.purge_expired(session, now)
+                session.commit()
+        except SQLAlchemyError as e:
+            print(f"Could not persist mood cache entry: {str(e)}")
+
+    def purge_expired(self, session, now=None):
+        """Delete expired rows from the persistent tier (caller commits)"""
+        session.execute(delete(MoodAnalysisCache).where(MoodAnalysisCache.expires_at <= (now or datetime.now())))
+
+    def stats(self):
+        """
+        Snapshot of cache counters for sizing decisions.
+
+        Returns:
+            dict: Hit/miss counts, hit ratio and current LRU occupancy
+        """
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters['memory_hits'] + counters['persistent_hits'] + counters['misses']
+        hits = counters['memory_hits'] + counters['persistent_hits']
+        counters['hit_ratio'] = round(hits / lookups, 4) if lookups else 0.0
+        counters['memory_size'] = len(self.memory)
+        counters['memory_capacity'] = self.memory.maxsize
+        return counters
+
+def init_mood_cache(app):
+    """
+    Give the application its result cache, sized from its config.
+
+    Args:
+        app (Flask): Application being created
+    """
+    app.extensions['mood_result_cache'] = MoodResultCache(app.config['MOOD_CACHE_SIZE'], app.config['MOOD_CACHE_TTL_SECONDS'])
+
+# Cache of the current application, shared by all its requests (see init_mood_cache)
+mood_result_cache = LocalProxy(lambda: current_app.extensions['mood_result_cache'])
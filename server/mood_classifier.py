@@ -0,0 +1,248 @@
+# Offline mood classifier over the same 11 categories as the AI analysis
+#
+# Scores an entry against per-mood TF-IDF centroids learned from labelled
+# entries (the sample journal in seed_data.py by default) plus a small cue-word
+# lexicon, all as NumPy vector operations. It answers in microseconds, so it is
+# used as a fast path for short or obvious entries and as the fallback whenever
+# the remote model is unavailable.
+# Cue words right after a negation ("not angry", "never happy") are not counted,
+# and an entry with a negated cue word is never reported with high confidence:
+# the classifier cannot tell what the negation turns it into. The confidence
+# levels are calibrated against labelled entries by
+# benchmarks/bench_mood_classifier.py.
+from collections import Counter
+import math
+import re
+import threading
+
+import numpy as np
+
+from moods import VALID_MOODS, parse_moods
+from seed_data import SEED_ENTRIES
+
+# Cue words that strongly signal each mood (matched as whole lowercase tokens).
+# Neutral has none: it is what remains when no cue word is present. Words that
+# are common outside an emotional sense ("good", "still", "why", "know",
+# "down", "lost", "better", "future") are left out: they only made ordinary
+# sentences look confidently emotional.
+MOOD_LEXICON = {
+    'happy': ['happy', 'happiness', 'joy', 'joyful', 'glad', 'delighted', 'cheerful', 'smile', 'smiled', 'smiling', 'laugh', 'laughed', 'laughing', 'wonderful'],
+    'excited': ['excited', 'exciting', 'thrilled', 'thrilling', 'eager', 'energetic', 'adventure', 'electric'],
+    'calm': ['calm', 'peaceful', 'peace', 'relaxed', 'relaxing', 'serene', 'stillness', 'tranquil'],
+    'sad': ['sad', 'sadness', 'unhappy', 'depressed', 'cry', 'cried', 'crying', 'tears', 'lonely', 'loneliness', 'grief', 'grieving', 'mourning', 'sorrow', 'heartbroken', 'despair'],
+    'angry': ['angry', 'anger', 'mad', 'furious', 'fury', 'rage', 'annoyed', 'irritated', 'frustrated', 'frustrating', 'hate', 'resent', 'unfair', 'injustice'],
+    'anxious': ['anxious', 'anxiety', 'worried', 'worry', 'worrying', 'nervous', 'stressed', 'stress', 'panic', 'afraid', 'fear', 'scared', 'dread', 'uneasy', 'restless', 'sleepless'],
+    'grateful': ['grateful', 'gratitude', 'thankful', 'thanks', 'thank', 'appreciate', 'appreciated', 'blessed', 'fortunate', 'lucky'],
+    'hopeful': ['hopeful', 'hope', 'hoping', 'optimistic', 'someday'],
+    'confused': ['confused', 'confusion', 'uncertain', 'unsure', 'puzzled', 'doubt', 'contradictions'],
+    'in love': ['love', 'loved', 'loving', 'lover', 'romantic', 'romance', 'passion', 'passionate', 'adore', 'kiss', 'darling', 'beloved'],
+}
+
+# Words that negate the cue words shortly after them in the same clause
+# (apostrophes are dropped by tokenize(), so "don't" is "dont")
+NEGATIONS = {
+    'not', 'no', 'never', 'nor', 'without', 'hardly', 'barely', 'cannot', 'dont', 'doesnt', 'didnt',
+    'isnt', 'wasnt', 'arent', 'werent', 'cant', 'couldnt', 'wont', 'wouldnt', 'shouldnt', 'havent', 'hasnt',
+}
+
+# Tokens after a negation that it applies to ("not at all angry")
+NEGATION_SCOPE = 3
+
+# Highest confidence reported for an entry with a negated cue word
+NEGATED_CONFIDENCE = 0.5
+
+# Weight of lexicon evidence relative to centroid similarity
+LEXICON_WEIGHT = 1.5
+
+# Second mood is reported only if it scores at least this fraction of the first
+SECONDARY_RATIO = 0.75
+
+# Below this score nothing stands out and the entry is neutral
+MIN_SCORE = 0.15
+
+# Entries with at most this many tokens and no cue words are confidently neutral;
+# longer ones without cue words are neutral with low confidence
+SHORT_ENTRY_TOKENS = 4
+
+# A single cue word is weak evidence: confidence is scaled by hits / this, up to 1
+CONFIDENT_CUE_HITS = 2
+
+def tokenize(text):
+    """Lowercase word tokens with apostrophes dropped ("can't" -> "cant")"""
+    return re.findall(r"[a-z]+", text.lower().replace("'", ""))
+
+def split_negated(text):
+    """
+    Tokenize text, separating the tokens that a negation applies to.
+
+    A negation covers the next NEGATION_SCOPE tokens of its clause (clauses end
+    at . , ; : ! ? and at "but").
+
+    Returns:
+        tuple: (tokens outside any negation, negated tokens); negations themselves are in the first list
+    """
+    tokens, negated = [], []
+    for clause in re.split(r"[.,;:!?]|\bbut\b", text.lower().replace("'", "")):
+        remaining = 0
+        for token in re.findall(r"[a-z]+", clause):
+            if token in NEGATIONS:
+                remaining = NEGATION_SCOPE
+                tokens.append(token)
+            elif remaining:
+                remaining -= 1
+                negated.append(token)
+            else:
+                tokens.append(token)
+    return tokens, negated
+
+class MoodClassifier:
+    """
+    TF-IDF centroid + lexicon classifier over moods.VALID_MOODS.
+
+    Attributes:
+        vocabulary: Token -> column index
+        idf: Inverse document frequency per column
+        centroids: (moods x vocabulary) L2-normalized mean TF-IDF vectors
+        lexicon: (moods x vocabulary) 0/1 cue-word matrix
+    """
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.idf = None
+        self.centroids = None
+        self.lexicon = None
+
+    def train(self, documents):
+        """
+        Fit the classifier on labelled documents.
+
+        Args:
+            documents (list): (text, mood_string) pairs, e.g. ("I cried all day", "sad")
+
+        Returns:
+            MoodClassifier: self, for chaining
+        """
+        tokenized = [tokenize(text) for text, _ in documents]
+        lexicon_tokens = {token for words in MOOD_LEXICON.values() for token in words}
+        all_tokens = sorted(set().union(*tokenized, lexicon_tokens))
+        self.vocabulary = {token: index for index, token in enumerate(all_tokens)}
+
+        # Document frequency -> smoothed IDF
+        document_frequency = np.zeros(len(all_tokens))
+        for tokens in tokenized:
+            for token in set(tokens):
+                document_frequency[self.vocabulary[token]] += 1
+        self.idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+
+        # Multi-hot labels (documents x moods) and TF-IDF rows (documents x vocabulary)
+        labels = np.zeros((len(documents), len(VALID_MOODS)))
+        for row, (_, mood_string) in enumerate(documents):
+            for mood in parse_moods(mood_string):
+                if mood in VALID_MOODS:
+                    labels[row, VALID_MOODS.index(mood)] = 1
+        features = np.vstack([self._tfidf(tokens) for tokens in tokenized]) if tokenized else np.zeros((0, len(all_tokens)))
+
+        self.centroids = self._normalize_rows(labels.T @ features)
+
+        self.lexicon = np.zeros((len(VALID_MOODS), len(all_tokens)))
+        for mood, words in MOOD_LEXICON.items():
+            for word in words:
+                self.lexicon[VALID_MOODS.index(mood), self.vocabulary[word]] = 1
+        return self
+
+    def _tfidf(self, tokens):
+        """L2-normalized TF-IDF vector for a token list (unknown tokens ignored)"""
+        vector = np.zeros(len(self.vocabulary))
+        for token, count in Counter(tokens).items():
+            index = self.vocabulary.get(token)
+            if index is not None:
+                vector[index] = 1 + math.log(count)
+        vector *= self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _normalize_rows(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return matrix / norms
+
+    def scores(self, text):
+        """
+        Score every mood for a piece of text.
+
+        Args:
+            text (str): Journal entry text
+
+        Returns:
+            tuple: (scores array aligned with VALID_MOODS, token count, lexicon hit count,
+            negated cue word count, negation count); negated tokens are left out of the scores
+        """
+        tokens, negated = split_negated(text)
+        vector = self._tfidf(tokens)
+        presence = (vector > 0).astype(float)
+        lexicon_hits = self.lexicon @ presence
+        lexicon_score = lexicon_hits / math.sqrt(max(len(tokens) + len(negated), 1))
+        negated_hits = sum(1 for token in negated if token in self.vocabulary and self.lexicon[:, self.vocabulary[token]].any())
+        negations = sum(1 for token in tokens if token in NEGATIONS)
+        return (self.centroids @ vector + LEXICON_WEIGHT * lexicon_score, len(tokens) + len(negated),
+                int(lexicon_hits.sum()), negated_hits, negations)
+
+    def classify(self, text):
+        """
+        Predict the moods of a journal entry.
+
+        Args:
+            text (str): Journal entry text
+
+        Returns:
+            tuple: (comma-separated moods in the same form as the AI analysis, confidence 0..1)
+        """
+        scores, token_count, lexicon_hits, negated_hits, negations = self.scores(text)
+        neutral = VALID_MOODS.index('neutral')
+        # What "not angry" or "not bad" means is beyond a bag of words
+        ceiling = NEGATED_CONFIDENCE if negated_hits or (negations and not lexicon_hits) else 1.0
+
+        # No emotional cue words: neutral, mirroring the AI prompt's conservative rules
+        if lexicon_hits == 0:
+            return 'neutral', min(ceiling, 1.0 if token_count <= SHORT_ENTRY_TOKENS else 0.5)
+
+        ranked = [index for index in np.argsort(-scores) if index != neutral]
+        best, runner_up = ranked[0], ranked[1]
+        if scores[best] < MIN_SCORE:
+            return 'neutral', min(ceiling, float(1 - scores[best] / MIN_SCORE))
+
+        moods = [VALID_MOODS[best]]
+        if scores[runner_up] >= SECONDARY_RATIO * scores[best]:
+            moods.append(VALID_MOODS[runner_up])
+
+        # Confidence grows with the margin over the next mood that wasn't reported
+        # and with the number of cue words behind it
+        next_best = ranked[len(moods)]
+        confidence = float((scores[best] - scores[next_best]) / scores[best])
+        confidence *= min(1.0, lexicon_hits / CONFIDENT_CUE_HITS)
+        return ','.join(moods), min(ceiling, confidence)
+
+_default_classifier = None
+_default_classifier_lock = threading.Lock()
+
+def get_classifier():
+    """Process-wide classifier trained on the sample journal, built on first use"""
+    global _default_classifier
+    with _default_classifier_lock:
+        if _default_classifier is None:
+            documents = [(f"{entry['title']}. {entry['content']}", entry['mood']) for entry in SEED_ENTRIES]
+            _default_classifier = MoodClassifier().train(documents)
+    return _default_classifier
+
+def classify_mood(content):
+    """
+    Classify journal content locally.
+
+    Args:
+        content (str): Journal entry text
+
+    Returns:
+        tuple: (comma-separated moods, confidence 0..1)
+    """
+    return get_classifier().classify(content)
@@ -0,0 +1,71 @@
+# Chooses how a piece of content gets its mood: local classifier, cache or model
+#
+# Engines:
+#   local  - offline classifier only (microseconds, no API key needed)
+#   remote - result cache, then the OpenAI model
+#   auto   - local classifier when it is confident, otherwise remote
+# Remote analysis that fails, times out or has no API key falls back to the
+# local classifier instead of erroring.
+from flask import current_app
+
+from mood_analysis import get_api_key, request_mood_analysis
+from mood_cache import mood_result_cache
+from mood_classifier import classify_mood
+
+# Engines accepted by the "engine" request field / MOOD_ENGINE setting
+MOOD_ENGINES = ('auto', 'local', 'remote')
+
+def resolve_engine(engine):
+    """
+    Validate a requested engine, defaulting to the MOOD_ENGINE setting.
+
+    Raises:
+        ValueError: If the engine is not one of MOOD_ENGINES
+    """
+    engine = engine or current_app.config['MOOD_ENGINE']
+    if engine not in MOOD_ENGINES:
+        raise ValueError(f"engine must be one of: {', '.join(MOOD_ENGINES)}")
+    return engine
+
+def local_result(content, fallback=False):
+    """Analysis result from the offline classifier"""
+    mood, confidence = classify_mood(content)
+    result = {"mood": mood, "engine": "local", "confidence": round(confidence, 3), "cached": False}
+    if fallback:
+        result["fallback"] = True
+    return result
+
+def analyze_mood(content, engine=None):
+    """
+    Determine the moods of journal content with the selected engine.
+
+    Args:
+        content (str): Journal entry text
+        engine (str): auto, local or remote (None = MOOD_ENGINE setting)
+
+    Returns:
+        dict: {"mood", "engine", "cached"} plus "confidence" for local results
+        and "fallback": True when the remote call was replaced by the classifier
+    """
+    engine = resolve_engine(engine)
+
+    if engine != 'remote':
+        result = local_result(content)
+        if engine == 'local' or result['confidence'] >= current_app.config['MOOD_LOCAL_CONFIDENCE']:
+            return result
+
+    cached_mood = mood_result_cache.get(content)
+    if cached_mood:
+        return {"mood": cached_mood, "engine": "remote", "cached": True}
+
+    try:
+        api_key = get_api_key()
+        if not api_key:
+            raise RuntimeError("OpenAI API key not configured")
+        mood = request_mood_analysis(content, api_key, timeout=current_app.config['MOOD_REQUEST_TIMEOUT_SECONDS'])
+    except Exception as e:
+        print(f"Remote mood analysis failed, using local classifier: {str(e)}")
+        return local_result(content, fallback=True)
+
+    mood_result_cache.put(content, mood)
+    return {"mood": mood, "engine": "remote", "cached": False}
@@ -0,0 +1,186 @@
+# Background mood analysis for entries saved with mood "pending"
+#
+# The mood_jobs table is the queue (no external broker): AllEntries.post writes
+# the entry and its job in one transaction, then hands the job id to a small
+# in-process thread pool. Workers claim a job with a conditional UPDATE so a
+# job is never processed twice, even when several processes resume the queue.
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import threading
+import traceback
+
+from flask import current_app
+from sqlalchemy import select, update
+
+from config import db
+from models import Entry, MoodJob
+from moods import NEUTRAL_MASK, PENDING_MASK, parse_moods, moods_to_mask, mask_to_moods
+from mood_engine import analyze_mood
+from mood_stats import new_delta, add_entry_to_delta, apply_mood_deltas
+from mood_timeline import entry_day, apply_daily_deltas
+
+# Jobs stuck in "running" longer than this are assumed to belong to a dead worker
+STALE_RUNNING_AFTER = timedelta(minutes=10)
+
+_executor_lock = threading.Lock()
+
+def get_executor(app):
+    """
+    Return the application's worker pool, creating it on first use.
+
+    Creating the pool also re-enqueues jobs left queued by a previous process.
+
+    Args:
+        app (Flask): Application whose database the jobs live in
+
+    Returns:
+        ThreadPoolExecutor: Pool sized by MOOD_JOB_WORKERS
+    """
+    with _executor_lock:
+        executor = app.extensions.get('mood_job_executor')
+        created = executor is None
+        if created:
+            executor = app.extensions['mood_job_executor'] = ThreadPoolExecutor(
+                max_workers=app.config['MOOD_JOB_WORKERS'],
+                thread_name_prefix='mood-job'
+            )
+    if created:
+        for job_id in find_resumable_jobs(app):
+            executor.submit(run_mood_job, app, job_id)
+    return executor
+
+def enqueue_mood_job(job_id):
+    """
+    Schedule a committed job for background processing by the current application.
+
+    With MOOD_JOB_WORKERS set to 0 the job runs inline (useful for scripts).
+
+    Args:
+        job_id (int): ID of a queued MoodJob
+    """
+    app = current_app._get_current_object()
+    if app.config['MOOD_JOB_WORKERS'] <= 0:
+        run_mood_job(app, job_id)
+    else:
+        get_executor(app).submit(run_mood_job, app, job_id)
+
+def find_resumable_jobs(app):
+    """IDs of queued jobs plus running jobs abandoned by a dead worker"""
+    with app.app_context():
+        stale_before = datetime.now() - STALE_RUNNING_AFTER
+        db.session.execute(
+            update(MoodJob)
+            .where(MoodJob.status == 'running', MoodJob.updated_at < stale_before)
+            .values(status='queued', updated_at=datetime.now())
+        )
+        db.session.commit()
+        return list(db.session.scalars(
+            select(MoodJob.id).where(MoodJob.status == 'queued').order_by(MoodJob.id)
+        ))
+
+def claim_job(job_id):
+    """
+    Atomically move a job from queued to running.
+
+    Returns:
+        bool: True if this worker owns the job now
+    """
+    result = db.session.execute(
+        update(MoodJob)
+        .where(MoodJob.id == job_id, MoodJob.status == 'queued')
+        .values(status='running', attempts=MoodJob.attempts + 1, updated_at=datetime.now())
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+def run_mood_job(app, job_id):
+    """
+    Worker entry point: analyze the entry's content and write the mood back.
+
+    Uses the default MOOD_ENGINE, so an unreachable model degrades to the local
+    classifier. Any other failure resolves the entry to "neutral" rather than
+    leaving it pending forever.
+
+    Args:
+        app (Flask): Application the job belongs to
+        job_id (int): ID of the job to run
+    """
+    with app.app_context():
+        try:
+            if not claim_job(job_id):
+                return
+
+            job = db.session.get(MoodJob, job_id)
+            entry = db.session.get(Entry, job.entry_id)
+            if entry is None:
+                job.status = 'failed'
+                job.error = "Entry was deleted"
+                db.session.commit()
+                return
+
+            try:
+                # Remote failures already fall back to the local classifier
+                mood = analyze_mood(entry.content)['mood']
+                job.status = 'done'
+            except Exception as e:
+                print(f"Error in background mood analysis: {str(e)}")
+                mood = 'neutral'
+                job.status = 'failed'
+                job.error = str(e)
+
+            # Same canonical order and vocabulary as the entry's stored moods
+            mood_mask = moods_to_mask(parse_moods(mood)) or NEUTRAL_MASK
+            job.mood = ','.join(mask_to_moods(mood_mask))
+            resolve_pending_mood(db.session, entry, mood_mask)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            traceback.print_exc()
+
+def resolve_pending_mood(session, entry, mood_mask):
+    """
+    Replace an entry's "pending" placeholder with the analyzed moods.
+
+    The write is a conditional UPDATE (WHERE mood_mask = PENDING_MASK), so a
+    mood the user sets while the analysis runs is never overwritten. Core
+    UPDATEs bypass the flush listeners, so the mood aggregates and the journal
+    version are updated here, as the NDJSON import does.
+
+    Args:
+        session (Session): Session whose transaction the update joins (caller commits)
+        entry (Entry): The job's entry
+        mood_mask (int): Analyzed moods
+
+    Returns:
+        bool: False if the entry no longer had the placeholder
+    """
+    table = Entry.__table__
+    result = session.execute(
+        update(table)
+        .where(table.c.id == entry.id, table.c.mood_mask == PENDING_MASK)
+        .values(mood_mask=mood_mask, updated_at=datetime.now())
+    )
+    if result.rowcount == 0:
+        return False
+
+    stats_delta, daily_delta = new_delta(), new_delta()
+    for delta in (stats_delta, daily_delta):
+        add_entry_to_delta(delta, PENDING_MASK, -1)
+        add_entry_to_delta(delta, mood_mask, 1)
+    stats_delta['entries_version'] += 1
+    apply_mood_deltas(session, {entry.user_id: stats_delta})
+    apply_daily_deltas(session, {(entry.user_id, entry_day(entry.created_at)): daily_delta})
+    return True
+
+def run_queued_jobs():
+    """
+    Process every resumable job synchronously in the current thread.
+
+    Returns:
+        int: Number of jobs processed
+    """
+    app = current_app._get_current_object()
+    job_ids = find_resumable_jobs(app)
+    for job_id in job_ids:
+        run_mood_job(app, job_id)
+    return len(job_ids)
@@ -0,0 +1,190 @@
+# Incremental maintenance of the user_mood_stats aggregate table
+#
+# Every flush that creates, edits or deletes an Entry applies the matching
+# +/- deltas to the owner's user_mood_stats row inside the same transaction,
+# so the Profile page can read mood frequencies with one primary-key lookup.
+# The same row carries entries_version, bumped on every entry write, which
+# derived caches (e.g. the generated profile) compare against to detect staleness.
+from collections import defaultdict
+
+from sqlalchemy import event, func, case, select, update, insert, delete, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import Entry, UserMoodStats
+from moods import VALID_MOODS, MOOD_BITS, mood_column
+
+# Columns holding per-mood counters, in vocabulary order
+MOOD_COLUMNS = [mood_column(mood) for mood in VALID_MOODS]
+
+def new_delta():
+    """Empty delta: column name -> change in value"""
+    return defaultdict(int)
+
+def add_entry_to_delta(delta, mood_mask, sign):
+    """
+    Add (sign=1) or remove (sign=-1) one entry's contribution to a delta.
+
+    Args:
+        delta (dict): Delta being accumulated for one user
+        mood_mask (int): The entry's mood bitmask
+        sign (int): +1 when the entry appears, -1 when it disappears
+    """
+    delta['entry_count'] += sign
+    for mood, bit in MOOD_BITS.items():
+        if (mood_mask or 0) & bit:
+            delta[mood_column(mood)] += sign
+
+def previous_value(state, attribute):
+    """Value an attribute had before the pending flush"""
+    history = state.attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return getattr(state.object, attribute)
+
+def collect_entry_deltas(session):
+    """
+    Compute per-user stats deltas for the entries touched by a flush.
+
+    Args:
+        session (Session): Session in after_flush state (history still available)
+
+    Returns:
+        dict: user_id -> delta
+    """
+    deltas = defaultdict(new_delta)
+
+    for obj in session.new:
+        if isinstance(obj, Entry) and obj.user_id is not None:
+            add_entry_to_delta(deltas[obj.user_id], obj.mood_mask, 1)
+            deltas[obj.user_id]['entries_version'] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Entry):
+            state = inspect(obj)
+            user_id = previous_value(state, 'user_id')
+            if user_id is not None:
+                add_entry_to_delta(deltas[user_id], previous_value(state, 'mood_mask'), -1)
+                deltas[user_id]['entries_version'] += 1
+
+    for obj in session.dirty:
+        if not isinstance(obj, Entry) or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        old_user_id = previous_value(state, 'user_id')
+        # Every edit changes the journal, even title/content edits that leave the counts alone
+        for user_id in {old_user_id, obj.user_id} - {None}:
+            deltas[user_id]['entries_version'] += 1
+        if not (state.attrs.user_id.history.has_changes() or state.attrs.mood_mask.history.has_changes()):
+            continue
+        if old_user_id is not None:
+            add_entry_to_delta(deltas[old_user_id], previous_value(state, 'mood_mask'), -1)
+        if obj.user_id is not None:
+            add_entry_to_delta(deltas[obj.user_id], obj.mood_mask, 1)
+
+    return deltas
+
+def upsert(session, table, key_columns, row, increments):
+    """
+    Insert a counter row, or add to the existing one, in a single statement.
+
+    INSERT ... ON CONFLICT DO UPDATE (SQLite and PostgreSQL), so two
+    transactions creating the same row at once cannot both try to insert it.
+
+    Args:
+        session (Session): Session whose transaction the statement joins
+        table (Table): Counter table
+        key_columns (list): Primary key column names
+        row (dict): Values of a new row, key columns included
+        increments (dict): Column -> amount added to an existing row
+    """
+    dialect_insert = postgresql.insert if session.get_bind().dialect.name == 'postgresql' else sqlite.insert
+    statement = dialect_insert(table).values(**row)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={column: table.c[column] + value for column, value in increments.items()}
+    ))
+
+def apply_mood_deltas(session, deltas):
+    """
+    Apply stats deltas with atomic "column = column + delta" updates.
+
+    Also used by bulk paths that bypass the ORM flush (e.g. NDJSON import).
+
+    Args:
+        session (Session): Session whose transaction the updates join
+        deltas (dict): user_id -> delta, as built by collect_entry_deltas
+    """
+    table = UserMoodStats.__table__
+    for user_id, delta in deltas.items():
+        changes = {column: value for column, value in delta.items() if value}
+        if not changes:
+            continue
+        # New entries may be the user's first: create the row if it is missing
+        # (other changes never do, a missing row means the user was deleted)
+        if changes.get('entry_count', 0) > 0:
+            row = {column: 0 for column in ['entry_count', 'entries_version'] + MOOD_COLUMNS}
+            row.update({column: max(value, 0) for column, value in changes.items()})
+            upsert(session, table, ['user_id'], dict(row, user_id=user_id), changes)
+        else:
+            session.execute(
+                update(table)
+                .where(table.c.user_id == user_id)
+                .values({column: table.c[column] + value for column, value in changes.items()})
+            )
+
+@event.listens_for(Session, 'after_flush')
+def update_mood_stats(session, flush_context):
+    """Keep user_mood_stats in step with every flushed Entry change"""
+    deltas = collect_entry_deltas(session)
+    if deltas:
+        apply_mood_deltas(session, deltas)
+
+def mood_stats_aggregate_query():
+    """
+    Build the GROUP BY query recomputing every user's stats from the entries table.
+
+    Returns:
+        Select: Rows of (user_id, entry_count, <mood counters...>)
+    """
+    mood_sums = [
+        func.sum(case((Entry.mood_mask.op('&')(bit) != 0, 1), else_=0)).label(mood_column(mood))
+        for mood, bit in MOOD_BITS.items()
+    ]
+    return (
+        select(Entry.user_id, func.count(Entry.id).label('entry_count'), *mood_sums)
+        .where(Entry.user_id.isnot(None))
+        .group_by(Entry.user_id)
+    )
+
+def rebuild_mood_stats(session):
+    """
+    Recompute user_mood_stats from scratch to repair any drift.
+
+    Every entries_version is bumped so caches derived from the old rows are invalidated.
+
+    Args:
+        session (Session): Session to run the rebuild in (caller commits)
+
+    Returns:
+        int: Number of users with stats rows after the rebuild
+    """
+    table = UserMoodStats.__table__
+    versions = dict(session.execute(select(table.c.user_id, table.c.entries_version)).all())
+    session.execute(delete(table))
+    rows = [dict(row._mapping) for row in session.execute(mood_stats_aggregate_query())]
+    for row in rows:
+        row['entries_version'] = versions.pop(row['user_id'], 0) + 1
+    # Users whose entries are all gone keep an empty row so their version never goes backwards
+    for user_id, version in versions.items():
+        row = {column: 0 for column in ['entry_count'] + MOOD_COLUMNS}
+        rows.append(dict(row, user_id=user_id, entries_version=version + 1))
+    if rows:
+        session.execute(insert(table), rows)
+    return len(rows)
+
+def get_mood_stats(session, user_id):
+    """Primary-key lookup of a user's stats row (None if they have no entries yet)"""
+    return session.get(UserMoodStats, user_id)
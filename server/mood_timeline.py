@@ -0,0 +1,225 @@
+# Mood over time, from the incrementally maintained user_mood_daily rollup
+#
+# Every flush that creates, edits or deletes an Entry applies +/- deltas to the
+# owner's row for the entry's calendar day, in the same transaction (like
+# mood_stats.py does for the all-time totals). A timeline is then a GROUP BY
+# over at most one row per day, so a year of history costs ~365 rows however
+# many entries the user wrote. Week and month buckets are grouped in SQL.
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import event, func, case, cast, select, update, insert, delete, inspect, Date
+from sqlalchemy.orm import Session
+
+from models import Entry, UserMoodDaily
+from moods import VALID_MOODS, MOOD_BITS, mood_column
+from mood_stats import new_delta, add_entry_to_delta, previous_value, upsert, MOOD_COLUMNS
+
+# Supported ?bucket= values
+BUCKETS = ('day', 'week', 'month')
+
+def parse_day(value, name):
+    """
+    Parse a YYYY-MM-DD query parameter.
+
+    Args:
+        value (str): Raw query parameter value (may be None)
+        name (str): Parameter name for the error message
+
+    Returns:
+        date: Parsed day, or None if absent
+
+    Raises:
+        ValueError: If the value is not an ISO date
+    """
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError as e:
+        raise ValueError(f"{name} must be a date (YYYY-MM-DD)") from e
+
+def entry_day(created_at):
+    """Calendar day an entry is counted under"""
+    return created_at.date() if created_at is not None else date.today()
+
+def collect_daily_deltas(session):
+    """
+    Compute per-user, per-day rollup deltas for the entries touched by a flush.
+
+    Args:
+        session (Session): Session in after_flush state (history still available)
+
+    Returns:
+        dict: (user_id, day) -> delta
+    """
+    deltas = defaultdict(new_delta)
+
+    for obj in session.new:
+        if isinstance(obj, Entry) and obj.user_id is not None:
+            add_entry_to_delta(deltas[obj.user_id, entry_day(obj.created_at)], obj.mood_mask, 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Entry):
+            state = inspect(obj)
+            user_id = previous_value(state, 'user_id')
+            if user_id is not None:
+                key = (user_id, entry_day(previous_value(state, 'created_at')))
+                add_entry_to_delta(deltas[key], previous_value(state, 'mood_mask'), -1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Entry) or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[attribute].history.has_changes()
+                   for attribute in ('user_id', 'mood_mask', 'created_at')):
+            continue
+        old_user_id = previous_value(state, 'user_id')
+        if old_user_id is not None:
+            key = (old_user_id, entry_day(previous_value(state, 'created_at')))
+            add_entry_to_delta(deltas[key], previous_value(state, 'mood_mask'), -1)
+        if obj.user_id is not None:
+            add_entry_to_delta(deltas[obj.user_id, entry_day(obj.created_at)], obj.mood_mask, 1)
+
+    return deltas
+
+def apply_daily_deltas(session, deltas):
+    """
+    Apply rollup deltas with atomic "column = column + delta" updates.
+
+    Days gaining entries are upserted (INSERT ... ON CONFLICT DO UPDATE), so
+    concurrent first entries of a day cannot collide; rows whose day no longer
+    has any entries are removed.
+
+    Args:
+        session (Session): Session whose transaction the updates join
+        deltas (dict): (user_id, day) -> delta, as built by collect_daily_deltas
+    """
+    table = UserMoodDaily.__table__
+    for (user_id, day), delta in deltas.items():
+        changes = {column: value for column, value in delta.items() if value}
+        if not changes:
+            continue
+        row_filter = (table.c.user_id == user_id, table.c.day == day)
+        if changes.get('entry_count', 0) > 0:
+            row = {column: 0 for column in ['entry_count'] + MOOD_COLUMNS}
+            row.update({column: max(value, 0) for column, value in changes.items()})
+            upsert(session, table, ['user_id', 'day'], dict(row, user_id=user_id, day=day), changes)
+            continue
+        session.execute(
+            update(table)
+            .where(*row_filter)
+            .values({column: table.c[column] + value for column, value in changes.items()})
+        )
+        if changes.get('entry_count', 0) < 0:
+            session.execute(delete(table).where(*row_filter, table.c.entry_count <= 0))
+
+@event.listens_for(Session, 'after_flush')
+def update_mood_daily(session, flush_context):
+    """Keep user_mood_daily in step with every flushed Entry change"""
+    deltas = collect_daily_deltas(session)
+    if deltas:
+        apply_daily_deltas(session, deltas)
+
+def day_expression(column, dialect_name):
+    """SQL expression for the calendar day of a datetime column"""
+    if dialect_name == 'sqlite':
+        return func.date(column)
+    return cast(column, Date)
+
+def bucket_expression(day, bucket, dialect_name):
+    """
+    SQL expression mapping a day to the first day of its bucket.
+
+    Weeks start on Monday (ISO weeks).
+
+    Args:
+        day: Date column or expression
+        bucket (str): One of BUCKETS
+        dialect_name (str): Database dialect (sqlite, postgresql, ...)
+
+    Returns:
+        ColumnElement: Expression to group and order by
+    """
+    if bucket == 'day':
+        return day
+    if dialect_name == 'sqlite':
+        if bucket == 'week':
+            # Forward to Sunday (a Sunday stays put), then back to that week's Monday
+            return func.date(day, 'weekday 0', '-6 days')
+        return func.date(day, 'start of month')
+    return cast(func.date_trunc(bucket, day), Date)
+
+def mood_timeline(session, user_id, bucket='day', start=None, end=None):
+    """
+    Mood counts per bucket for one user, oldest first.
+
+    Only buckets containing entries are returned.
+
+    Args:
+        session (Session): Database session
+        user_id (int): Whose entries to chart
+        bucket (str): 'day', 'week' or 'month'
+        start (date): First day included (None = from the first entry)
+        end (date): Last day included (None = up to the latest entry)
+
+    Returns:
+        list: Dicts with period (ISO date of the bucket start), entry_count,
+        moods (non-zero counts by mood) and dominant_mood
+
+    Raises:
+        ValueError: If bucket is not one of BUCKETS
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of: {', '.join(BUCKETS)}")
+
+    table = UserMoodDaily.__table__
+    period = bucket_expression(table.c.day, bucket, session.get_bind().dialect.name).label('period')
+    mood_sums = [func.sum(table.c[column]).label(column) for column in MOOD_COLUMNS]
+    query = (
+        select(period, func.sum(table.c.entry_count).label('entry_count'), *mood_sums)
+        .where(table.c.user_id == user_id)
+        .group_by(period)
+        .order_by(period)
+    )
+    if start is not None:
+        query = query.where(table.c.day >= start)
+    if end is not None:
+        query = query.where(table.c.day <= end)
+
+    timeline = []
+    for row in session.execute(query):
+        counts = {mood: row._mapping[mood_column(mood)] for mood in VALID_MOODS}
+        moods = {mood: count for mood, count in counts.items() if count}
+        timeline.append({
+            "period": row.period if isinstance(row.period, str) else row.period.isoformat(),
+            "entry_count": row.entry_count,
+            "moods": moods,
+            "dominant_mood": max(moods, key=moods.get) if moods else None
+        })
+    return timeline
+
+def rebuild_mood_daily(session):
+    """
+    Recompute user_mood_daily from scratch to repair any drift.
+
+    Args:
+        session (Session): Session to run the rebuild in (caller commits)
+
+    Returns:
+        int: Number of (user, day) rows after the rebuild
+    """
+    table = UserMoodDaily.__table__
+    day = day_expression(Entry.created_at, session.get_bind().dialect.name)
+    mood_sums = [
+        func.sum(case((Entry.mood_mask.op('&')(bit) != 0, 1), else_=0))
+        for bit in MOOD_BITS.values()
+    ]
+    session.execute(delete(table))
+    aggregate = (
+        select(Entry.user_id, day, func.count(Entry.id), *mood_sums)
+        .where(Entry.user_id.isnot(None), Entry.created_at.isnot(None))
+        .group_by(Entry.user_id, day)
+    )
+    session.execute(insert(table).from_select(['user_id', 'day', 'entry_count'] + MOOD_COLUMNS, aggregate))
+    return session.scalar(select(func.count()).select_from(table))
@@ -0,0 +1,72 @@
+# Fixed mood vocabulary and its compact integer bitmask encoding
+#
+# Each mood owns one bit, so an entry's moods fit in a single indexed integer
+# column and "entries with mood X" becomes a bitwise test instead of string parsing.
+# The bit positions are persisted in the database: only ever append new moods.
+
+# Mood categories recognised by the AI analysis, in canonical (bit) order
+VALID_MOODS = ['happy', 'excited', 'calm', 'neutral', 'sad', 'angry', 'anxious', 'grateful', 'hopeful', 'confused', 'in love']
+
+# Bit assigned to each mood
+MOOD_BITS = {mood: 1 << position for position, mood in enumerate(VALID_MOODS)}
+
+# Mask stored for entries created without a mood
+NEUTRAL_MASK = MOOD_BITS['neutral']
+
+# Placeholder for entries whose mood is still being analyzed in the background.
+# Kept well above the vocabulary bits and never counted as a mood.
+PENDING_MOOD = 'pending'
+PENDING_MASK = 1 << 15
+
+def parse_moods(mood_string):
+    """
+    Split a comma-separated mood string into individual moods.
+
+    Args:
+        mood_string (str): Moods such as "happy,excited" (may be None)
+
+    Returns:
+        list: Stripped, non-empty mood strings in their original order
+    """
+    if not mood_string:
+        return []
+    return [mood.strip().lower() for mood in mood_string.split(',') if mood.strip()]
+
+def moods_to_mask(moods):
+    """
+    Encode a list of moods as a bitmask, ignoring moods outside the vocabulary.
+
+    "pending" is encoded as PENDING_MASK on its own.
+
+    Args:
+        moods (list): Mood strings
+
+    Returns:
+        int: Bitmask with one bit set per recognised mood
+    """
+    if PENDING_MOOD in moods:
+        return PENDING_MASK
+    mask = 0
+    for mood in moods:
+        mask |= MOOD_BITS.get(mood, 0)
+    return mask
+
+def mask_to_moods(mask):
+    """
+    Decode a bitmask back into moods.
+
+    Args:
+        mask (int): Bitmask produced by moods_to_mask (may be None)
+
+    Returns:
+        list: Mood strings in canonical vocabulary order
+    """
+    if not mask:
+        return []
+    if mask & PENDING_MASK:
+        return [PENDING_MOOD]
+    return [mood for mood, bit in MOOD_BITS.items() if mask & bit]
+
+def mood_column(mood):
+    """Name of the per-mood counter column in aggregate tables, e.g. "in love" -> "in_love" """
+    return mood.replace(' ', '_')
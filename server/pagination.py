@@ -0,0 +1,115 @@
+# Keyset (cursor) pagination helpers for journal entry listings
+import base64
+import json
+from datetime import datetime
+
+# Page size used when the client doesn't ask for one
+DEFAULT_PAGE_SIZE = 20
+
+# Upper bound so a single request can't pull an entire journal
+MAX_PAGE_SIZE = 100
+
+def parse_limit(value):
+    """
+    Parse the ?limit= query parameter into a bounded page size.
+
+    Args:
+        value (str): Raw query parameter value (may be None)
+
+    Returns:
+        int: Page size between 1 and MAX_PAGE_SIZE
+
+    Raises:
+        ValueError: If the value is not a positive integer
+    """
+    if value is None or value == '':
+        return DEFAULT_PAGE_SIZE
+    limit = int(value)
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_SIZE)
+
+def parse_offset(value):
+    """
+    Parse the ?offset= query parameter used by ranked (non-keyset) listings.
+
+    Args:
+        value (str): Raw query parameter value (may be None)
+
+    Returns:
+        int: Number of results to skip (0 if absent)
+
+    Raises:
+        ValueError: If the value is not a non-negative integer
+    """
+    if value is None or value == '':
+        return 0
+    offset = int(value)
+    if offset < 0:
+        raise ValueError("offset must be a non-negative integer")
+    return offset
+
+def encode_cursor(created_at, entry_id):
+    """
+    Build an opaque cursor pointing just past the given entry.
+
+    Args:
+        created_at (datetime): Creation timestamp of the last entry on the page
+        entry_id (int): ID of the last entry on the page (tie-breaker)
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    payload = json.dumps([created_at.isoformat(), entry_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        token (str): Cursor token from the ?cursor= query parameter (may be None)
+
+    Returns:
+        tuple: (created_at, entry_id), or None if no cursor was given
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        created_at, entry_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(entry_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def encode_id_cursor(last_id):
+    """Opaque cursor for listings ordered by id alone (e.g. users)"""
+    return base64.urlsafe_b64encode(str(last_id).encode('ascii')).decode('ascii').rstrip('=')
+
+def decode_id_cursor(token):
+    """
+    Decode a cursor produced by encode_id_cursor.
+
+    Args:
+        token (str): Cursor token from the ?cursor= query parameter (may be None)
+
+    Returns:
+        int: Last id of the previous page, or None if no cursor was given
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+def is_truthy(value):
+    """Interpret a query string flag such as ?all=true"""
+    return (value or '').strip().lower() in ('1', 'true', 'yes', 'on')
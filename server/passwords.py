@@ -0,0 +1,96 @@
+# bcrypt hashing on a bounded worker pool
+#
+# bcrypt is deliberately slow (hundreds of milliseconds at the default cost).
+# Hashes run on a small dedicated pool (bcrypt releases the GIL, so the pool
+# really runs in parallel), which caps the CPU a login burst can take from
+# every other endpoint. Callers beyond BCRYPT_MAX_PENDING are refused straight
+# away with PasswordHashingBusy instead of queueing without limit, and so are
+# callers whose hash has not finished within BCRYPT_WAIT_SECONDS.
+#
+# The request thread still blocks while it waits: the pool bounds the CPU that
+# hashing takes, not the Flask workers that logins occupy. The wait limit keeps
+# a backed-up pool from holding those workers indefinitely.
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import threading
+
+import bcrypt
+from flask import current_app
+
+class PasswordHashingBusy(Exception):
+    """Too many password hashes already queued; the caller should retry later"""
+
+class HashingPool:
+    """bcrypt worker threads plus a cap on the calls queued or running"""
+
+    def __init__(self, workers, max_pending):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self.pending = threading.BoundedSemaphore(max_pending)
+
+def init_password_hashing(app):
+    """
+    Give the application its hashing pool, sized from its config (threads start on first use).
+
+    Args:
+        app (Flask): Application being created
+    """
+    app.extensions['password_hashing'] = HashingPool(app.config['BCRYPT_WORKERS'], app.config['BCRYPT_MAX_PENDING'])
+
+def run_hashing(function, *args):
+    """
+    Run a bcrypt call on the current application's pool and wait (blocking the
+    calling thread) for its result.
+
+    Raises:
+        PasswordHashingBusy: If BCRYPT_MAX_PENDING calls are already queued or
+        running, or the result is not ready within BCRYPT_WAIT_SECONDS
+    """
+    pool = current_app.extensions['password_hashing']
+    if not pool.pending.acquire(blocking=False):
+        raise PasswordHashingBusy("Too many password operations in progress")
+    try:
+        future = pool.executor.submit(function, *args)
+    except BaseException:
+        pool.pending.release()
+        raise
+    # The slot is held until the hash finishes or is cancelled, not until we stop waiting
+    future.add_done_callback(lambda _: pool.pending.release())
+    try:
+        return future.result(timeout=current_app.config['BCRYPT_WAIT_SECONDS'])
+    except TimeoutError:
+        future.cancel()
+        raise PasswordHashingBusy("Password operation timed out in the queue")
+
+def hash_password(password, rounds=None):
+    """
+    Hash a password with the configured bcrypt cost.
+
+    Args:
+        password (str): Plain text password
+        rounds (int): Cost factor (None = BCRYPT_ROUNDS)
+
+    Returns:
+        str: bcrypt hash
+    """
+    rounds = rounds or current_app.config['BCRYPT_ROUNDS']
+    salt = bcrypt.gensalt(rounds=rounds)
+    return run_hashing(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+def check_password(password, password_hash):
+    """
+    Verify a password against a stored bcrypt hash.
+
+    Returns:
+        bool: True if the password matches
+    """
+    return run_hashing(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+def hash_rounds(password_hash):
+    """Cost factor a bcrypt hash was made with ("$2b$12$..." -> 12), or None if unparsable"""
+    try:
+        return int(password_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+def needs_rehash(password_hash):
+    """True if the hash was made with a different cost than BCRYPT_ROUNDS"""
+    return hash_rounds(password_hash) != current_app.config['BCRYPT_ROUNDS']
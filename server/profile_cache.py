@@ -0,0 +1,63 @@
+# Versioned cache of AI-generated personality profiles
+#
+# A profile is stored together with the user's entries_version at generation
+# time. Entry writes bump that version (see mood_stats.py), so a cached profile
+# is served only while the journal is unchanged - no explicit invalidation needed.
+from datetime import datetime
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from models import UserProfileCache
+
+def get_cached_profile(session, stats):
+    """
+    Return the cached profile if it was generated from the current journal.
+
+    Args:
+        session (Session): Database session
+        stats (UserMoodStats): The user's aggregate row (carries entries_version)
+
+    Returns:
+        UserProfileCache: Fresh cached profile, or None if missing or stale
+    """
+    cached = session.get(UserProfileCache, stats.user_id)
+    if cached and cached.entries_version == stats.entries_version:
+        return cached
+    return None
+
+def store_profile(session, stats, dominant_mood, secondary_mood, description):
+    """
+    Save a freshly generated profile against the journal version it was built from.
+
+    Failing to persist is not fatal: the profile is simply regenerated next time.
+
+    Args:
+        session (Session): Database session (committed here)
+        stats (UserMoodStats): Aggregate row read before generation started
+        dominant_mood (str): Most frequent mood
+        secondary_mood (str): Second most frequent mood
+        description (str): AI-written description
+    """
+    try:
+        session.merge(UserProfileCache(
+            user_id=stats.user_id,
+            entries_version=stats.entries_version,
+            dominant_mood=dominant_mood,
+            secondary_mood=secondary_mood,
+            description=description,
+            generated_at=datetime.now()
+        ))
+        session.commit()
+    except SQLAlchemyError:
+        session.rollback()
+
+def profile_response_body(dominant_mood, secondary_mood, description, entry_count, cached):
+    """Build the /user-profile JSON body"""
+    return {
+        "dominant_mood": dominant_mood,
+        "secondary_mood": secondary_mood,
+        "combined_mood": f"{dominant_mood},{secondary_mood}",
+        "description": description,
+        "entry_count": entry_count,
+        "cached": cached
+    }
@@ -0,0 +1,750 @@
+# Map-reduce generation of personality profiles within a fixed token budget
+#
+# Map: every entry is reduced to a one-line summary. Short entries are used as
+# they are; longer ones are summarized by the model in numbered batches and the
+# summary is stored in entry_summaries, so each entry is summarized once and
+# only again after it is edited.
+# Reduce: a journal whose notes fit PROFILE_TOKEN_BUDGET goes to the final
+# prompt as it is. A longer one is condensed into one paragraph per calendar
+# month, and, if those don't fit either, the months into one paragraph per
+# year. The paragraphs are stored in journal_window_summaries and only
+# rewritten when their month's entries change, so a new entry costs its own
+# summary plus the paragraphs of its month and year, and only those entries are
+# loaded. No single model call is larger than the budget, however long the
+# journal grows.
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+
+from flask import current_app
+from sqlalchemy import select, func, case
+from sqlalchemy.exc import SQLAlchemyError
+
+from ai_client import chat_completion, stream_chat_completion
+from config import with_app_context
+from models import Entry, EntrySummary, JournalWindowSummary
+from mood_timeline import day_expression, bucket_expression
+from moods import VALID_MOODS
+from mood_analysis import (
+    MOOD_MODEL, CHARS_PER_TOKEN, estimate_tokens, prompt_overhead, chunk_by_token_budget, parse_numbered_lines
+)
+from mood_cache import cache_key
+
+PROFILE_SYSTEM_PROMPT = "You are a personality and mood analysis expert. Analyze journal entries to understand emotional patterns. Avoid defaulting to 'neutral' unless the content truly shows no emotional patterns."
+
+# Tokens reserved for the fixed instructions around the entries when cutting a
+# single text or the final profile notes down to size (chunked prompts measure
+# their own overhead, see profile_chunks)
+PROMPT_OVERHEAD_TOKENS = 400
+
+# Most entries summarized by a single model call
+SUMMARY_MAX_ITEMS_PER_CALL = 20
+
+# Length cap for the paragraph a reduce window is condensed into
+WINDOW_SUMMARY_TOKENS = 150
+
+# Reduce rounds before falling back to truncation (each round shrinks the notes a lot)
+MAX_REDUCE_ROUNDS = 5
+
+# Description used when the model gives none (or can't be reached)
+DEFAULT_DESCRIPTION = "A thoughtful journal keeper."
+
+def entry_text(title, content):
+    """Single-line text of an entry as it appears in profile prompts"""
+    return f"{title}: {' '.join(content.split())}"
+
+def truncate_to_tokens(text, tokens):
+    """Cut text down to roughly the given number of tokens"""
+    max_chars = tokens * CHARS_PER_TOKEN
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + "..."
+
+def summary_hash(text):
+    """Hash identifying the entry text a stored summary was made from"""
+    return cache_key(text, namespace='summary')
+
+def window_hash(*parts):
+    """Hash identifying what a stored window paragraph was made from"""
+    return cache_key('\x1f'.join(str(part) for part in parts), namespace='window')
+
+def build_summary_prompt(texts):
+    """
+    Create one prompt asking for a short summary of each numbered entry.
+
+    Args:
+        texts (list): Entry texts (see entry_text)
+
+    Returns:
+        str: User prompt for the model
+    """
+    numbered = "\n".join(f'[{number}] "{text}"' for number, text in enumerate(texts, start=1))
+    return f"""
+            Summarize each numbered journal entry below in one sentence of at most 25 words.
+            Focus on what the writer felt and why; keep the emotions they express explicitly.
+
+            Journal entries:
+            {numbered}
+
+            Respond with exactly one line per entry in the form "<number>: <summary>".
+            """
+
+def build_window_prompt(notes):
+    """
+    Create the prompt condensing a window of entry notes into one paragraph.
+
+    Args:
+        notes (list): Entry summaries or earlier window paragraphs, oldest first
+
+    Returns:
+        str: User prompt for the model
+    """
+    listed = "\n".join(f"- {note}" for note in notes)
+    return f"""
+            These are notes on consecutive journal entries by the same person, oldest first:
+            {listed}
+
+            Condense them into one paragraph of at most 100 words describing the emotions,
+            recurring themes and how the writer's mood changes over this period.
+            """
+
+def build_profile_prompt(notes):
+    """
+    Create the final personality profile prompt from condensed journal notes.
+
+    Args:
+        notes (list): Entry summaries or window paragraphs, oldest first
+
+    Returns:
+        str: User prompt for the model
+    """
+    listed = "\n".join(f"- {note}" for note in notes)
+    return f"""
+            Analyze this person's journal entries to understand their overall emotional personality and mood patterns.
+
+            Journal entries (summarized, oldest first):
+            {listed}
+
+            CRITICAL MOOD DETECTION RULES:
+            - Look for ANY emotional content in the writing (happy, sad, anxious, excited, etc.)
+            - If you find ANY emotions, DO NOT choose "neutral" as the dominant mood
+            - Only use "neutral" if the entries are completely devoid of emotional content
+            - Be aggressive about detecting emotions - even subtle ones should be identified
+
+            Based on these entries, provide:
+            1. A dominant overall mood/personality trait (choose from: {', '.join(VALID_MOODS)})
+            2. A secondary mood trait that also appears frequently
+            3. A brief personality description (2-3 sentences) written directly to the user using "you" - make it personal and engaging
+
+            MOOD DETECTION PRIORITY:
+            - First, scan for obvious emotions (happy, sad, angry, anxious)
+            - Then look for subtle emotions (grateful, hopeful, confused, excited)
+            - Only default to "neutral" if absolutely no emotional patterns are found
+            - If you see ANY emotional content, use that instead of neutral
+
+            For the description, write as if you're speaking directly to the user about their personality and emotional patterns.
+            Use "you" and "your" to make it personal and engaging.
+
+            Respond in this exact format:
+            DOMINANT_MOOD: [mood]
+            SECONDARY_MOOD: [mood]
+            DESCRIPTION: [description]
+            """
+
+def parse_profile_response(profile_response):
+    """
+    Extract the profile fields from the model's answer.
+
+    Args:
+        profile_response (str): Raw model output
+
+    Returns:
+        tuple: (dominant_mood, secondary_mood, description); moods are None if missing
+    """
+    dominant_mood = None
+    secondary_mood = None
+    description = DEFAULT_DESCRIPTION
+
+    for line in profile_response.strip().split('\n'):
+        line = line.strip()
+        if line.startswith('DOMINANT_MOOD:'):
+            dominant_mood = line.replace('DOMINANT_MOOD:', '').strip().lower()
+        elif line.startswith('SECONDARY_MOOD:'):
+            secondary_mood = line.replace('SECONDARY_MOOD:', '').strip().lower()
+        elif line.startswith('DESCRIPTION:'):
+            description = line.replace('DESCRIPTION:', '').strip()
+    return dominant_mood, secondary_mood, description
+
+def resolve_profile_moods(mood_counts, dominant_mood=None, secondary_mood=None):
+    """
+    Decide the profile moods, letting the journal's own mood counts win over the model.
+
+    Args:
+        mood_counts (dict): Mood -> number of entries tagged with it
+        dominant_mood (str): Model's dominant mood, if any
+        secondary_mood (str): Model's secondary mood, if any
+
+    Returns:
+        tuple: (dominant_mood, secondary_mood), both from VALID_MOODS
+    """
+    # Validate moods with better logic
+    # Only default to neutral if no valid mood was found or if both moods are neutral
+    if dominant_mood not in VALID_MOODS:
+        dominant_mood = "neutral"
+    if secondary_mood not in VALID_MOODS:
+        secondary_mood = "neutral"
+
+    # Always use entry mood data as the primary source of truth for consistency
+    # Count mood frequencies from actual entries, ignoring neutral
+    mood_counts = {mood: count for mood, count in mood_counts.items()
+                   if mood != "neutral" and count > 0}
+
+    # If we have entry mood data, use it to validate/override AI response
+    if mood_counts:
+        # Use the most frequent mood from entries as dominant (more reliable than AI)
+        dominant_mood = max(mood_counts, key=mood_counts.get)
+        # Remove the dominant mood from counts and get the second most frequent
+        mood_counts.pop(dominant_mood, None)
+        if mood_counts:
+            secondary_mood = max(mood_counts, key=mood_counts.get)
+        else:
+            # If only one mood found, use a complementary mood as secondary
+            if dominant_mood in ["happy", "excited"]:
+                secondary_mood = "grateful"
+            elif dominant_mood in ["sad", "angry"]:
+                secondary_mood = "hopeful"
+            elif dominant_mood in ["anxious", "confused"]:
+                secondary_mood = "calm"
+            else:
+                secondary_mood = "calm"
+    else:
+        # If no entry mood data, use AI response but avoid neutral
+        if dominant_mood == "neutral":
+            dominant_mood = "calm"
+        if secondary_mood == "neutral":
+            secondary_mood = "hopeful"
+    return dominant_mood, secondary_mood
+
+def complete(prompt, api_key, max_tokens, system_prompt=PROFILE_SYSTEM_PROMPT):
+    """Single chat completion returning the stripped answer text"""
+    return chat_completion(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        api_key,
+        max_tokens=max_tokens,
+        model=MOOD_MODEL
+    ).strip()
+
+def run_parallel(function, items):
+    """Map function over items with at most PROFILE_PARALLELISM model calls in flight"""
+    if len(items) <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=max(1, min(current_app.config['PROFILE_PARALLELISM'], len(items)))) as executor:
+        return list(executor.map(with_app_context(function), items))
+
+def prompt_budget():
+    """Tokens available for entry text in any single profile prompt"""
+    return current_app.config['PROFILE_TOKEN_BUDGET'] - PROMPT_OVERHEAD_TOKENS
+
+def profile_chunks(texts, build_prompt, max_items):
+    """
+    Group consecutive texts into model calls whose whole rendered prompt (system
+    prompt, instructions and numbering included) fits PROFILE_TOKEN_BUDGET.
+
+    Returns:
+        list: Chunks, each a list of indexes into texts
+    """
+    overhead = prompt_overhead(build_prompt, max_items, PROFILE_SYSTEM_PROMPT)
+    return chunk_by_token_budget(texts, current_app.config['PROFILE_TOKEN_BUDGET'], max_items, overhead)
+
+def summary_chunks(texts):
+    """
+    Prepare entry texts for summarization.
+
+    Args:
+        texts (list): Entry texts
+
+    Returns:
+        tuple: (texts cut to the prompt budget, chunks of indexes summarized per model call)
+    """
+    budget = prompt_budget()
+    texts = [truncate_to_tokens(text, budget) for text in texts]
+    return texts, profile_chunks(texts, build_summary_prompt, SUMMARY_MAX_ITEMS_PER_CALL)
+
+def summary_request(texts, chunk):
+    """
+    Model call for one chunk from summary_chunks().
+
+    Returns:
+        tuple: (prompt, max_tokens)
+    """
+    return build_summary_prompt([texts[index] for index in chunk]), current_app.config['PROFILE_SUMMARY_TOKENS'] * len(chunk)
+
+def collect_summaries(texts, chunks, answers):
+    """
+    Pair every text with its summary, falling back to the (truncated) text itself.
+
+    Args:
+        texts (list): Texts from summary_chunks()
+        chunks (list): Chunks from summary_chunks()
+        answers (list): Per chunk, the parsed summaries (None where missing)
+
+    Returns:
+        list: (summary, generated) per text; generated is False for fallbacks
+    """
+    summary_tokens = current_app.config['PROFILE_SUMMARY_TOKENS']
+    results = [None] * len(texts)
+    for chunk, summaries in zip(chunks, answers):
+        for index, summary in zip(chunk, summaries):
+            if summary:
+                results[index] = (truncate_to_tokens(summary, summary_tokens), True)
+            else:
+                results[index] = (truncate_to_tokens(texts[index], summary_tokens), False)
+    return results
+
+def summarize_texts(texts, api_key):
+    """
+    Summarize entry texts in numbered batches that fit the token budget.
+
+    A failed call or a skipped answer leaves the (truncated) entry text in place.
+
+    Args:
+        texts (list): Entry texts
+        api_key (str): OpenAI API key
+
+    Returns:
+        list: (summary, generated) per text; generated is False for fallbacks
+    """
+    texts, chunks = summary_chunks(texts)
+
+    def summarize_chunk(chunk):
+        prompt, max_tokens = summary_request(texts, chunk)
+        try:
+            return parse_numbered_lines(complete(prompt, api_key, max_tokens=max_tokens), len(chunk))
+        except Exception as e:
+            print(f"Error summarizing entries for profile: {str(e)}")
+            return [None] * len(chunk)
+
+    return collect_summaries(texts, chunks, run_parallel(summarize_chunk, chunks))
+
+def month_expression(session):
+    """SQL expression for the first day of an entry's calendar month, as in the monthly mood timeline"""
+    dialect_name = session.get_bind().dialect.name
+    return bucket_expression(day_expression(Entry.created_at, dialect_name), 'month', dialect_name)
+
+def pending_entry_notes(session, user_id, period=None):
+    """
+    Notes available without a model call, and the entries still needing a summary.
+
+    Short entries are used verbatim and stored summaries are reused while the
+    entry is unchanged.
+
+    Args:
+        session (Session): Database session
+        user_id (int): Journal owner
+        period (str): Only the entries of this month (a JournalWindow period; None = all)
+
+    Returns:
+        tuple: (note per entry oldest first, None where missing; [(position, entry_id, text)] to summarize)
+    """
+    query = (
+        select(Entry.id, Entry.title, Entry.content, EntrySummary.content_hash, EntrySummary.summary)
+        .outerjoin(EntrySummary, EntrySummary.entry_id == Entry.id)
+        .where(Entry.user_id == user_id)
+        .order_by(Entry.created_at, Entry.id)
+    )
+    if period is not None:
+        query = query.where(month_expression(session) == period)
+    rows = session.execute(query).all()
+
+    notes = [None] * len(rows)
+    stale = []
+    for position, row in enumerate(rows):
+        text = entry_text(row.title, row.content)
+        if estimate_tokens(text) <= current_app.config['PROFILE_SUMMARY_TOKENS']:
+            notes[position] = text
+        elif row.summary is not None and row.content_hash == summary_hash(text):
+            notes[position] = row.summary
+        else:
+            stale.append((position, row.id, text))
+    return notes, stale
+
+def store_entry_summaries(session, notes, stale, results):
+    """
+    Fill in the missing notes and store the newly generated summaries.
+
+    Args:
+        session (Session): Database session (committed here)
+        notes (list): Notes from pending_entry_notes(), completed in place
+        stale (list): Entries that were summarized, from pending_entry_notes()
+        results (list): summarize_texts() results for the stale entries
+    """
+    for (position, entry_id, text), (summary, generated) in zip(stale, results):
+        notes[position] = summary
+        if generated:
+            session.merge(EntrySummary(entry_id=entry_id, content_hash=summary_hash(text), summary=summary))
+    try:
+        session.commit()
+    except SQLAlchemyError:
+        # Not fatal: the summaries are simply generated again next time
+        session.rollback()
+
+def load_entry_notes(session, user_id, api_key):
+    """
+    Map step: one short note per entry, oldest first.
+
+    Missing or stale summaries are generated and stored.
+
+    Args:
+        session (Session): Database session (committed here if summaries are stored)
+        user_id (int): Journal owner
+        api_key (str): OpenAI API key
+
+    Returns:
+        list: Note per entry in chronological order
+    """
+    notes, stale = pending_entry_notes(session, user_id)
+    if stale:
+        results = summarize_texts([text for _, _, text in stale], api_key)
+        store_entry_summaries(session, notes, stale, results)
+    return notes
+
+def fits_budget(notes, budget):
+    return sum(estimate_tokens(note) for note in notes) <= budget
+
+def condense_fallback(window_notes):
+    """Stand-in for a window paragraph the model could not write"""
+    return truncate_to_tokens(" ".join(window_notes), WINDOW_SUMMARY_TOKENS)
+
+def condense(window_notes, api_key):
+    """
+    Condense consecutive notes into one paragraph with the model.
+
+    Returns:
+        str: The paragraph, or None if the model could not be reached
+    """
+    try:
+        return complete(build_window_prompt(window_notes), api_key, max_tokens=WINDOW_SUMMARY_TOKENS)
+    except Exception as e:
+        print(f"Error condensing journal window for profile: {str(e)}")
+        return None
+
+class JournalWindow:
+    """
+    One calendar month or year of a journal in the reduce step.
+
+    Attributes:
+        period: First day of the month (YYYY-MM-DD) or the year (YYYY)
+        content_hash: Fingerprint of the window's contents (see window_hash)
+        summary: Paragraph for the window; None until a valid stored one is found or it is written
+        notes: Notes the paragraph is written from (loaded only when summary is None)
+        stale: Entries of a month still needing a summary, as from pending_entry_notes()
+    """
+
+    def __init__(self, period, content_hash):
+        self.period = period
+        self.content_hash = content_hash
+        self.summary = None
+        self.notes = None
+        self.stale = []
+
+def journal_months_query(session, user_id):
+    """
+    Per calendar month of a journal: its fingerprint and estimated size in notes.
+
+    The fingerprint (entry count, id total, text length, last update) changes
+    whenever an entry of the month is added, deleted or edited; note_tokens is
+    the estimated size of the month's notes, each capped at PROFILE_SUMMARY_TOKENS.
+    """
+    month = month_expression(session).label('period')
+    text_length = func.length(Entry.title) + func.length(Entry.content) + 2
+    note_tokens = text_length // CHARS_PER_TOKEN + 1
+    summary_tokens = current_app.config['PROFILE_SUMMARY_TOKENS']
+    return (
+        select(
+            month,
+            func.count().label('entry_count'),
+            func.sum(Entry.id).label('id_total'),
+            func.sum(text_length).label('text_length'),
+            func.max(Entry.updated_at).label('last_updated'),
+            func.sum(case((note_tokens > summary_tokens, summary_tokens), else_=note_tokens)).label('note_tokens')
+        )
+        .where(Entry.user_id == user_id)
+        .group_by(month)
+        .order_by(month)
+    )
+
+def load_journal_windows(session, user_id):
+    """
+    Plan the reduce step from the stored window paragraphs.
+
+    Only the entries of months without a valid stored paragraph are loaded.
+
+    Args:
+        session (Session): Database session
+        user_id (int): Journal owner
+
+    Returns:
+        tuple: (JournalWindow per month oldest first, {period: (content_hash, summary)} of
+        every stored paragraph), or (None, None) when all the journal's notes fit one prompt
+    """
+    months = session.execute(journal_months_query(session, user_id)).all()
+    if sum(row.note_tokens for row in months) <= prompt_budget():
+        return None, None
+
+    stored = {
+        row.period: (row.content_hash, row.summary)
+        for row in session.execute(
+            select(JournalWindowSummary.period, JournalWindowSummary.content_hash, JournalWindowSummary.summary)
+            .where(JournalWindowSummary.user_id == user_id)
+        )
+    }
+    windows = []
+    for row in months:
+        period = row.period if isinstance(row.period, str) else row.period.isoformat()
+        window = JournalWindow(period, window_hash(row.entry_count, row.id_total, row.text_length, row.last_updated))
+        content_hash, summary = stored.get(period, (None, None))
+        if content_hash == window.content_hash:
+            window.summary = summary
+        else:
+            window.notes, window.stale = pending_entry_notes(session, user_id, period)
+        windows.append(window)
+    return windows, stored
+
+def stale_window_texts(windows):
+    """Texts of the entries the windows still need summaries for, in window order"""
+    return [text for window in windows for _, _, text in window.stale]
+
+def store_window_entry_summaries(session, windows, results):
+    """
+    Fill in the windows' missing notes and store the new entry summaries.
+
+    Args:
+        session (Session): Database session (committed here)
+        windows (list): Windows from load_journal_windows()
+        results (list): summarize_texts() results for stale_window_texts(windows)
+    """
+    offset = 0
+    for window in windows:
+        if window.stale:
+            store_entry_summaries(session, window.notes, window.stale, results[offset:offset + len(window.stale)])
+            offset += len(window.stale)
+
+def pending_windows(windows):
+    """Windows whose paragraph has to be written"""
+    return [window for window in windows if window.summary is None]
+
+def verbatim_paragraph(notes):
+    """The notes themselves when they are already paragraph-sized (no model call needed), else None"""
+    return " ".join(notes) if fits_budget(notes, WINDOW_SUMMARY_TOKENS) else None
+
+def store_window_summaries(session, user_id, windows, paragraphs):
+    """
+    Set the windows' paragraphs and store those the model wrote.
+
+    A window whose paragraph could not be written gets condense_fallback()
+    for this profile and is written again next time.
+
+    Args:
+        session (Session): Database session (committed here)
+        user_id (int): Journal owner
+        windows (list): Windows from pending_windows()
+        paragraphs (list): Paragraph per window, None where it could not be written
+    """
+    for window, paragraph in zip(windows, paragraphs):
+        if paragraph is None:
+            window.summary = condense_fallback(window.notes)
+            continue
+        window.summary = paragraph
+        session.merge(JournalWindowSummary(
+            user_id=user_id, period=window.period, content_hash=window.content_hash, summary=paragraph
+        ))
+    try:
+        session.commit()
+    except SQLAlchemyError:
+        # Not fatal: the paragraphs are simply written again next time
+        session.rollback()
+
+def year_windows(months, stored):
+    """
+    Group month paragraphs into calendar years when they don't fit one prompt.
+
+    Args:
+        months (list): Month windows with their paragraphs set
+        stored (dict): Stored paragraphs from load_journal_windows()
+
+    Returns:
+        list: JournalWindow per year oldest first, or None if the month paragraphs fit
+    """
+    if fits_budget([month.summary for month in months], prompt_budget()):
+        return None
+    years = []
+    for year, group in groupby(months, key=lambda month: month.period[:4]):
+        notes = [month.summary for month in group]
+        window = JournalWindow(year, window_hash(*notes))
+        content_hash, summary = stored.get(year, (None, None))
+        if content_hash == window.content_hash:
+            window.summary = summary
+        else:
+            window.notes = notes
+        years.append(window)
+    return years
+
+def keep_recent_notes(notes, budget):
+    """The most recent notes that fit the budget (when reducing cannot shrink them enough)"""
+    kept, used = [], 0
+    for note in reversed(notes):
+        used += estimate_tokens(note)
+        if kept and used > budget:
+            break
+        kept.append(truncate_to_tokens(note, budget))
+    return kept[::-1]
+
+def reduce_windows(notes, budget):
+    """
+    Plan one reduce round: group consecutive notes into windows that each fit the budget.
+
+    Every window is condensed into one paragraph (build_window_prompt, with
+    WINDOW_SUMMARY_TOKENS), falling back to condense_fallback().
+
+    Args:
+        notes (list): Notes in chronological order
+        budget (int): From prompt_budget()
+
+    Returns:
+        list: Notes per window, or None once the notes fit or no window holds more than one note
+    """
+    if fits_budget(notes, budget):
+        return None
+    windows = profile_chunks(notes, build_window_prompt, len(notes))
+    if len(windows) == len(notes):
+        return None
+    return [[notes[index] for index in window] for window in windows]
+
+def finish_reduce(notes, budget):
+    """Notes for the final prompt: all of them if they fit, else the most recent that do (budget set very low)"""
+    return notes if fits_budget(notes, budget) else keep_recent_notes(notes, budget)
+
+def reduce_notes(notes, api_key):
+    """
+    Reduce step: condense notes window by window until they fit the budget.
+
+    Args:
+        notes (list): Notes in chronological order
+        api_key (str): OpenAI API key
+
+    Returns:
+        list: Notes whose combined size fits the final prompt budget
+    """
+    budget = prompt_budget()
+
+    for _ in range(MAX_REDUCE_ROUNDS):
+        windows = reduce_windows(notes, budget)
+        if windows is None:
+            break
+        notes = run_parallel(lambda window_notes: condense(window_notes, api_key) or condense_fallback(window_notes), windows)
+
+    return finish_reduce(notes, budget)
+
+def window_paragraph(notes, api_key):
+    """
+    One paragraph for a month or year window.
+
+    Returns:
+        str: The paragraph, or None if the model could not be reached
+    """
+    paragraph = verbatim_paragraph(notes)
+    if paragraph is not None:
+        return paragraph
+    return condense(reduce_notes(notes, api_key), api_key)
+
+def complete_windows(session, user_id, windows, api_key):
+    """Write and store the paragraphs of the windows without a valid stored one"""
+    pending = pending_windows(windows)
+    if pending:
+        paragraphs = run_parallel(lambda window: window_paragraph(window.notes, api_key), pending)
+        store_window_summaries(session, user_id, pending, paragraphs)
+
+def load_profile_notes(session, user_id, api_key):
+    """
+    Map and reduce steps: notes for the final profile prompt, oldest first.
+
+    Args:
+        session (Session): Database session (committed here when summaries or paragraphs are stored)
+        user_id (int): Journal owner
+        api_key (str): OpenAI API key
+
+    Returns:
+        list: Entry notes, or month or year paragraphs, fitting the final prompt budget
+    """
+    months, stored = load_journal_windows(session, user_id)
+    if months is None:
+        return reduce_notes(load_entry_notes(session, user_id, api_key), api_key)
+
+    texts = stale_window_texts(months)
+    if texts:
+        store_window_entry_summaries(session, months, summarize_texts(texts, api_key))
+    complete_windows(session, user_id, months, api_key)
+
+    years = year_windows(months, stored)
+    if years:
+        complete_windows(session, user_id, years, api_key)
+    return finish_reduce([window.summary for window in years or months], prompt_budget())
+
+def generate_profile(session, user_id, api_key):
+    """
+    Generate a personality profile from a user's journal within the token budget.
+
+    Args:
+        session (Session): Database session
+        user_id (int): Journal owner
+        api_key (str): OpenAI API key
+
+    Returns:
+        tuple: (dominant_mood, secondary_mood, description) as answered by the model
+
+    Raises:
+        AIUnavailable: If the final profile call cannot reach the model
+    """
+    notes = load_profile_notes(session, user_id, api_key)
+    answer = complete(build_profile_prompt(notes), api_key, max_tokens=200)
+    return parse_profile_response(answer)
+
+def stream_profile(session, user_id, api_key):
+    """
+    Like generate_profile(), but hands out the description while the model writes it.
+
+    Args:
+        session (Session): Database session
+        user_id (int): Journal owner
+        api_key (str): OpenAI API key
+
+    Yields:
+        tuple: ("description", fragment) for each new piece of the description,
+        then ("profile", (dominant_mood, secondary_mood, description)) once complete
+
+    Raises:
+        AIUnavailable: If the final profile call cannot reach the model
+    """
+    notes = load_profile_notes(session, user_id, api_key)
+    messages = [
+        {"role": "system", "content": PROFILE_SYSTEM_PROMPT},
+        {"role": "user", "content": build_profile_prompt(notes)}
+    ]
+
+    answer = ""
+    description_start = None
+    sent = 0
+    for fragment in stream_chat_completion(messages, api_key, max_tokens=200, model=MOOD_MODEL):
+        answer += fragment
+        if description_start is None:
+            marker = answer.find('DESCRIPTION:')
+            if marker == -1:
+                continue
+            description_start = marker + len('DESCRIPTION:')
+        # The description is the rest of the DESCRIPTION line
+        description = answer[description_start:].lstrip().split('\n')[0]
+        if len(description) > sent:
+            yield "description", description[sent:]
+            sent = len(description)
+
+    yield "profile", parse_profile_response(answer)
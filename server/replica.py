@@ -0,0 +1,107 @@
+# Optional read replica for read-only handlers
+#
+# With DATABASE_READ_URL set, GET handlers read through read_session(), which
+# uses a session on the replica engine; everything else keeps db.session on
+# the primary. Replicas lag, so per-user reads compare the replica's version
+# data (entries_version, username, updated_at) with the primary's and use the
+# primary while the replica is behind: a user always reads their own writes,
+# with no client state involved. Only reads that span users (GET /users) may
+# trail the primary by the replication delay.
+# Without DATABASE_READ_URL every helper returns db.session.
+import sqlite3
+
+from flask import current_app, g
+from sqlalchemy.orm import Session
+
+from config import db
+from db_engine import is_sqlite
+from etags import journal_version, entry_version
+
+def replica_configured():
+    return bool(current_app.config['DATABASE_READ_URL'])
+
+def read_session():
+    """
+    Session for a read-only handler.
+
+    Returns:
+        Session: The replica session, or db.session when there is no replica
+    """
+    if not replica_configured():
+        return db.session
+    if 'replica_session' not in g:
+        g.replica_session = Session(db.engines['replica'])
+    return g.replica_session
+
+def user_read_session(user_id, primary_version):
+    """
+    Read session for data under one user, falling back to the primary while the replica lags.
+
+    Args:
+        user_id (int): User whose journal is read
+        primary_version (tuple): journal_version() as read from the primary
+
+    Returns:
+        Session: Replica session if it has caught up with primary_version, else db.session
+    """
+    session = read_session()
+    if session is not db.session and journal_version(session, user_id) != tuple(primary_version):
+        return db.session
+    return session
+
+def entry_read_session(entry_id, primary_version):
+    """
+    Read session for one entry, falling back to the primary while the replica lags.
+
+    Args:
+        entry_id (int): Entry to read
+        primary_version (tuple): entry_version() as read from the primary
+
+    Returns:
+        Session: Replica session if it has the same entry version, else db.session
+    """
+    session = read_session()
+    if session is not db.session and entry_version(session, entry_id) != tuple(primary_version):
+        return db.session
+    return session
+
+def sync_sqlite_replica():
+    """
+    Copy the primary SQLite database over the replica file (for local testing).
+
+    Uses SQLite's online backup, so the primary stays writable while it runs.
+
+    Returns:
+        tuple: (primary path, replica path)
+
+    Raises:
+        ValueError: If no replica is configured or either database is not SQLite
+    """
+    if not replica_configured():
+        raise ValueError("DATABASE_READ_URL is not set")
+    if not (is_sqlite(current_app.config['SQLALCHEMY_DATABASE_URI']) and is_sqlite(current_app.config['DATABASE_READ_URL'])):
+        raise ValueError("Only SQLite databases can be synced; use the server's own replication otherwise")
+    primary_path = db.engines[None].url.database
+    replica_path = db.engines['replica'].url.database
+    source = sqlite3.connect(primary_path)
+    target = sqlite3.connect(replica_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return primary_path, replica_path
+
+def close_replica_session(exception):
+    session = g.pop('replica_session', None)
+    if session is not None:
+        session.close()
+
+def init_replica(app):
+    """
+    Close each app context's replica session when the context ends.
+
+    Args:
+        app (Flask): Application being created
+    """
+    app.teardown_appcontext(close_replica_session)
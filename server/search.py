@@ -0,0 +1,131 @@
+# Full-text search over a user's journal entries
+#
+# On SQLite the entries_fts FTS5 index (created and kept in sync by triggers in
+# migration 2c8e5a7f1d94) provides BM25 ranking and highlighted snippets. The
+# owner's id is an indexed column of the index (migration 6b3d9e1f7a28), so a
+# search intersects the query terms with that user's postings rather than
+# matching every user's entries and discarding the others.
+# Databases without the index (other engines, or a schema made with
+# db.create_all()) fall back to a LIKE scan ordered newest first.
+import re
+import weakref
+
+from sqlalchemy import select, text, and_, or_
+
+from models import Entry
+
+# Markers around matched terms in snippets (the rest of the snippet is raw entry text)
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_END = '</mark>'
+
+# Words of context in content snippets
+SNIPPET_TOKENS = 16
+
+# BM25 column weights: a match in the title counts more than one in the body
+# (the user_id column only scopes the match and doesn't score)
+TITLE_WEIGHT = 5.0
+CONTENT_WEIGHT = 1.0
+USER_ID_WEIGHT = 0.0
+
+# Most search terms used from a query
+MAX_TERMS = 16
+
+def query_terms(query):
+    """Words of a search query, lowercased (FTS operators and punctuation are dropped)"""
+    return re.findall(r'\w+', query.lower())[:MAX_TERMS]
+
+def fts_match_expression(terms, user_id):
+    """
+    Turn plain search terms into a safe FTS5 MATCH expression over one user's entries.
+
+    Every term must appear in the title or content (implicit AND); the last
+    one also matches as a prefix so results show up while the user is still
+    typing.
+    """
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return f'user_id : "{int(user_id)}" AND {{title content}} : ({" ".join(quoted)})'
+
+# Engine -> whether its database has the entries_fts index (checked once per engine)
+_fts_engines = weakref.WeakKeyDictionary()
+
+def has_fts_index(session):
+    """True if the entries_fts table, with its user_id column, exists in this database"""
+    engine = session.get_bind()
+    if engine.dialect.name != 'sqlite':
+        return False
+    if engine not in _fts_engines:
+        _fts_engines[engine] = session.execute(
+            text("SELECT 1 FROM pragma_table_info('entries_fts') WHERE name = 'user_id'")
+        ).first() is not None
+    return _fts_engines[engine]
+
+def search_entries(session, user_id, query, limit, offset=0):
+    """
+    Search one user's entries.
+
+    Args:
+        session (Session): Database session
+        user_id (int): Whose entries to search
+        query (str): Free-text query
+        limit (int): Page size
+        offset (int): Results to skip
+
+    Returns:
+        tuple: (list of (Entry, rank, snippet), has_more); rank is None for the LIKE fallback
+
+    Raises:
+        ValueError: If the query contains no searchable words
+    """
+    terms = query_terms(query)
+    if not terms:
+        raise ValueError("q must contain at least one word")
+
+    if has_fts_index(session):
+        hits = session.execute(
+            text(
+                "SELECT entries_fts.rowid AS id, "
+                "bm25(entries_fts, :title_weight, :content_weight, :user_id_weight) AS score, "
+                "snippet(entries_fts, 1, :start, :end, '…', :tokens) AS snippet "
+                "FROM entries_fts "
+                "WHERE entries_fts MATCH :match "
+                "ORDER BY score LIMIT :limit OFFSET :offset"
+            ),
+            {
+                "title_weight": TITLE_WEIGHT, "content_weight": CONTENT_WEIGHT, "user_id_weight": USER_ID_WEIGHT,
+                "start": HIGHLIGHT_START, "end": HIGHLIGHT_END, "tokens": SNIPPET_TOKENS,
+                "match": fts_match_expression(terms, user_id),
+                "limit": limit + 1, "offset": offset
+            }
+        ).all()
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+        entries = {entry.id: entry for entry in session.scalars(
+            select(Entry).where(Entry.id.in_([hit.id for hit in hits]))
+        )}
+        return [(entries[hit.id], hit.score, hit.snippet) for hit in hits if hit.id in entries], has_more
+
+    # Fallback: every term must appear in the title or content
+    conditions = [or_(Entry.title.ilike(f'%{term}%'), Entry.content.ilike(f'%{term}%')) for term in terms]
+    rows = session.scalars(
+        select(Entry)
+        .where(Entry.user_id == user_id, and_(*conditions))
+        .order_by(Entry.created_at.desc(), Entry.id.desc())
+        .limit(limit + 1).offset(offset)
+    ).all()
+    has_more = len(rows) > limit
+    return [(entry, None, plain_snippet(entry.content, terms)) for entry in rows[:limit]], has_more
+
+def plain_snippet(content, terms):
+    """Snippet around the first matching term, highlighted like the FTS5 snippets"""
+    words = content.split()
+    for index, word in enumerate(words):
+        if any(term in word.lower() for term in terms):
+            start = max(0, index - SNIPPET_TOKENS // 2)
+            window = words[start:start + SNIPPET_TOKENS]
+            highlighted = [f"{HIGHLIGHT_START}{w}{HIGHLIGHT_END}" if any(term in w.lower() for term in terms) else w
+                           for w in window]
+            prefix = '…' if start > 0 else ''
+            suffix = '…' if start + SNIPPET_TOKENS < len(words) else ''
+            return prefix + ' '.join(highlighted) + suffix
+    return ' '.join(words[:SNIPPET_TOKENS]) + ('…' if len(words) > SNIPPET_TOKENS else '')
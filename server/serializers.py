@@ -0,0 +1,133 @@
+# Precompiled serializers for the hot read endpoints
+#
+# SerializerMixin.to_dict() re-inspects columns, relationships and
+# serialize_rules for every row it converts. The serializers below are built
+# once at import time: each is a generated function that reads a fixed list of
+# attributes and returns a plain dict, producing the same JSON as to_dict().
+# json_response() encodes with orjson when it is installed.
+from functools import lru_cache
+import json
+
+from flask import Response
+
+from moods import mask_to_moods
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Same format SerializerMixin uses for datetimes
+DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def format_datetime(value):
+    return value.strftime(DATETIME_FORMAT) if value is not None else None
+
+@lru_cache(maxsize=None)
+def mood_string(mood_mask):
+    """Comma-separated moods for a mask (only a few hundred masks ever occur)"""
+    return ','.join(mask_to_moods(mood_mask))
+
+# Field kinds
+def column(key, attribute=None):
+    """Attribute copied as is"""
+    return (key, attribute or key, None, 'value')
+
+def datetime_column(key, attribute=None):
+    """Datetime formatted like SerializerMixin"""
+    return (key, attribute or key, format_datetime, 'call')
+
+def computed(key, attribute, function):
+    """function(attribute value)"""
+    return (key, attribute, function, 'call')
+
+def nested(key, attribute, serializer):
+    """Related object serialized with another compiled serializer (None stays None)"""
+    return (key, attribute, serializer, 'nested')
+
+def nested_list(key, attribute, serializer):
+    """Collection serialized item by item with another compiled serializer"""
+    return (key, attribute, serializer, 'list')
+
+def compile_serializer(name, fields):
+    """
+    Generate a serializer function for a fixed set of fields.
+
+    Args:
+        name (str): Used for the generated function's name
+        fields (list): Field specs from column(), datetime_column(), computed(), nested(), nested_list()
+
+    Returns:
+        function: obj -> dict
+    """
+    namespace = {}
+    items = []
+    for index, (key, attribute, function, kind) in enumerate(fields):
+        helper = f"_f{index}"
+        namespace[helper] = function
+        if kind == 'value':
+            expression = f"obj.{attribute}"
+        elif kind == 'call':
+            expression = f"{helper}(obj.{attribute})"
+        elif kind == 'nested':
+            expression = f"(None if obj.{attribute} is None else {helper}(obj.{attribute}))"
+        else:
+            expression = f"[{helper}(item) for item in obj.{attribute}]"
+        items.append(f"{key!r}: {expression}")
+
+    source = f"def serialize_{name}(obj):\n    return {{{', '.join(items)}}}\n"
+    exec(compile(source, f"<serializer {name}>", 'exec'), namespace)
+    return namespace[f"serialize_{name}"]
+
+# Entry columns shared by the standalone and the nested-in-user forms
+ENTRY_FIELDS = [
+    column('id'),
+    column('title'),
+    column('content'),
+    computed('mood', 'mood_mask', mood_string),
+    datetime_column('created_at'),
+    datetime_column('updated_at'),
+    column('user_id'),
+]
+
+# Nested user inside an entry (Entry.serialize_rules drops user.entries)
+serialize_entry_user = compile_serializer('entry_user', [column('id'), column('username')])
+
+# Same output as Entry.to_dict()
+serialize_entry = compile_serializer('entry', ENTRY_FIELDS + [nested('user', 'user', serialize_entry_user)])
+
+# Entry inside a user (User.serialize_rules drops entries.user)
+serialize_user_entry = compile_serializer('user_entry', ENTRY_FIELDS)
+
+# Same output as User.to_dict()
+serialize_user = compile_serializer('user', [
+    column('id'),
+    column('username'),
+    nested_list('entries', 'entries', serialize_user_entry),
+])
+
+# Row of the lean users listing (id, username, entry_count)
+serialize_user_summary = compile_serializer('user_summary', [
+    column('id'),
+    column('username'),
+    column('entry_count'),
+])
+
+def encode_json(body):
+    """Compact UTF-8 JSON for a body, with the fastest available encoder"""
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body, separators=(',', ':')).encode('utf-8')
+
+def json_response(body, status=200):
+    """
+    Encode a response body with the fastest available JSON encoder.
+
+    Args:
+        body (dict or list): Serializable body
+        status (int): HTTP status code
+
+    Returns:
+        Response: application/json response
+    """
+    return Response(encode_json(body), status=status, mimetype='application/json')
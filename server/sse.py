@@ -0,0 +1,30 @@
+# Server-Sent Events helpers for endpoints that stream partial results
+import json
+
+from flask import Response, stream_with_context
+
+def sse_event(event, data):
+    """
+    Format one Server-Sent Event.
+
+    Args:
+        event (str): Event name the client listens for
+        data (dict): JSON-serializable payload
+
+    Returns:
+        str: Wire-format event ("event: ...\\ndata: ...\\n\\n")
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def sse_response(events):
+    """
+    Stream an iterable of formatted events as a text/event-stream response.
+
+    The request context stays available to the generator, and proxies are
+    asked not to buffer so each event reaches the browser as soon as it is sent.
+    """
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )